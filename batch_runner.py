@@ -9,7 +9,7 @@ sharing the available CPU cores between them.
 This file demonstrates a number of design choices that might not be obvious at
 first glance:
 
-* **Thread pool instead of process pool** – Each job already launches a new
+* **Thread pool instead of process pool** – In ``--subprocess`` mode each job already launches a new
   Python interpreter via :func:`subprocess.run`.  Using a thread pool here keeps
   the orchestration lightweight; the heavy lifting happens in the child
   processes.
@@ -18,13 +18,164 @@ first glance:
   worker count between all pending runs.
 * **Config list** – The ``runs`` list below is intentionally simple so users
   can edit or extend it without touching the surrounding logic.
+
+By default the runs no longer get a process each.  :func:`run_batch` parses
+every config, loads each ticker once and hands the data to a single process
+pool through its initializer.  The pool then receives one task per chunk of
+windows of every (config, approach) pair, so workers pick up whatever is left
+regardless of which config it belongs to, and nobody re-imports the
+plotting/reporting stack.  Reports are still written per output directory by
+:func:`main.write_reports`.  Pass ``--subprocess`` for the previous
+one-process-per-config fan-out.
 """
 
+import math
 import subprocess
 import sys
 import os
 import concurrent.futures
 
+from stock_market_simulator.utils.config_parser import parse_config_file
+from stock_market_simulator.data.data_fetcher import load_historical_data
+from stock_market_simulator.simulation.simulator import (
+    run_sweep_windows,
+    summarize_sweep,
+    sweep_window_count,
+)
+
+# Tasks per worker; more, smaller tasks balance better at a small IPC cost.
+TASKS_PER_WORKER = 4
+
+# Per-process state set by :func:`_init_worker`.
+_WORKER_DATA = {}
+_WORKER_SWEEPS = []
+
+
+def _init_worker(dfs, sweeps):
+    """Receive the shared price data and parsed configs once per worker."""
+    global _WORKER_DATA, _WORKER_SWEEPS
+    _WORKER_DATA = dfs
+    _WORKER_SWEEPS = sweeps
+
+
+def _run_chunk(run_i, approach_i, start, stop, initial_cash, keep_histories=False):
+    """Simulate windows ``start:stop`` of one approach of one config.
+
+    Returns ``(rows, histories)``; ``histories`` is None unless requested.
+    """
+    years, stepsize, approaches, options = _WORKER_SWEEPS[run_i]
+    aname, tdict = approaches[approach_i]
+    dfs = {tk: _WORKER_DATA[tk] for tk in tdict}
+    histories = [] if keep_histories else None
+    rows = run_sweep_windows(dfs, aname, tdict, years, stepsize, initial_cash,
+                             options["schedule"], window_slice=slice(start, stop),
+                             histories=histories)
+    return rows, histories
+
+
+def run_batch(runs, workers=None, initial_cash=10000.0, base_dir="reports", source=None,
+              local_data_dir="data/local_csv", plots=True, keep_histories=False):
+    """Run several config files in one shared process pool.
+
+    ``runs`` is a list of ``(config file, output directory name)`` pairs.
+    Returns ``{output name: approach_data}`` with the same
+    ``(summary, runs_list, final_map)`` values :mod:`main` produces.
+    ``workers <= 1`` runs every task in the calling process.  ``plots=False``
+    defers plots and PDFs like ``main --skip-plots``; ``keep_histories``
+    exports every window's history like ``main --save-histories``.
+    """
+    from stock_market_simulator.main import write_reports
+
+    workers = workers or os.cpu_count() or 1
+    sweeps = [parse_config_file(cfg, return_options=True) for cfg, _ in runs]
+
+    # Every ticker is loaded exactly once, however many configs use it.
+    dfs = {}
+    load_errors = {}
+    for _, _, approaches, _ in sweeps:
+        for _, tdict in approaches:
+            for tk in tdict:
+                if tk in dfs or tk in load_errors:
+                    continue
+                try:
+                    dfs[tk] = load_historical_data(tk, local_data_dir=local_data_dir, source=source)
+                except Exception as e:
+                    load_errors[tk] = e
+
+    # Split each sweep into chunks of windows sized so the pool gets about
+    # ``TASKS_PER_WORKER`` tasks per worker in total.
+    errors = [dict() for _ in runs]
+    counts = {}
+    for run_i, (years, stepsize, approaches, options) in enumerate(sweeps):
+        for approach_i, (aname, tdict) in enumerate(approaches):
+            missing = [tk for tk in tdict if tk in load_errors]
+            if missing:
+                errors[run_i][aname] = load_errors[missing[0]]
+                continue
+            try:
+                counts[run_i, approach_i] = sweep_window_count(
+                    {tk: dfs[tk] for tk in tdict}, aname, tdict, years, stepsize, options["schedule"]
+                )
+            except Exception as e:
+                errors[run_i][aname] = e
+    total = sum(counts.values())
+    chunk = max(1, math.ceil(total / (workers * TASKS_PER_WORKER)))
+    tasks = [(key, start, min(start + chunk, n))
+             for key, n in counts.items() for start in range(0, n, chunk)]
+
+    rows = {key: {} for key in counts}
+    failed = {}
+    if workers <= 1:
+        _init_worker(dfs, sweeps)
+        for key, start, stop in tasks:
+            try:
+                rows[key][start] = _run_chunk(*key, start, stop, initial_cash, keep_histories)
+            except Exception as e:
+                failed.setdefault(key, e)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=min(workers, max(len(tasks), 1)),
+            initializer=_init_worker,
+            initargs=(dfs, sweeps),
+        ) as executor:
+            future_map = {
+                executor.submit(_run_chunk, *key, start, stop, initial_cash, keep_histories): (key, start)
+                for key, start, stop in tasks
+            }
+            for fut in concurrent.futures.as_completed(future_map):
+                key, start = future_map[fut]
+                try:
+                    rows[key][start] = fut.result()
+                except Exception as e:
+                    failed.setdefault(key, e)
+
+    results = {}
+    for run_i, ((cfg, out), (years, _, approaches, _)) in enumerate(zip(runs, sweeps)):
+        approach_data = {}
+        histories = {} if keep_histories else None
+        for approach_i, (aname, _) in enumerate(approaches):
+            key = (run_i, approach_i)
+            if key not in counts:
+                continue
+            if key in failed:
+                errors[run_i][aname] = failed[key]
+                continue
+            # Chunks arrive in any order; stitch them back in window order.
+            chunks = [rows[key][start] for start in sorted(rows[key])]
+            results_list = [r for chunk_rows, _ in chunks for r in chunk_rows]
+            try:
+                approach_data[aname] = summarize_sweep(aname, results_list, years)
+            except Exception as e:
+                errors[run_i][aname] = e
+                continue
+            if keep_histories:
+                histories[aname] = [h for _, chunk_hists in chunks for h in chunk_hists]
+        print(f"\n=== Report for config '{cfg}' => '{out}' ===")
+        write_reports(cfg, out, approaches, approach_data, errors[run_i], base_dir=base_dir,
+                      plots=plots, plot_workers=workers, histories=histories)
+        results[out] = approach_data
+    return results
+
 
 def main():
     """Entry point that dispatches each configured run.
@@ -48,20 +199,29 @@ def main():
     ]
 
     # Optional command line argument indicates how many worker processes in
-    # total are available for all runs.  Each job will get an even slice of
-    # these workers.
-    if len(sys.argv) >= 2:
+    # total are available for all runs.  ``--subprocess`` selects the old
+    # fan-out where each job gets an even slice of these workers.
+    args = [a for a in sys.argv[1:] if a not in ("--subprocess", "--skip-plots", "--save-histories")]
+    use_subprocess = "--subprocess" in sys.argv[1:]
+    plots = "--skip-plots" not in sys.argv[1:]
+    keep_histories = "--save-histories" in sys.argv[1:]
+    if args:
         try:
-            max_workers = int(sys.argv[1])
+            max_workers = int(args[0])
         except ValueError:
             print(
-                f"Warning: expected integer worker count, got '{sys.argv[1]}'."
+                f"Warning: expected integer worker count, got '{args[0]}'."
                 " Using available CPU count."
             )
             max_workers = os.cpu_count() or 1
     else:
         max_workers = os.cpu_count() or 1
 
+    if not use_subprocess:
+        run_batch(runs, max_workers, plots=plots, keep_histories=keep_histories)
+        print("\nAll simulations completed successfully.")
+        return
+
     # Avoid allocating zero workers per job (which would make the simulator
     # single-threaded even on capable machines).
     per_job = max(1, max_workers // len(runs))
@@ -71,6 +231,10 @@ def main():
 
         print(f"\n=== Running simulation for config '{cfg}' => '{out}' ===")
         cmd = [sys.executable, "-m", "stock_market_simulator.main", cfg, out, str(per_job)]
+        if not plots:
+            cmd.append("--skip-plots")
+        if keep_histories:
+            cmd.append("--save-histories")
         subprocess.run(cmd, check=True)
 
     # Kick off all runs concurrently.  Each task merely spawns another process
@@ -0,0 +1,81 @@
+"""Measure time and peak memory of streaming minute bars through a backtest.
+
+Writes a synthetic 1-minute series (390 bars per session) for each ticker to
+Parquet, then runs :func:`simulation.simulator.run_hybrid_multi_fund` on
+:func:`data.bar_stream.stream_daily_bars`.  Peak Python allocations are
+reported with :mod:`tracemalloc` and should depend on ``--chunk`` rather than
+on ``--years``.  Run with::
+
+    python -m stock_market_simulator.benchmarks.bench_bar_stream --years 10
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from stock_market_simulator.data.bar_stream import (
+    DEFAULT_CHUNK_ROWS,
+    stream_daily_bars,
+    write_minute_parquet,
+)
+from stock_market_simulator.simulation.simulator import (
+    HybridMultiFundPortfolio,
+    run_hybrid_multi_fund,
+)
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+
+def _write_minutes(path, sessions, seed):
+    rng = np.random.default_rng(seed)
+    # Write one year at a time so generating the data stays small as well.
+    for year, days in sessions.groupby(sessions.year).items():
+        minutes = (np.asarray(days, dtype="datetime64[us]")[:, None]
+                   + np.timedelta64(9 * 60 + 30, "m").astype("timedelta64[us]")
+                   + np.arange(390).astype("timedelta64[m]").astype("timedelta64[us]")).ravel()
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, len(minutes))))
+        df = pd.DataFrame({"Open": close, "High": close, "Low": close, "Close": close,
+                           "Volume": 1.0}, index=pd.DatetimeIndex(minutes))
+        write_minute_parquet(df, os.path.join(path, f"{year}.parquet"))
+
+
+def run_benchmark(n_tickers=2, years=10, chunk=DEFAULT_CHUNK_ROWS):
+    """Return ``(minute_rows, days, seconds, peak_bytes)``."""
+    sessions = pd.bdate_range("2010-01-01", periods=252 * years)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for i in range(n_tickers):
+            paths[f"T{i}"] = os.path.join(tmp, f"T{i}")
+            os.makedirs(paths[f"T{i}"])
+            _write_minutes(paths[f"T{i}"], sessions, i)
+
+        info = {tk: {"strategy": STRATEGY_MAP["sma_trading"], "spread": 0.1} for tk in paths}
+        pf = HybridMultiFundPortfolio(info, 10000.0)
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        history, _ = run_hybrid_multi_fund(stream_daily_bars(paths, chunksize=chunk), pf)
+        secs = time.perf_counter() - t0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return len(sessions) * 390 * n_tickers, len(history), secs, peak
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming minute bars")
+    parser.add_argument("--tickers", type=int, default=2, help="Number of tickers")
+    parser.add_argument("--years", type=int, default=10, help="Years of minute data")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows per chunk")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    rows, days, secs, peak = run_benchmark(args.tickers, args.years, args.chunk)
+    print(f"{rows} minute bars -> {days} daily bars in {secs:.2f}s")
+    print(f"peak traced memory: {peak / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
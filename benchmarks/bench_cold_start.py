@@ -0,0 +1,80 @@
+"""Measure cold-start import time of the entry points and the simulation core.
+
+Every measurement runs in a fresh interpreter, the way a spawned worker or a
+``batch_runner`` subprocess starts.  The report also lists the heavy optional
+libraries each module pulled in; the simulation core and the modules workers
+import (``main``, ``batch_runner``, ``optimization.parameter_sweeper``) should
+load none of them.  Run with::
+
+    python -m stock_market_simulator.benchmarks.bench_cold_start --repeats 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Iterable
+
+import stock_market_simulator
+
+DEFAULT_MODULES = [
+    "simulation.simulator",
+    "strategies.base_strategies",
+    "utils.config_parser",
+    "main",
+    "batch_runner",
+    "optimization.parameter_sweeper",
+    "gui.visualizer",
+]
+
+HEAVY_MODULES = ("matplotlib", "fpdf", "yfinance", "tkinter", "tqdm")
+
+_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import stock_market_simulator.{module}
+elapsed = time.perf_counter() - t0
+print(elapsed)
+print(",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def _package_parent():
+    return os.path.dirname(os.path.abspath(list(stock_market_simulator.__path__)[0]))
+
+
+def import_profile(module, repeats=5):
+    """Return ``(best_seconds, heavy_modules_loaded)`` for importing ``module``."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_package_parent(), env.get("PYTHONPATH")]))
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    best = None
+    heavy = []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", code], env=env, check=True,
+                             capture_output=True, text=True).stdout.splitlines()
+        secs = float(out[-2])
+        heavy = [m for m in out[-1].split(",") if m]
+        best = secs if best is None else min(best, secs)
+    return best, heavy
+
+
+def run_benchmark(modules=DEFAULT_MODULES, repeats=5):
+    """Return ``[(module, best_seconds, heavy_modules_loaded)]``."""
+    return [(module, *import_profile(module, repeats)) for module in modules]
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cold-start imports")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES,
+                        help="Modules relative to stock_market_simulator")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per module")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    for module, secs, heavy in run_benchmark(args.modules, args.repeats):
+        loaded = ", ".join(heavy) if heavy else "-"
+        print(f"{module:35s} {secs * 1000:7.1f} ms   heavy: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Measure the overhead of transaction cost models.
+
+Two measurements:
+
+* A sweep of a trading strategy over synthetic prices (from
+  :class:`data.sources.SyntheticGBMSource`) with only the fixed spread, and
+  again with volume slippage plus a per-share commission.  The difference is
+  the cost of the models on the simulation's fill path.
+* Pricing ``--fills`` fills one at a time with the scalar model methods versus
+  one call of their batched forms, as the rebalancing engine does.
+
+Run with::
+
+    python -m stock_market_simulator.benchmarks.bench_costs --years 10
+"""
+
+import argparse
+import time
+from typing import Iterable
+
+import numpy as np
+
+from stock_market_simulator.data.sources import SyntheticGBMSource
+from stock_market_simulator.simulation.costs import CombinedCosts, PerShareCommission, VolumeSlippage
+from stock_market_simulator.simulation.simulator import run_configured_sweep
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+
+def _sweep_seconds(dfs, info, years, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run_configured_sweep(dfs, "bench", info, years, 1)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def run_benchmark(strategy="advanced_daytrading", years=10, fills=100_000, repeat=3):
+    """Return ``(spread_secs, costs_secs, scalar_secs, batch_secs)``."""
+    synth = SyntheticGBMSource(origin="1995-01-01", end="2024-12-31")
+    df = synth.generate("SYN")
+    df["Volume"] = 1e6
+    dfs = {"SYN": df}
+    model = CombinedCosts(VolumeSlippage(0.1), PerShareCommission(0.005, 1.0))
+    base = {"strategy": STRATEGY_MAP[strategy], "spread": 0.05}
+    spread_secs = _sweep_seconds(dfs, {"SYN": base}, years, repeat)
+    costs_secs = _sweep_seconds(dfs, {"SYN": dict(base, costs=model)}, years, repeat)
+
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(10, 500, fills)
+    quantities = rng.uniform(1, 1e4, fills)
+    volumes = rng.uniform(1e5, 1e7, fills)
+    t0 = time.perf_counter()
+    for p, q, v in zip(prices.tolist(), quantities.tolist(), volumes.tolist()):
+        fill = p * (1 + model.slippage(p, q, v))
+        model.commission(fill * q, q)
+    scalar_secs = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    fill = prices * (1 + model.slippage_batch(prices, quantities, volumes))
+    model.commission_batch(fill * quantities, quantities)
+    batch_secs = time.perf_counter() - t0
+    return spread_secs, costs_secs, scalar_secs, batch_secs
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark transaction cost models")
+    parser.add_argument("--strategy", default="advanced_daytrading", choices=sorted(STRATEGY_MAP))
+    parser.add_argument("--years", type=int, default=10, help="Window length of the sweep")
+    parser.add_argument("--fills", type=int, default=100_000, help="Fills priced in the model benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Sweep repetitions (best is reported)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    spread_secs, costs_secs, scalar_secs, batch_secs = run_benchmark(
+        args.strategy, args.years, args.fills, args.repeat
+    )
+    print(f"sweep, spread only: {spread_secs:.3f}s")
+    print(f"sweep, with costs:  {costs_secs:.3f}s ({(costs_secs / spread_secs - 1) * 100:+.1f}%)")
+    print(f"{args.fills} fills: scalar {scalar_secs * 1000:.1f} ms, batched {batch_secs * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
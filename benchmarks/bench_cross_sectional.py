@@ -0,0 +1,64 @@
+"""Time a cross-sectional momentum sweep over a large synthetic universe.
+
+Prices come from :class:`data.sources.SyntheticGBMSource`; a fraction of the
+tickers list late so the union calendar and NaN handling are exercised.  The
+benchmark reports the time to build the price matrix and the time of a full
+:func:`simulation.simulator.run_configured_sweep`.  Run with::
+
+    python -m stock_market_simulator.benchmarks.bench_cross_sectional --tickers 1000
+"""
+
+import argparse
+import time
+from typing import Iterable
+
+from stock_market_simulator.data.sources import SyntheticGBMSource
+from stock_market_simulator.simulation.alignment import union_matrix
+from stock_market_simulator.simulation.simulator import run_configured_sweep
+from stock_market_simulator.strategies.cross_sectional import MomentumTopN
+
+
+def run_benchmark(n_tickers=1000, origin="1995-01-01", end="2024-12-31", years=10, stepsize=3, top_n=50):
+    """Return ``(windows, matrix_seconds, sweep_seconds)``."""
+    synth = SyntheticGBMSource(origin=origin, end=end)
+    tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+    dfs = {}
+    for i, tk in enumerate(tickers):
+        df = synth.generate(tk)
+        # Every tenth ticker lists after a few years.
+        dfs[tk] = df.iloc[(i % 10 == 0) * 750:]
+
+    strategy = MomentumTopN(top_n=top_n, lookback=252, skip=21)
+    info = {tk: {"weight": 1.0 / n_tickers, "rebalance": "monthly", "cross_sectional": strategy}
+            for tk in tickers}
+
+    t0 = time.perf_counter()
+    union_matrix(dfs, tickers)
+    matrix_secs = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    _, runs, _ = run_configured_sweep(dfs, "momentum", info, years, stepsize)
+    sweep_secs = time.perf_counter() - t0
+    return len(runs), matrix_secs, sweep_secs
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark cross-sectional sweeps")
+    parser.add_argument("--tickers", type=int, default=1000, help="Universe size")
+    parser.add_argument("--origin", default="1995-01-01", help="First synthetic bar")
+    parser.add_argument("--end", default="2024-12-31", help="Last synthetic bar")
+    parser.add_argument("--years", type=int, default=10, help="Window length")
+    parser.add_argument("--stepsize", type=int, default=3, help="Months between window starts")
+    parser.add_argument("--top-n", type=int, default=50, help="Tickers held")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    windows, matrix_secs, sweep_secs = run_benchmark(
+        args.tickers, args.origin, args.end, args.years, args.stepsize, args.top_n
+    )
+    print(f"price matrix: {matrix_secs:.3f}s")
+    print(f"sweep:        {sweep_secs:.3f}s for {windows} windows "
+          f"({sweep_secs / max(windows, 1) * 1000:.1f} ms/window)")
+
+
+if __name__ == "__main__":
+    main()
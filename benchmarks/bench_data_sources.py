@@ -0,0 +1,84 @@
+"""Compare load times of the local data source backends.
+
+A synthetic universe is generated with :class:`data.sources.SyntheticGBMSource`
+and written once to each store: a CSV directory, a Parquet directory (when
+``pyarrow`` is installed) and a single SQLite file.  The benchmark then times
+how long each backend takes to return every ticker, which is the cost a sweep
+pays before simulating.  Run with::
+
+    python -m stock_market_simulator.benchmarks.bench_data_sources --tickers 200
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Iterable
+
+from stock_market_simulator.data.sources import (
+    DirectorySource,
+    SQLiteSource,
+    SyntheticGBMSource,
+)
+
+
+def _time_fetch(source, tickers, start):
+    t0 = time.perf_counter()
+    if source.supports_batch:
+        frames = source.fetch_many(tickers, start)
+    else:
+        frames = {tk: source.fetch(tk, start) for tk in tickers}
+    elapsed = time.perf_counter() - t0
+    rows = sum(len(df) for df in frames.values())
+    return elapsed, rows
+
+
+def run_benchmark(n_tickers=100, origin="1995-01-01", end="2024-12-31", start="1995-01-01"):
+    """Return ``{backend: (seconds, rows)}`` for a synthetic universe."""
+    synth = SyntheticGBMSource(origin=origin, end=end)
+    tickers = [f"SYN{i:04d}" for i in range(n_tickers)]
+    results = {"synthetic": _time_fetch(synth, tickers, start)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_dir = os.path.join(tmp, "csv")
+        pq_dir = os.path.join(tmp, "parquet")
+        os.makedirs(csv_dir)
+        os.makedirs(pq_dir)
+        db = SQLiteSource(os.path.join(tmp, "prices.sqlite"))
+
+        try:
+            import pyarrow  # noqa: F401
+            have_parquet = True
+        except ImportError:
+            have_parquet = False
+
+        for tk in tickers:
+            df = synth.generate(tk)
+            df.reset_index().to_csv(os.path.join(csv_dir, f"{tk}.csv"), index=False)
+            if have_parquet:
+                df.reset_index().to_parquet(os.path.join(pq_dir, f"{tk}.parquet"), index=False)
+            db.store(tk, df)
+
+        results["csv_dir"] = _time_fetch(DirectorySource(csv_dir), tickers, start)
+        if have_parquet:
+            results["parquet_dir"] = _time_fetch(DirectorySource(pq_dir), tickers, start)
+        results["sqlite"] = _time_fetch(db, tickers, start)
+
+    return results
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark local data source backends")
+    parser.add_argument("--tickers", type=int, default=100, help="Universe size")
+    parser.add_argument("--origin", default="1995-01-01", help="First synthetic bar")
+    parser.add_argument("--end", default="2024-12-31", help="Last synthetic bar")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    results = run_benchmark(args.tickers, origin=args.origin, end=args.end, start=args.origin)
+    print(f"{'backend':<12} {'seconds':>9} {'rows':>10} {'rows/s':>12}")
+    for name, (secs, rows) in sorted(results.items(), key=lambda kv: kv[1][0]):
+        print(f"{name:<12} {secs:>9.3f} {rows:>10} {rows / secs if secs else 0:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Measure Monte Carlo throughput in paths per second.
+
+History comes from :class:`data.sources.SyntheticGBMSource`; the approach is
+simulated over ``--paths`` bootstrap paths of ``--years`` with
+:func:`simulation.monte_carlo.run_monte_carlo`.  The projection for 10,000
+paths scales the measured rate linearly.  Run with::
+
+    python -m stock_market_simulator.benchmarks.bench_monte_carlo --paths 2000 --workers 8
+"""
+
+import argparse
+import time
+from typing import Iterable
+
+from stock_market_simulator.data.sources import SyntheticGBMSource
+from stock_market_simulator.simulation.monte_carlo import METHODS, run_monte_carlo
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+
+def run_benchmark(n_paths=1000, years=10, strategy="buy_hold", method="bootstrap", workers=None):
+    """Return the seconds taken to simulate ``n_paths`` paths."""
+    synth = SyntheticGBMSource(origin="1995-01-01", end="2024-12-31")
+    dfs = {"SYN": synth.generate("SYN")}
+    info = {"SYN": {"strategy": STRATEGY_MAP[strategy], "spread": 0.05, "expense_ratio": 0.1}}
+    t0 = time.perf_counter()
+    run_monte_carlo(dfs, strategy, info, years, n_paths, method, seed=0, workers=workers)
+    return time.perf_counter() - t0
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Monte Carlo runs")
+    parser.add_argument("--paths", type=int, default=1000, help="Synthetic paths")
+    parser.add_argument("--years", type=int, default=10, help="Path length")
+    parser.add_argument("--strategy", default="buy_hold", choices=sorted(STRATEGY_MAP))
+    parser.add_argument("--method", default="bootstrap", choices=METHODS)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    secs = run_benchmark(args.paths, args.years, args.strategy, args.method, args.workers)
+    rate = args.paths / secs
+    print(f"{args.paths} paths x {args.years} years: {secs:.2f}s ({rate:.0f} paths/s)")
+    print(f"projected 10000 paths: {10000 / rate:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Measure how much work sharing legs between approaches saves.
+
+``--tickers`` synthetic tickers (from :class:`data.sources.SyntheticGBMSource`)
+are combined into approaches of one buy-and-hold "core" ticker plus one
+ticker traded with each strategy, the shape of a typical comparison config.
+The sweeps run once approach by approach
+(:func:`simulation.simulator.run_configured_sweep`) and once together
+(:func:`simulation.simulator.run_shared_sweeps`), and the results are checked
+to be identical.  Run with::
+
+    python -m stock_market_simulator.benchmarks.bench_shared_legs --tickers 4 --years 10
+"""
+
+import argparse
+import time
+from typing import Iterable
+
+from stock_market_simulator.data.sources import SyntheticGBMSource
+from stock_market_simulator.simulation.legs import LegCache
+from stock_market_simulator.simulation.simulator import run_configured_sweep, run_shared_sweeps
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+STRATEGIES = ("buy_hold", "sma_trading", "rsi", "momentum_breakout", "advanced_daytrading")
+
+
+def build_approaches(tickers):
+    """Approaches ``CORE buy_hold + <ticker> <strategy>`` for every pair."""
+    core = {"strategy": STRATEGY_MAP["buy_hold"], "spread": 0.05, "expense_ratio": 0.1}
+    approaches = []
+    for tk in tickers[1:]:
+        for strategy in STRATEGIES:
+            leg = {"strategy": STRATEGY_MAP[strategy], "spread": 0.05}
+            approaches.append((f"{tk}_{strategy}", {tickers[0]: core, tk: leg}))
+    return approaches
+
+
+def run_benchmark(n_tickers=4, years=10, stepsize=3):
+    """Return ``(separate_secs, shared_secs, legs_cache)``."""
+    synth = SyntheticGBMSource(origin="1995-01-01", end="2024-12-31")
+    tickers = [f"SYN{i}" for i in range(n_tickers)]
+    dfs = {tk: synth.generate(tk) for tk in tickers}
+    approaches = build_approaches(tickers)
+
+    t0 = time.perf_counter()
+    separate = {name: run_configured_sweep({tk: dfs[tk] for tk in info}, name, info, years, stepsize)
+                for name, info in approaches}
+    separate_secs = time.perf_counter() - t0
+
+    legs = LegCache()
+    t0 = time.perf_counter()
+    shared = run_shared_sweeps(dfs, approaches, years, stepsize, legs=legs)
+    shared_secs = time.perf_counter() - t0
+    if shared != separate:
+        raise AssertionError("Shared sweeps differ from separate sweeps.")
+    return separate_secs, shared_secs, legs
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark leg sharing between approaches")
+    parser.add_argument("--tickers", type=int, default=4, help="Synthetic tickers (first one is the core)")
+    parser.add_argument("--years", type=int, default=10, help="Window length")
+    parser.add_argument("--stepsize", type=int, default=3, help="Keep every n-th monthly start")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    separate, shared, legs = run_benchmark(args.tickers, args.years, args.stepsize)
+    print(f"{len(STRATEGIES) * (args.tickers - 1)} approaches x {args.years} years")
+    print(f"separate: {separate:.2f}s")
+    print(f"shared:   {shared:.2f}s ({separate / shared:.1f}x, "
+          f"{legs.misses} legs simulated, {legs.hits} reused)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Streaming access to intraday (e.g. 1-minute) bars.
+
+Ten years of minute bars are millions of rows per ticker; loading them into a
+DataFrame per ticker and slicing windows with boolean masks does not fit in
+memory for a universe.  This module never materialises a full intraday
+series:
+
+* :func:`iter_chunks` reads a per-ticker file in bounded chunks.  Parquet is
+  scanned through :mod:`pyarrow.dataset` so only the timestamp range that is
+  asked for is decoded (row groups outside it are skipped via their
+  statistics); CSV files are read with ``pandas.read_csv(chunksize=...)``.
+* :func:`resample_daily` turns a chunk stream into completed daily OHLCV bars
+  with array reductions, carrying the partial last day of each chunk into the
+  next one.
+* :func:`daily_frame` collects those daily bars into the usual daily
+  DataFrame, so the existing loaders, sweeps and strategies work on minute
+  data unchanged.
+* :func:`stream_daily_bars` yields ``(timestamp, {ticker: (open, high, low,
+  close, volume)})`` rows on the dates all tickers share.
+  :func:`simulation.simulator.run_hybrid_multi_fund` accepts that generator in
+  place of a dict of DataFrames.
+
+Files hold one ticker each, named like the cache (``^`` replaced by ``_``);
+a directory of Parquet files (e.g. one per year) is read as one dataset in
+file-name order.  Data needs a ``Datetime`` (or ``Date``) column and ``Open, High, Low, Close,
+Volume``.  Rows must be in time order.  Reading Parquet requires ``pyarrow``.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from stock_market_simulator.data.sources import _safe_name
+
+# Rows per chunk; about 16 MiB of float64 OHLCV plus timestamps.
+DEFAULT_CHUNK_ROWS = 250_000
+
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+_TIME_COLUMNS = ("Datetime", "Date")
+
+
+def minute_path(directory, ticker):
+    """Return the Parquet or CSV file for ``ticker`` in ``directory``."""
+    base = os.path.join(directory, _safe_name(ticker))
+    for ext in (".parquet", ".csv"):
+        if os.path.exists(base + ext):
+            return base + ext
+    raise FileNotFoundError(f"No intraday data for {ticker} in {directory}")
+
+
+def write_minute_parquet(df, path, row_group_size=100_000):
+    """Store ``df`` (DatetimeIndex + OHLCV) for streaming reads.
+
+    Small row groups let range scans skip data they do not need.
+    """
+    out = df[[c for c in OHLCV if c in df.columns]].copy()
+    out.index = pd.DatetimeIndex(out.index).tz_localize(None) if out.index.tz is not None else out.index
+    out = out.rename_axis("Datetime").reset_index()
+    out.to_parquet(path, index=False, row_group_size=row_group_size)
+
+
+def _frame(table_df, time_col):
+    table_df = table_df.dropna(subset=["Close"])
+    index = pd.DatetimeIndex(pd.to_datetime(table_df[time_col]))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    cols = [c for c in OHLCV if c in table_df.columns]
+    frame = table_df[cols].set_axis(index, axis=0)
+    frame.index.name = "Datetime"
+    return frame
+
+
+def _iter_parquet(path, start, end, chunksize):
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(path, format="parquet")
+    time_col = next(c for c in _TIME_COLUMNS if c in dataset.schema.names)
+    columns = [time_col] + [c for c in OHLCV if c in dataset.schema.names]
+    field = ds.field(time_col)
+    expr = None
+    time_type = dataset.schema.field(time_col).type
+    if start is not None:
+        expr = field >= pd.Timestamp(start).to_datetime64().astype(_numpy_unit(time_type))
+    if end is not None:
+        cond = field < pd.Timestamp(end).to_datetime64().astype(_numpy_unit(time_type))
+        expr = cond if expr is None else expr & cond
+    scanner = dataset.scanner(columns=columns, filter=expr, batch_size=chunksize)
+    for batch in scanner.to_batches():
+        if batch.num_rows:
+            yield _frame(batch.to_pandas(), time_col)
+
+
+def _numpy_unit(arrow_type):
+    unit = getattr(arrow_type, "unit", "ns")
+    return f"datetime64[{unit}]"
+
+
+def _iter_csv(path, start, end, chunksize):
+    header = pd.read_csv(path, nrows=0).columns
+    time_col = next(c for c in _TIME_COLUMNS if c in header)
+    start = None if start is None else pd.Timestamp(start)
+    end = None if end is None else pd.Timestamp(end)
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        frame = _frame(chunk, time_col)
+        if end is not None and len(frame) and frame.index[0] >= end:
+            return
+        if start is not None:
+            frame = frame.loc[frame.index >= start]
+        if end is not None:
+            frame = frame.loc[frame.index < end]
+        if len(frame):
+            yield frame
+
+
+def iter_chunks(path, start=None, end=None, chunksize=DEFAULT_CHUNK_ROWS):
+    """Yield DataFrames of at most ``chunksize`` rows in ``[start, end)``."""
+    if path.endswith(".parquet") or os.path.isdir(path):
+        return _iter_parquet(path, start, end, chunksize)
+    return _iter_csv(path, start, end, chunksize)
+
+
+def _daily_groups(frame):
+    """Aggregate one chunk into ``(days, open, high, low, close, volume)`` arrays."""
+    days = frame.index.values.astype("datetime64[D]")
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    ends = np.r_[starts[1:], len(days)] - 1
+    o = frame["Open"].to_numpy(dtype=float) if "Open" in frame else frame["Close"].to_numpy(dtype=float)
+    h = frame["High"].to_numpy(dtype=float) if "High" in frame else frame["Close"].to_numpy(dtype=float)
+    lo = frame["Low"].to_numpy(dtype=float) if "Low" in frame else frame["Close"].to_numpy(dtype=float)
+    c = frame["Close"].to_numpy(dtype=float)
+    v = frame["Volume"].to_numpy(dtype=float) if "Volume" in frame else np.zeros(len(c))
+    # Missing intraday Open/High/Low fall back to the close of that minute.
+    o = np.where(np.isnan(o), c, o)
+    h = np.fmax(h, c)
+    lo = np.fmin(lo, c)
+    return (
+        days[starts].astype(frame.index.values.dtype),
+        o[starts],
+        np.maximum.reduceat(h, starts),
+        np.minimum.reduceat(lo, starts),
+        c[ends],
+        np.add.reduceat(np.nan_to_num(v), starts),
+    )
+
+
+def resample_daily(chunks):
+    """Yield DataFrames of completed daily bars from a stream of intraday chunks.
+
+    The last day of every chunk may continue in the next one, so it is held
+    back and merged; memory stays bounded by one chunk.
+    """
+    pending = None
+    for frame in chunks:
+        days, o, h, lo, c, v = _daily_groups(frame)
+        if pending is not None:
+            if days[0] == pending[0]:
+                o[0] = pending[1]
+                h[0] = max(h[0], pending[2])
+                lo[0] = min(lo[0], pending[3])
+                v[0] += pending[5]
+            else:
+                days, o, h, lo, c, v = (np.r_[p, arr] for p, arr in zip(pending, (days, o, h, lo, c, v)))
+        pending = (days[-1], o[-1], h[-1], lo[-1], c[-1], v[-1])
+        if len(days) > 1:
+            yield _daily_frame(days[:-1], o[:-1], h[:-1], lo[:-1], c[:-1], v[:-1])
+    if pending is not None:
+        yield _daily_frame(*(np.atleast_1d(p) for p in pending))
+
+
+def _daily_frame(days, o, h, lo, c, v):
+    index = pd.DatetimeIndex(days, name="Date")
+    return pd.DataFrame({"Open": o, "High": h, "Low": lo, "Close": c, "Volume": v}, index=index)
+
+
+def daily_frame(path, start=None, end=None, chunksize=DEFAULT_CHUNK_ROWS):
+    """Return the daily OHLCV DataFrame of an intraday file, read in chunks."""
+    parts = list(resample_daily(iter_chunks(path, start, end, chunksize)))
+    if not parts:
+        return pd.DataFrame(columns=OHLCV, index=pd.DatetimeIndex([], name="Date"))
+    return pd.concat(parts)
+
+
+def _daily_rows(path, start, end, chunksize):
+    for part in resample_daily(iter_chunks(path, start, end, chunksize)):
+        days = part.index
+        bars = zip(part["Open"].tolist(), part["High"].tolist(), part["Low"].tolist(), part["Close"].tolist(),
+                   part["Volume"].tolist())
+        yield from zip(days, bars)
+
+
+def stream_daily_bars(paths, start=None, end=None, chunksize=DEFAULT_CHUNK_ROWS):
+    """Yield ``(timestamp, {ticker: (open, high, low, close, volume)})`` per common day.
+
+    ``paths`` maps ticker -> intraday file.  Each file is resampled on the fly
+    and the streams are merge-joined, so only days present for every ticker
+    are produced – the streaming equivalent of
+    :func:`simulation.alignment.align`.
+    """
+    streams = {tk: _daily_rows(p, start, end, chunksize) for tk, p in paths.items()}
+    heads = {}
+    for tk, stream in streams.items():
+        row = next(stream, None)
+        if row is None:
+            return
+        heads[tk] = row
+    while True:
+        latest = max(day for day, _ in heads.values())
+        for tk, stream in streams.items():
+            while heads[tk][0] < latest:
+                row = next(stream, None)
+                if row is None:
+                    return
+                heads[tk] = row
+        if all(day == latest for day, _ in heads.values()):
+            yield latest, {tk: bar for tk, (_, bar) in heads.items()}
+            for tk, stream in streams.items():
+                row = next(stream, None)
+                if row is None:
+                    return
+                heads[tk] = row
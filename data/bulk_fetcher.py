@@ -0,0 +1,175 @@
+"""Prime or refresh the local CSV cache for many tickers at once.
+
+:func:`data.data_fetcher.load_historical_data` handles one ticker at a time and
+is meant to be called lazily by the simulator.  Preparing a large universe that
+way is slow because every download waits for the previous one.  This module
+plans all downloads up front, groups tickers that need the same start date into
+batched requests (when the source supports it) and runs those requests on a
+bounded thread pool.  Downloads are I/O bound, so threads are sufficient.
+
+Each cache file is updated under its :class:`filelock.FileLock` and written
+atomically, so prefetching can run while simulations read the same directory.
+
+Example::
+
+    python -m stock_market_simulator.data.bulk_fetcher ^GSPC ^IXIC QQQ --workers 8
+"""
+
+import argparse
+import concurrent.futures
+import os
+from datetime import datetime
+from typing import Iterable
+
+import pandas as pd
+from filelock import FileLock
+
+from stock_market_simulator.data import data_fetcher
+from stock_market_simulator.data.sources import YFinanceSource
+
+
+def _plan_start(ticker, start_date, local_data_dir, today_str):
+    """Return the first date that must be requested for ``ticker``.
+
+    ``None`` means the cache is already current.  Only the end of the cache
+    file is read, so planning a large, mostly current universe stays cheap.
+    """
+    last = data_fetcher.last_cached_date(data_fetcher.cache_csv_path(ticker, local_data_dir))
+    if last is None:
+        return start_date
+    new_start = (last + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    return new_start if new_start < today_str else None
+
+
+def _store(ticker, new_df, local_data_dir):
+    """Merge ``new_df`` into the cache file for ``ticker``; return rows added."""
+    if new_df is None or new_df.empty:
+        return 0
+    new_df = new_df.dropna(subset=["Close"])
+    if new_df.empty:
+        return 0
+    path = data_fetcher.cache_csv_path(ticker, local_data_dir)
+    with FileLock(f"{path}.lock"):
+        cached = data_fetcher.read_cached_csv(path) if os.path.exists(path) else None
+        if cached is None or cached.empty:
+            data_fetcher.write_csv_atomic(new_df.sort_index(), path)
+            added = len(new_df)
+        else:
+            merged = data_fetcher.merge_new_rows(cached, new_df, path)
+            added = len(merged) - len(cached)
+    # Drop any stale in-memory copy so the next load sees the new rows.
+    data_fetcher.invalidate(ticker)
+    return added
+
+
+def _fetch_group(source, tickers, start, local_data_dir):
+    """Download one group of tickers sharing ``start`` and persist them."""
+    if source.supports_batch and len(tickers) > 1:
+        frames = source.fetch_many(tickers, start)
+    else:
+        frames = {tk: source.fetch(tk, start) for tk in tickers}
+    return {tk: _store(tk, frames.get(tk), local_data_dir) for tk in tickers}
+
+
+def prefetch(tickers: Iterable[str], start_date="1980-01-01", local_data_dir="data/local_csv",
+             source=None, max_workers=8, batch_size=50) -> dict:
+    """Download or update ``tickers`` concurrently.
+
+    Parameters
+    ----------
+    tickers:
+        Symbols to prime.  Duplicates are ignored.
+    start_date:
+        First date requested for tickers without a cache file.
+    local_data_dir:
+        Cache directory shared with :func:`load_historical_data`.
+    source:
+        :class:`data.sources.DataSource` to download from; defaults to Yahoo
+        Finance.
+    max_workers:
+        Upper bound on concurrent requests.
+    batch_size:
+        Maximum tickers per multi-ticker request for batch-capable sources.
+
+    Returns
+    -------
+    dict
+        Mapping ticker -> number of new rows written (0 when already current),
+        or the exception raised while fetching that ticker.
+    """
+    source = source or YFinanceSource()
+    os.makedirs(local_data_dir, exist_ok=True)
+    today_str = datetime.today().strftime("%Y-%m-%d")
+
+    results = {}
+    groups = {}
+    for tk in dict.fromkeys(tickers):
+        start = _plan_start(tk, start_date, local_data_dir, today_str)
+        if start is None:
+            results[tk] = 0
+        else:
+            groups.setdefault(start, []).append(tk)
+
+    step = max(1, batch_size) if source.supports_batch else 1
+    chunks = [
+        (start, tks[i:i + step])
+        for start, tks in groups.items()
+        for i in range(0, len(tks), step)
+    ]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        future_map = {
+            executor.submit(_fetch_group, source, chunk, start, local_data_dir): chunk
+            for start, chunk in chunks
+        }
+        for fut in concurrent.futures.as_completed(future_map):
+            chunk = future_map[fut]
+            try:
+                results.update(fut.result())
+            except Exception as e:
+                print(f"[ERROR] Prefetch failed for {', '.join(chunk)}: {e}")
+                for tk in chunk:
+                    results[tk] = e
+
+    return results
+
+
+def _read_ticker_file(path):
+    with open(path, "r") as f:
+        return [ln.strip() for ln in f if ln.strip() and not ln.strip().startswith('#')]
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Download or update cached price history for many tickers"
+    )
+    parser.add_argument("tickers", nargs="*", help="Ticker symbols to fetch")
+    parser.add_argument("--file", help="Text file with one ticker per line")
+    parser.add_argument("--start", default="1980-01-01", help="Start date for new tickers")
+    parser.add_argument("--dir", default="data/local_csv", help="Cache directory")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent requests")
+    parser.add_argument("--batch-size", type=int, default=50, help="Tickers per batched request")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    tickers = list(args.tickers)
+    if args.file:
+        tickers.extend(_read_ticker_file(args.file))
+    if not tickers:
+        parser.error("no tickers given")
+
+    results = prefetch(
+        tickers,
+        start_date=args.start,
+        local_data_dir=args.dir,
+        max_workers=args.workers,
+        batch_size=args.batch_size,
+    )
+    failed = [tk for tk, r in results.items() if isinstance(r, Exception)]
+    updated = sum(1 for r in results.values() if not isinstance(r, Exception) and r > 0)
+    print(f"[PREFETCH] {len(results)} tickers: {updated} updated, {len(failed)} failed.")
+    for tk in failed:
+        print(f"  {tk}: {results[tk]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,27 +8,46 @@ kept deliberately strict to avoid surprises: if a file's columns deviate from
 machines and library versions.
 
 A :class:`filelock.FileLock` is used to guard concurrent access so multiple
-processes can safely load or update the same cache file.
+processes can safely load or update the same cache file.  Files are written to a
+temporary sibling and renamed into place so a crash never leaves a half-written
+CSV behind.  Daily updates only append the new rows to a small segment file next
+to the CSV; the segment is compacted into the main file periodically.
+
+Downloads go through a :class:`data.sources.DataSource`.  ``yfinance`` is the
+default; passing another source lets tests and offline tools reuse the exact
+same caching logic.  ``yfinance`` is only imported when a download actually
+happens, so loading from the cache (as every sweep worker does) does not pay
+for importing it.
 """
 
 import os
+import threading
 from datetime import datetime
+from io import StringIO
 
 import pandas as pd
-import yfinance as yf
 from filelock import FileLock
 
-# Expected column order for all cached CSVs
-EXPECTED_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+from stock_market_simulator.data.data_local_cache import DATA_CACHE
+from stock_market_simulator.data.sources import EXPECTED_COLUMNS, normalize_ohlcv
+
+# Incremental updates are appended to ``<ticker>.csv.append`` and folded back
+# into the base CSV once the segment holds this many rows.
+SEGMENT_SUFFIX = ".append"
+SEGMENT_COMPACT_ROWS = 64
 
 # In-memory cache to avoid redundant downloads during a single run.  This keeps
 # repeated calls to :func:`load_historical_data` lightweight when several
-# strategies operate on the same ticker in one simulation sweep.
-_data_cache = {}
+# strategies operate on the same ticker in one simulation sweep.  It is the
+# shared, memory-bounded LRU from :mod:`data.data_local_cache` so long-lived
+# processes touching many tickers do not grow without limit.
+_data_cache = DATA_CACHE
 
 
 def _safe_download(ticker: str, start: str) -> pd.DataFrame:
     """Attempt to download price data with a fallback."""
+    import yfinance as yf
+
     try:
         df = yf.download(
             ticker,
@@ -66,21 +85,189 @@ def _safe_download(ticker: str, start: str) -> pd.DataFrame:
 
     if not df.empty:
         # Ensure timezone naive index and align to EXPECTED_COLUMNS
-        if getattr(df.index, "tz", None) is not None:
-            df.index = df.index.tz_localize(None)
-        df = df.reset_index()
-        df = df[[c for c in EXPECTED_COLUMNS if c in df.columns]]
-        # Some older versions include "Adj Close"; ignore other columns
-        missing = [c for c in EXPECTED_COLUMNS if c not in df.columns]
-        for c in missing:
-            df[c] = pd.NA
-        df = df[EXPECTED_COLUMNS]
-        df.set_index("Date", inplace=True)
+        df = normalize_ohlcv(df)
+
+    return df
+
+
+def _download(ticker: str, start: str, source=None) -> pd.DataFrame:
+    """Fetch ``ticker`` from ``source`` or Yahoo Finance when ``source`` is None."""
+    if source is None:
+        return _safe_download(ticker, start)
+    return source.fetch(ticker, start)
+
+
+def cache_csv_path(ticker: str, local_data_dir="data/local_csv") -> str:
+    """Return the cache file path used for ``ticker``."""
+    safe_ticker = ticker.replace('^', '_')
+    return os.path.join(local_data_dir, f"{safe_ticker}.csv")
+
+
+def write_csv_atomic(df: pd.DataFrame, path: str) -> None:
+    """Persist ``df`` (indexed by Date) to ``path`` via write-then-rename.
 
+    The temporary name includes the process and thread id so concurrent writers
+    never share a scratch file; :func:`os.replace` makes the swap atomic.  The
+    file now holds the complete history, so any append segment is removed
+    afterwards (a crash in between only leaves duplicate rows that readers
+    drop).
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        df.rename_axis("Date").reset_index()[EXPECTED_COLUMNS].to_csv(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    segment_path = path + SEGMENT_SUFFIX
+    if os.path.exists(segment_path):
+        os.remove(segment_path)
+
+
+def _truncate_torn_tail(segment_path: str) -> None:
+    """Cut a partial last row so the next append starts on a fresh line."""
+    if not os.path.exists(segment_path):
+        return
+    with open(segment_path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def _read_segment(segment_path: str) -> pd.DataFrame:
+    """Read the append segment, ignoring a torn trailing line."""
+    with open(segment_path, "r", newline="") as f:
+        text = f.read()
+    if not text.endswith("\n"):
+        # A crash during an append can leave a partial last row behind.
+        text = text[:text.rfind("\n") + 1]
+    if not text.strip():
+        return pd.DataFrame()
+    seg = pd.read_csv(StringIO(text), parse_dates=["Date"], index_col="Date")
+    seg.index = pd.to_datetime(seg.index, errors="coerce")
+    return seg[~seg.index.isna()]
+
+
+def read_cached_csv(path: str):
+    """Load a cache CSV, returning ``None`` when its header is outdated.
+
+    Rows in the append segment (see :func:`merge_new_rows`) are merged in and
+    take precedence over the base file for duplicate dates.
+    """
+    header_cols = list(pd.read_csv(path, nrows=0).columns)
+    if header_cols != EXPECTED_COLUMNS:
+        return None
+    df = pd.read_csv(path, parse_dates=["Date"], index_col="Date")
+    df.index = pd.to_datetime(df.index, errors="coerce")
+    df = df[~df.index.isna()]
+    segment_path = path + SEGMENT_SUFFIX
+    if os.path.exists(segment_path):
+        seg = _read_segment(segment_path)
+        if not seg.empty:
+            df = pd.concat([df, seg])
+            df = df[~df.index.duplicated(keep='last')]
+    df.sort_index(inplace=True)
+    # Remove any placeholder rows that may have been written by older runs
+    df.dropna(subset=["Close"], inplace=True)
     return df
 
 
-def load_historical_data(ticker: str, start_date="1980-01-01", local_data_dir="data/local_csv") -> pd.DataFrame:
+def _last_row_date(path: str, chunk_size=4096):
+    """Date of the last row of a sorted cache CSV that has a Close price.
+
+    Reads the file backwards in chunks, so the cost does not grow with the
+    history.  Returns ``None`` when no such row exists.
+    """
+    close_col = EXPECTED_COLUMNS.index("Close")
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        tail = b""
+        while pos > 0:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+            lines = tail.split(b"\n")
+            # The first piece may be the end of an earlier line.
+            tail = lines[0] if pos > 0 else b""
+            for line in reversed(lines[1:] if pos > 0 else lines):
+                fields = line.decode().strip().split(",")
+                if len(fields) != len(EXPECTED_COLUMNS) or not fields[close_col]:
+                    continue
+                date = pd.to_datetime(fields[0], errors="coerce")
+                if not pd.isna(date) and not pd.isna(pd.to_numeric(fields[close_col], errors="coerce")):
+                    return date
+    return None
+
+
+def last_cached_date(path: str):
+    """Return the last date :func:`read_cached_csv` would load from ``path``.
+
+    Only the header and the tail of the base file are read (it is always
+    written sorted), plus the small append segment.  ``None`` means there is
+    no usable cache: the file is missing, empty or has an outdated header.
+    """
+    if not os.path.exists(path):
+        return None
+    header_cols = list(pd.read_csv(path, nrows=0).columns)
+    if header_cols != EXPECTED_COLUMNS:
+        return None
+    last = _last_row_date(path)
+    segment_path = path + SEGMENT_SUFFIX
+    if os.path.exists(segment_path):
+        seg = _read_segment(segment_path)
+        if not seg.empty:
+            seg = seg.dropna(subset=["Close"])
+        if not seg.empty:
+            seg_last = seg.index.max()
+            last = seg_last if last is None else max(last, seg_last)
+    return last
+
+
+def merge_new_rows(df: pd.DataFrame, new_df: pd.DataFrame, path: str) -> pd.DataFrame:
+    """Merge freshly downloaded rows into ``df`` and persist the result.
+
+    Only ``new_df`` is written: it is appended to ``<path>.append`` so a daily
+    refresh costs time proportional to the new rows rather than the whole
+    history.  Once the segment grows past ``SEGMENT_COMPACT_ROWS`` it is folded
+    back into the base CSV with an atomic rewrite.
+
+    Callers must hold the cache file's lock.  Returns the merged frame.
+    """
+    new_df = new_df.dropna(subset=["Close"])
+    if new_df.empty:
+        return df
+
+    segment_path = path + SEGMENT_SUFFIX
+    _truncate_torn_tail(segment_path)
+    is_new_segment = not os.path.exists(segment_path) or os.path.getsize(segment_path) == 0
+    with open(segment_path, "a", newline="") as f:
+        new_df.rename_axis("Date").reset_index()[EXPECTED_COLUMNS].to_csv(f, header=is_new_segment, index=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+    # Append new rows, drop duplicates (some feeds backfill) and keep the
+    # in-memory frame sorted like a freshly loaded one.
+    df = pd.concat([df, new_df])
+    if not df.index.is_monotonic_increasing or df.index.has_duplicates:
+        df = df[~df.index.duplicated(keep='last')]
+        df.sort_index(inplace=True)
+
+    with open(segment_path, "r") as f:
+        segment_rows = sum(1 for _ in f) - 1
+    if segment_rows >= SEGMENT_COMPACT_ROWS:
+        write_csv_atomic(df, path)
+    return df
+
+
+def invalidate(ticker: str) -> None:
+    """Forget the in-memory copy of ``ticker`` so the next load rereads the cache."""
+    _data_cache.pop(ticker, None)
+
+
+def load_historical_data(ticker: str, start_date="1980-01-01", local_data_dir="data/local_csv",
+                         source=None) -> pd.DataFrame:
     """
     Load historical data for 'ticker' from a local CSV if available;
     otherwise download from Yahoo Finance and store a local copy.
@@ -90,20 +277,22 @@ def load_historical_data(ticker: str, start_date="1980-01-01", local_data_dir="d
 
     The function now detects whether the CSV file has a header row or not and adapts accordingly.
     If the loaded CSV is empty, it will re-download data from Yahoo Finance.
+
+    ``source`` optionally replaces Yahoo Finance with any
+    :class:`data.sources.DataSource`.
     """
-    global _data_cache
-    if ticker in _data_cache:
+    cached = _data_cache.get(ticker)
+    if cached is not None:
         # Quick exit when data has already been loaded earlier in the process.
         print(f"[CACHE HIT] {ticker} in-memory.")
-        return _data_cache[ticker]
+        return cached
 
     # Ensure the local data directory exists
     if not os.path.exists(local_data_dir):
         os.makedirs(local_data_dir)
 
-    safe_ticker = ticker.replace('^', '_')
-    csv_filename = f"{safe_ticker}.csv"
-    local_csv_path = os.path.join(local_data_dir, csv_filename)
+    local_csv_path = cache_csv_path(ticker, local_data_dir)
+    csv_filename = os.path.basename(local_csv_path)
 
     df = pd.DataFrame()
 
@@ -113,61 +302,48 @@ def load_historical_data(ticker: str, start_date="1980-01-01", local_data_dir="d
         # process loaded the data while we were waiting.  This minimizes network
         # traffic when multiple workers start simultaneously.
         if ticker in _data_cache:
-            print(f"[CACHE HIT] {ticker} in-memory (after lock).")
-            return _data_cache[ticker]
+            cached = _data_cache.get(ticker)
+            if cached is not None:
+                print(f"[CACHE HIT] {ticker} in-memory (after lock).")
+                return cached
 
         if os.path.exists(local_csv_path):
             print(f"[LOCAL CSV] Loading {ticker} from {local_csv_path}")
-            header_cols = list(pd.read_csv(local_csv_path, nrows=0).columns)
-            if header_cols != EXPECTED_COLUMNS:
+            cached = read_cached_csv(local_csv_path)
+            if cached is None:
                 # A mismatch usually means an old cache file from a previous
                 # version of the project.  Redownload to avoid subtle bugs.
                 print(f"[WARNING] Unexpected columns in {csv_filename}; redownloading.")
-                df = _safe_download(ticker, start_date)
+                df = _download(ticker, start_date, source)
                 if not df.empty:
                     # Drop rows without a valid closing price before persisting
                     df.dropna(subset=["Close"], inplace=True)
                 if not df.empty:
-                    df.reset_index()[EXPECTED_COLUMNS].to_csv(local_csv_path, index=False)
+                    write_csv_atomic(df, local_csv_path)
             else:
-                df = pd.read_csv(
-                    local_csv_path,
-                    parse_dates=["Date"],
-                    index_col="Date",
-                )
-                df.index = pd.to_datetime(df.index, errors="coerce")
-                df = df[~df.index.isna()]
-                df.sort_index(inplace=True)
-                # Remove any placeholder rows that may have been written by older runs
-                df.dropna(subset=["Close"], inplace=True)
+                df = cached
 
         if df.empty:
             print(f"[YAHOO] Downloading {ticker} from {start_date}")
-            df = _safe_download(ticker, start_date)
+            df = _download(ticker, start_date, source)
             if not df.empty:
                 # Remove rows that lack market data before caching locally
                 df.dropna(subset=["Close"], inplace=True)
             if not df.empty:
-                df.reset_index()[EXPECTED_COLUMNS].to_csv(local_csv_path, index=False)
+                write_csv_atomic(df, local_csv_path)
         else:
             last_date = df.index[-1]
             new_start_date = (last_date + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
             today_str = datetime.today().strftime("%Y-%m-%d")
             if new_start_date < today_str:
                 print(f"[UPDATE] Checking for new data for {ticker} from {new_start_date} to {today_str}")
-                new_df = _safe_download(ticker, new_start_date)
+                new_df = _download(ticker, new_start_date, source)
                 if not new_df.empty:
                     # Discard rows with missing prices which can appear when the
                     # requested range spans non-trading days.
                     new_df.dropna(subset=["Close"], inplace=True)
                 if not new_df.empty:
-                    # Append new rows, drop duplicates (some feeds backfill) and
-                    # then persist the extended CSV.
-                    df = pd.concat([df, new_df])
-                    df = df[~df.index.duplicated(keep='last')]
-                    df.sort_index(inplace=True)
-                    df.dropna(subset=["Close"], inplace=True)
-                    df.reset_index()[EXPECTED_COLUMNS].to_csv(local_csv_path, index=False)
+                    df = merge_new_rows(df, new_df, local_csv_path)
                     print(f"[UPDATE] CSV for {ticker} updated with new data.")
                 else:
                     print(f"[UPDATE] No new data available for {ticker} after {last_date.date()}.")
@@ -185,5 +361,5 @@ def load_historical_data(ticker: str, start_date="1980-01-01", local_data_dir="d
     df.dropna(subset=['Close'], inplace=True)
     df.sort_index(inplace=True)
 
-    _data_cache[ticker] = df
+    _data_cache.put(ticker, df)
     return df
@@ -1,26 +1,226 @@
 # stock_market_simulator/data/data_local_cache.py
 
 """
-Optional module for more advanced local caching mechanisms.
+Bounded in-memory cache shared by the data loaders and the GUI.
 
-Currently, it's just a placeholder to illustrate how you'd expand
-caching beyond a simple in-memory dict. For example, you could
-serialize DataFrames to a local SQLite DB or keep them in
-a more robust cache solution.
+Long-lived processes (the Tk visualizer, universe-wide sweeps) can touch far
+more tickers than fit in memory.  :class:`LRUCache` keeps the most recently used
+objects within a byte budget and evicts the least recently used ones first.
+Sizes are estimated once on insertion (``DataFrame.memory_usage`` for frames,
+``nbytes`` for arrays), so lookups stay O(1).
+
+With ``weak=True`` evicted entries are remembered through weak references: if
+some caller still holds the object (for example a plot that is on screen) a
+later lookup revives it without reloading and without it counting against the
+budget while evicted.
+
+``DATA_CACHE`` is the process-wide instance used by
+:func:`data.data_fetcher.load_historical_data`.  Its budget defaults to 512 MiB
+and can be changed with the ``SMS_DATA_CACHE_BYTES`` environment variable or
+:func:`configure_data_cache`.
 """
 
-# Example placeholders:
-_LOCAL_CACHE = {}
+import os
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def estimate_nbytes(obj) -> int:
+    """Best-effort memory footprint of ``obj`` in bytes."""
+    memory_usage = getattr(obj, "memory_usage", None)
+    if callable(memory_usage):
+        # DataFrame.memory_usage returns a Series, Series.memory_usage an int.
+        usage = memory_usage(index=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(obj, (tuple, list)):
+        return sys.getsizeof(obj) + sum(estimate_nbytes(o) for o in obj)
+    return sys.getsizeof(obj)
+
+
+class LRUCache:
+    """Thread-safe LRU mapping bounded by an estimated memory budget.
+
+    Parameters
+    ----------
+    max_bytes:
+        Budget for the strongly held entries.  Objects larger than the budget
+        are not retained (they are still remembered weakly when ``weak`` is on).
+    weak:
+        Keep weak references to evicted entries so they can be revived while
+        something else still holds them.
+    sizeof:
+        Function returning the size of a value; defaults to
+        :func:`estimate_nbytes`.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, weak=False, sizeof=estimate_nbytes):
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+        self._weak = weakref.WeakValueDictionary() if weak else None
+        self._sizeof = sizeof
+        self._lock = threading.RLock()
+        self._max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        with self._lock:
+            self._max_bytes = value
+            self._evict()
+
+    @property
+    def weak(self):
+        return self._weak is not None
+
+    def _evict(self):
+        while self._entries and self.current_bytes > self._max_bytes:
+            key, (value, nbytes) = self._entries.popitem(last=False)
+            self.current_bytes -= nbytes
+            self.evictions += 1
+            self._remember_weakly(key, value)
+
+    def _remember_weakly(self, key, value):
+        if self._weak is not None:
+            try:
+                self._weak[key] = value
+            except TypeError:
+                # Not every type supports weak references (e.g. lists).
+                pass
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` and mark it most recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if self._weak is not None:
+                value = self._weak.get(key)
+                if value is not None:
+                    self.hits += 1
+                    self.put(key, value)
+                    return value
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Insert ``value`` and evict least recently used entries if needed."""
+        nbytes = self._sizeof(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            if self._weak is not None:
+                self._weak.pop(key, None)
+            if nbytes > self._max_bytes:
+                self._remember_weakly(key, value)
+                return
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            self._evict()
+
+    def pop(self, key, default=None):
+        """Remove ``key`` (strong and weak) and return its value."""
+        with self._lock:
+            if self._weak is not None:
+                weak_value = self._weak.pop(key, None)
+            else:
+                weak_value = None
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return weak_value if weak_value is not None else default
+            self.current_bytes -= entry[1]
+            return entry[0]
+
+    def clear(self):
+        """Drop every entry; counters are kept (see :meth:`reset_stats`)."""
+        with self._lock:
+            self._entries.clear()
+            if self._weak is not None:
+                self._weak.clear()
+            self.current_bytes = 0
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        """Return counters and occupancy as a plain dictionary."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self._max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries or (self._weak is not None and key in self._weak)
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_MISSING = object()
+
+
+def _budget_from_env():
+    try:
+        return int(os.environ.get("SMS_DATA_CACHE_BYTES", DEFAULT_MAX_BYTES))
+    except ValueError:
+        print("Warning: invalid SMS_DATA_CACHE_BYTES; using the default budget.")
+        return DEFAULT_MAX_BYTES
+
+
+# Process-wide cache for historical price DataFrames.
+DATA_CACHE = LRUCache(max_bytes=_budget_from_env())
+
+
+def configure_data_cache(max_bytes=None, weak=None):
+    """Adjust the shared cache's budget and/or weak-reference mode."""
+    if weak is not None and weak != DATA_CACHE.weak:
+        with DATA_CACHE._lock:
+            DATA_CACHE._weak = weakref.WeakValueDictionary() if weak else None
+    if max_bytes is not None:
+        DATA_CACHE.max_bytes = max_bytes
+    return DATA_CACHE
+
 
 def get_cached_data(ticker: str):
     """
-    Retrieve a DataFrame from local cache if it exists.
+    Retrieve a DataFrame from the shared cache if it exists.
     """
-    # In a real scenario, you'd do disk-based or DB lookups here.
-    return _LOCAL_CACHE.get(ticker, None)
+    return DATA_CACHE.get(ticker)
+
 
 def store_cached_data(ticker: str, df):
     """
-    Store a DataFrame to local cache, possibly writing to disk or DB.
+    Store a DataFrame in the shared cache.
     """
-    _LOCAL_CACHE[ticker] = df
+    DATA_CACHE.put(ticker, df)
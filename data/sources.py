@@ -0,0 +1,277 @@
+"""Pluggable price data sources used by the data loaders.
+
+:func:`data.data_fetcher.load_historical_data` and the bulk prefetcher in
+:mod:`data.bulk_fetcher` only need something that can turn a ticker and a start
+date into an OHLCV DataFrame.  Keeping that behind a tiny interface means the
+cache logic can be exercised against local stand-ins (tests, benchmarks,
+offline machines) while production runs keep using Yahoo Finance.
+
+Every source returns frames in the same shape as the cached CSVs: a tz-naive
+``DatetimeIndex`` named ``Date`` and the columns ``Open, High, Low, Close,
+Volume``.  :func:`normalize_ohlcv` performs that conversion for sources whose
+raw output differs.
+
+Besides Yahoo Finance the module provides three local sources that need no
+network access: a read-only directory of Parquet/CSV files, a single SQLite
+file holding every ticker, and a deterministic synthetic price generator.
+"""
+
+import os
+import sqlite3
+import zlib
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+# Expected column order for all cached CSVs
+EXPECTED_COLUMNS = ["Date", "Open", "High", "Low", "Close", "Volume"]
+
+
+def normalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Return ``df`` with a tz-naive ``Date`` index and the OHLCV columns.
+
+    Extra columns such as ``Adj Close`` are dropped and missing ones are filled
+    with ``pd.NA`` so callers can rely on a fixed layout.
+    """
+    if df is None or df.empty:
+        return pd.DataFrame()
+    if getattr(df.index, "tz", None) is not None:
+        df.index = df.index.tz_localize(None)
+    df = df.reset_index()
+    if "Date" not in df.columns:
+        # ``reset_index`` names an anonymous index "index"; treat it as Date.
+        df = df.rename(columns={df.columns[0]: "Date"})
+    df = df[[c for c in EXPECTED_COLUMNS if c in df.columns]]
+    # Some older versions include "Adj Close"; ignore other columns
+    missing = [c for c in EXPECTED_COLUMNS if c not in df.columns]
+    for c in missing:
+        df[c] = pd.NA
+    df = df[EXPECTED_COLUMNS]
+    df.set_index("Date", inplace=True)
+    return df
+
+
+class DataSource:
+    """Interface for anything that can supply OHLCV history for a ticker.
+
+    Subclasses implement :meth:`fetch`.  Sources that can answer several
+    tickers in a single request (for example one HTTP call) set
+    ``supports_batch`` and override :meth:`fetch_many`; the bulk prefetcher
+    groups tickers accordingly.
+    """
+
+    supports_batch = False
+
+    def fetch(self, ticker: str, start: str) -> pd.DataFrame:
+        """Return OHLCV rows for ``ticker`` on or after ``start``."""
+        raise NotImplementedError
+
+    def fetch_many(self, tickers, start: str) -> dict:
+        """Return ``{ticker: DataFrame}`` for every ticker in ``tickers``."""
+        return {tk: self.fetch(tk, start) for tk in tickers}
+
+
+class YFinanceSource(DataSource):
+    """Yahoo Finance via :mod:`yfinance` (the historical default)."""
+
+    supports_batch = True
+
+    def fetch(self, ticker: str, start: str) -> pd.DataFrame:
+        # Imported lazily so the download fallbacks stay in one place and the
+        # module can be imported without yfinance installed.
+        from stock_market_simulator.data.data_fetcher import _safe_download
+
+        return _safe_download(ticker, start)
+
+    def fetch_many(self, tickers, start: str) -> dict:
+        """Download ``tickers`` with one multi-ticker ``yf.download`` call.
+
+        Tickers missing from the batched answer fall back to :meth:`fetch`,
+        which retries with ``yf.Ticker.history``.
+        """
+        import yfinance as yf
+
+        tickers = list(tickers)
+        try:
+            raw = yf.download(
+                tickers,
+                start=start,
+                progress=False,
+                auto_adjust=False,
+                group_by="ticker",
+                threads=False,
+            )
+        except Exception as e:
+            print(f"[WARNING] batched yf.download failed for {len(tickers)} tickers: {e}")
+            raw = pd.DataFrame()
+
+        out = {}
+        for tk in tickers:
+            df = pd.DataFrame()
+            if not raw.empty:
+                if isinstance(raw.columns, pd.MultiIndex):
+                    if tk in raw.columns.get_level_values(0):
+                        df = raw[tk].copy()
+                elif len(tickers) == 1:
+                    df = raw.copy()
+            if not df.empty:
+                df = df.dropna(how="all")
+            out[tk] = normalize_ohlcv(df) if not df.empty else self.fetch(tk, start)
+        return out
+
+
+def _safe_name(ticker: str) -> str:
+    return ticker.replace('^', '_')
+
+
+class DirectorySource(DataSource):
+    """Read-only directory of per-ticker Parquet or CSV files.
+
+    Files are looked up as ``<dir>/<ticker>.parquet`` first and then
+    ``<dir>/<ticker>.csv`` (``^`` replaced by ``_`` as in the cache).  CSVs must
+    use the cache layout described in ``data/CSV_FORMAT.md``; Parquet files may
+    store ``Date`` either as a column or as the index.  Reading Parquet requires
+    ``pyarrow``.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path_for(self, ticker: str):
+        """Return the file backing ``ticker`` or ``None`` when absent."""
+        base = os.path.join(self.directory, _safe_name(ticker))
+        for ext in (".parquet", ".csv"):
+            if os.path.exists(base + ext):
+                return base + ext
+        return None
+
+    def fetch(self, ticker: str, start: str) -> pd.DataFrame:
+        path = self.path_for(ticker)
+        if path is None:
+            return pd.DataFrame()
+        if path.endswith(".parquet"):
+            df = pd.read_parquet(path)
+            if "Date" in df.columns:
+                df = df.set_index("Date")
+            df.index = pd.to_datetime(df.index)
+            df.index.name = "Date"
+            df = normalize_ohlcv(df)
+        else:
+            df = pd.read_csv(path, parse_dates=["Date"], index_col="Date")
+        df = df.sort_index()
+        return df.loc[df.index >= pd.Timestamp(start)]
+
+
+class SQLiteSource(DataSource):
+    """All tickers in a single SQLite file keyed by ``(ticker, date)``.
+
+    The ``prices`` table is created ``WITHOUT ROWID`` with that composite
+    primary key, so a range query for one ticker is a single index seek.  A
+    connection is opened per call which keeps the source safe to share between
+    the prefetcher's threads.
+    """
+
+    supports_batch = True
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS prices ("
+        " ticker TEXT NOT NULL, date TEXT NOT NULL,"
+        " open REAL, high REAL, low REAL, close REAL, volume REAL,"
+        " PRIMARY KEY (ticker, date)) WITHOUT ROWID"
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute(self._SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    def store(self, ticker: str, df: pd.DataFrame) -> None:
+        """Insert or replace the rows of ``df`` for ``ticker``."""
+        if df is None or df.empty:
+            return
+        dates = pd.DatetimeIndex(df.index).strftime("%Y-%m-%d").tolist()
+        cols = [df[c].astype(float).tolist() for c in EXPECTED_COLUMNS[1:]]
+        rows = zip([ticker] * len(df), dates, *cols)
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def tickers(self):
+        """Return all tickers stored in the database."""
+        with closing(self._connect()) as conn:
+            return [r[0] for r in conn.execute("SELECT DISTINCT ticker FROM prices ORDER BY ticker")]
+
+    def fetch(self, ticker: str, start: str) -> pd.DataFrame:
+        return self.fetch_many([ticker], start)[ticker]
+
+    def fetch_many(self, tickers, start: str) -> dict:
+        tickers = list(tickers)
+        placeholders = ",".join("?" * len(tickers))
+        with closing(self._connect()) as conn:
+            raw = pd.read_sql_query(
+                "SELECT ticker, date, open, high, low, close, volume FROM prices"
+                f" WHERE ticker IN ({placeholders}) AND date >= ? ORDER BY ticker, date",
+                conn,
+                params=[*tickers, pd.Timestamp(start).strftime("%Y-%m-%d")],
+            )
+        raw.columns = ["Ticker"] + EXPECTED_COLUMNS
+        raw["Date"] = pd.to_datetime(raw["Date"])
+        out = {tk: pd.DataFrame() for tk in tickers}
+        for tk, grp in raw.groupby("Ticker", sort=False):
+            out[tk] = grp.drop(columns="Ticker").set_index("Date")
+        return out
+
+
+class SyntheticGBMSource(DataSource):
+    """Deterministic geometric Brownian motion prices for any ticker.
+
+    Each ticker gets its own random stream derived from ``seed`` and the ticker
+    name, and the full path is always generated from ``origin``.  Requests with
+    different start dates therefore return consistent, overlapping data, which
+    makes the source suitable for repeatable offline benchmarks at any
+    universe size.
+
+    ``mu`` and ``sigma`` are annualised drift and volatility; bars are placed on
+    business days between ``origin`` and ``end`` (today when omitted).
+    """
+
+    def __init__(self, mu=0.07, sigma=0.2, start_price=100.0, seed=0,
+                 origin="1980-01-01", end=None):
+        self.mu = mu
+        self.sigma = sigma
+        self.start_price = start_price
+        self.seed = seed
+        self.origin = origin
+        self.end = end
+
+    def generate(self, ticker: str) -> pd.DataFrame:
+        """Return the full synthetic history for ``ticker``."""
+        days = pd.date_range(self.origin, self.end or pd.Timestamp.today().normalize(), freq="D", name="Date")
+        # Weekday mask instead of ``bdate_range`` which builds dates in Python.
+        dates = days[days.dayofweek < 5]
+        n = len(dates)
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+        dt = 1.0 / 252.0
+        shocks = rng.standard_normal(n)
+        log_ret = (self.mu - 0.5 * self.sigma ** 2) * dt + self.sigma * np.sqrt(dt) * shocks
+        close = self.start_price * np.exp(np.cumsum(log_ret))
+        prev_close = np.concatenate(([self.start_price], close[:-1]))
+        # Open near the previous close; wicks extend a little beyond the body.
+        open_ = prev_close * np.exp(0.1 * self.sigma * np.sqrt(dt) * rng.standard_normal(n))
+        wick = np.abs(rng.standard_normal((2, n))) * 0.5 * self.sigma * np.sqrt(dt)
+        high = np.maximum(open_, close) * (1.0 + wick[0])
+        low = np.minimum(open_, close) * (1.0 - wick[1])
+        volume = np.round(rng.lognormal(mean=15.0, sigma=0.5, size=n))
+        return pd.DataFrame(
+            {"Open": open_, "High": high, "Low": low, "Close": close, "Volume": volume},
+            index=dates,
+        )
+
+    def fetch(self, ticker: str, start: str) -> pd.DataFrame:
+        df = self.generate(ticker)
+        return df.loc[df.index >= pd.Timestamp(start)]
@@ -0,0 +1,136 @@
+"""Background execution of GUI simulations.
+
+Tk is single threaded: anything slow that runs inside a button callback
+freezes the window.  :class:`SimulationWorker` moves data loading and
+simulation into an executor and hands finished approaches back through a
+:class:`queue.Queue`.  The GUI drains the queue from a Tk ``after()`` timer
+(:meth:`SimulationWorker.poll`), so each equity curve appears as soon as its
+approach finishes and the window stays responsive while the rest run.
+
+Every :meth:`SimulationWorker.submit` starts a new *batch*.  Submitting again
+or calling :meth:`SimulationWorker.cancel` retires the current batch: queued
+jobs are cancelled, and results of jobs that were already running are
+dropped when they arrive.
+
+The default executor is a process pool using the ``spawn`` start method, so
+simulations run in parallel without the GIL and without forking the Tk
+process.  Workers load their own data from the CSV cache like
+:func:`main.run_approach`.  This module does not import tkinter and can be
+used (and tested) without a display.
+"""
+
+import concurrent.futures
+import multiprocessing
+import os
+import queue
+import threading
+
+from stock_market_simulator.data.data_fetcher import load_historical_data
+from stock_market_simulator.gui.simulation_runner import run_simulation
+
+
+def simulate_approach(ticker_info_dict, start_date, years, initial_cash):
+    """Load the approach's data and simulate one window; runs in a worker."""
+    dfs_dict = {tk: load_historical_data(tk) for tk in ticker_info_dict}
+    return run_simulation(ticker_info_dict, dfs_dict, start_date, years, initial_cash)
+
+
+class SimulationWorker:
+    """Run approach simulations off the Tk thread.
+
+    Parameters
+    ----------
+    max_workers:
+        Size of the default process pool (CPU count when omitted).
+    executor:
+        Optional executor to use instead (e.g. a thread pool); it is not
+        shut down by :meth:`shutdown`.
+    job:
+        Callable ``(ticker_info_dict, start_date, years, initial_cash) ->
+        (history, index)``; must be picklable for process pools.
+    """
+
+    def __init__(self, max_workers=None, executor=None, job=simulate_approach):
+        self._own_executor = executor is None
+        self._executor = executor
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._job = job
+        self._events = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch = 0
+        self._futures = []
+        self._remaining = 0
+
+    def _get_executor(self):
+        # Created on first use so constructing the GUI stays instant.
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def submit(self, jobs, start_date, years, initial_cash):
+        """Start simulating ``jobs`` (a list of ``(name, ticker_info_dict)``).
+
+        Retires any running batch and returns the new batch id.
+        """
+        self.cancel()
+        executor = self._get_executor()
+        with self._lock:
+            batch = self._batch
+            self._remaining = len(jobs)
+            futures = []
+            for name, ticker_info_dict in jobs:
+                fut = executor.submit(self._job, ticker_info_dict, start_date, years, initial_cash)
+                # Callbacks run in executor threads; they only touch the queue.
+                fut.add_done_callback(
+                    lambda f, name=name, batch=batch: self._events.put((batch, name, f))
+                )
+                futures.append(fut)
+            self._futures = futures
+        return batch
+
+    def cancel(self):
+        """Retire the current batch; returns the number of jobs cancelled."""
+        with self._lock:
+            self._batch += 1
+            self._remaining = 0
+            cancelled = sum(fut.cancel() for fut in self._futures)
+            self._futures = []
+        return cancelled
+
+    @property
+    def busy(self):
+        """True while jobs of the current batch are still outstanding."""
+        return self._remaining > 0
+
+    def poll(self):
+        """Return finished ``(name, history, index, error)`` of the current batch.
+
+        Never blocks.  ``error`` is the exception of a failed job (with
+        ``history`` and ``index`` None); results of retired batches are
+        discarded.
+        """
+        finished = []
+        while True:
+            try:
+                batch, name, fut = self._events.get_nowait()
+            except queue.Empty:
+                return finished
+            if batch != self._batch or fut.cancelled():
+                continue
+            self._remaining -= 1
+            error = fut.exception()
+            if error is not None:
+                finished.append((name, None, None, error))
+            else:
+                history, index = fut.result()
+                finished.append((name, history, index, None))
+
+    def shutdown(self):
+        """Cancel outstanding work and stop the pool without waiting."""
+        self.cancel()
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
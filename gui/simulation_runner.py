@@ -2,19 +2,16 @@
 
 The GUI keeps user interaction and plotting logic separate from the core
 simulation routines.  This module provides a thin wrapper that prepares the
-input data structures expected by :func:`simulation.simulator.run_hybrid_multi_fund`.
+input data structures expected by :func:`simulation.simulator.simulate_window`.
 """
 
 import pandas as pd
 from datetime import datetime
-from stock_market_simulator.simulation.simulator import (
-    run_hybrid_multi_fund,
-    intersect_all_indexes,
-    HybridMultiFundPortfolio,
-)
+from stock_market_simulator.simulation.simulator import simulate_window
+from stock_market_simulator.simulation.alignment import align
 
 
-def run_simulation(ticker_info_dict, dfs_dict, start_date_str, years, initial_cash=10000.0):
+def run_simulation(ticker_info_dict, dfs_dict, start_date_str, years, initial_cash=10000.0, trades=None):
     """Run a single simulation for the given approach over the specified window.
 
     Parameters
@@ -30,6 +27,9 @@ def run_simulation(ticker_info_dict, dfs_dict, start_date_str, years, initial_ca
         Length of the simulation window in years.
     initial_cash:
         Starting cash for the virtual portfolio.
+    trades:
+        Optional dict that receives the window's ``{ticker: TradeLedger}``
+        (see :mod:`simulation.ledger`).
 
     Returns
     -------
@@ -43,26 +43,19 @@ def run_simulation(ticker_info_dict, dfs_dict, start_date_str, years, initial_ca
     start_date = pd.to_datetime(start_date_str)
     end_date = start_date + pd.Timedelta(days=years * 365)
 
-    # Filter each ticker's data to the simulation window.
-    sim_dfs = {}
-    for ticker, df in dfs_dict.items():
-        subdf = df.loc[(df.index >= start_date) & (df.index < end_date)]
-        sim_dfs[ticker] = subdf
-
-    # Intersect indexes among tickers to ensure the portfolios see the same
-    # trading days for all symbols.
-    common_idx = intersect_all_indexes(sim_dfs)
-    if common_idx.empty:
+    # The common trading days of these tickers are memoized, so re-running
+    # with another start date only costs two binary searches.
+    calendar = align(dfs_dict)
+    i0, i1 = calendar.window(start_date, end_date)
+    if i1 <= i0:
         raise ValueError("No common trading days in the specified simulation window.")
 
-    # Reindex each DataFrame to the common index, forward filling missing data
-    # to handle holidays or other missing observations.
-    for ticker in sim_dfs:
-        sim_dfs[ticker] = sim_dfs[ticker].reindex(common_idx, method='ffill')
+    # Restrict every ticker to the common days inside the window so the
+    # portfolios see the same trading days for all symbols.
+    sim_dfs = calendar.take(dfs_dict, i0, i1)
 
-    # Create the portfolio for this approach and run the simulation using the
-    # common engine shared with the command line tools.
-    portfolio = HybridMultiFundPortfolio(ticker_info_dict, initial_cash=initial_cash)
-    history, final_index = run_hybrid_multi_fund(sim_dfs, portfolio)
+    # Run the simulation using the common engine shared with the command line
+    # tools (per-ticker sub-portfolios or a rebalanced shared-cash portfolio).
+    history, final_index = simulate_window(sim_dfs, ticker_info_dict, initial_cash, trades=trades)
 
     return history, final_index
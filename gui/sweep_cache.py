@@ -0,0 +1,96 @@
+"""Window histories of whole sweeps for the GUI sweep explorer.
+
+:func:`gui.simulation_runner.run_simulation` slices and reindexes every
+DataFrame for the one start date it is given, which is fine for a single run
+but far too slow to scrub through every start date of a sweep.
+:class:`SweepHistories` instead builds a :class:`simulation.simulator.SweepPlan`
+per approach once (common calendar, aligned close arrays, window offsets) and
+simulates a window only the first time it is looked at.  The histories are
+kept as float arrays in an :class:`data.data_local_cache.LRUCache`, so going
+back to a start date is a dictionary lookup while memory stays bounded however
+many windows get visited.
+
+The histories are exactly the ones :func:`simulation.simulator.run_configured_sweep`
+produces for the same windows.  This module does not import tkinter.
+"""
+
+import numpy as np
+import pandas as pd
+
+from stock_market_simulator.data.data_local_cache import LRUCache
+from stock_market_simulator.simulation.legs import leg_keys, window_key
+from stock_market_simulator.simulation.simulator import SweepPlan
+
+# Budget for cached histories; a 10 year daily window is about 20 KiB.
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class SweepHistories:
+    """Lazily simulated window histories of several approaches.
+
+    Parameters
+    ----------
+    approaches:
+        List of ``(approach_name, ticker_info_dict)`` as returned by
+        :func:`utils.config_parser.parse_config_file`.
+    dfs_dict:
+        Ticker -> DataFrame covering every ticker of ``approaches``.
+    years, stepsize, schedule:
+        Sweep settings, as for :func:`simulation.simulator.run_configured_sweep`.
+    cache:
+        Optional :class:`LRUCache` for the histories; a private one with
+        ``DEFAULT_CACHE_BYTES`` is created when omitted.  Entries are keyed by
+        the approach's settings, the cash and the window's dates, so several
+        instances (other configs, lengths or schedules) can share one cache.
+    """
+
+    def __init__(self, approaches, dfs_dict, years, stepsize=1, schedule="monthly",
+                 initial_cash=10000.0, cache=None):
+        self.initial_cash = initial_cash
+        self.cache = cache if cache is not None else LRUCache(DEFAULT_CACHE_BYTES)
+        self.plans = {
+            name: SweepPlan({tk: dfs_dict[tk] for tk in info}, name, info, years, stepsize, schedule)
+            for name, info in approaches
+        }
+        self._settings = {name: tuple(leg_keys(info, initial_cash)) for name, info in approaches}
+
+        # The slider moves over the union of all approaches' start dates;
+        # ``_windows[name][i]`` is that approach's window at position ``i``
+        # (-1 when it has no window starting on that date).
+        plan_starts = {name: plan.common_idx[plan.starts] for name, plan in self.plans.items()}
+        starts = pd.DatetimeIndex([])
+        for idx in plan_starts.values():
+            starts = starts.union(idx)
+        self.start_dates = starts
+        self._windows = {name: idx.get_indexer(starts) for name, idx in plan_starts.items()}
+
+    def __len__(self):
+        return len(self.start_dates)
+
+    @property
+    def names(self):
+        return list(self.plans)
+
+    def position(self, start_date):
+        """Slider position of the first start date on or after ``start_date``."""
+        pos = int(self.start_dates.searchsorted(pd.Timestamp(start_date)))
+        return min(pos, len(self.start_dates) - 1)
+
+    def window(self, name, k):
+        """Return ``(index, history)`` of window ``k`` of approach ``name``."""
+        plan = self.plans[name]
+        i0, i1 = int(plan.starts[k]), int(plan.ends[k])
+        key = (self._settings[name], window_key(plan.common_idx, i0, i1))
+        history = self.cache.get(key)
+        if history is None:
+            history = np.asarray(plan.simulate(i0, i1, self.initial_cash), dtype=float)
+            self.cache.put(key, history)
+        return plan.common_idx[i0:i1], history
+
+    def at(self, position):
+        """Return ``{name: (index, history) or None}`` for a slider position."""
+        out = {}
+        for name, windows in self._windows.items():
+            k = int(windows[position])
+            out[name] = self.window(name, k) if k >= 0 else None
+        return out
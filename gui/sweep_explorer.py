@@ -0,0 +1,94 @@
+"""Slider window that scrubs through every start date of a sweep.
+
+The window owns one matplotlib line per approach.  Moving the slider looks the
+windows up in a :class:`gui.sweep_cache.SweepHistories` and swaps the data of
+the existing lines with ``set_data`` instead of clearing and re-plotting the
+axes, so a redraw costs one canvas update.  Slider events are coalesced with
+``after_idle``: when the slider moves faster than windows can be simulated,
+only the latest position is drawn.
+"""
+
+import tkinter as tk
+from tkinter import messagebox
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+
+class ScrubPlot:
+    """Equity curves of one start date, redrawn in place."""
+
+    def __init__(self, ax, names):
+        self.ax = ax
+        ax.xaxis_date()
+        ax.set_xlabel("Date")
+        ax.set_ylabel("Total Return (%)")
+        self.lines = {name: ax.plot([], [], label=name)[0] for name in names}
+        ax.legend(loc="upper left")
+
+    def show(self, windows, start_date):
+        """Display ``{name: (index, history) or None}`` of ``start_date``."""
+        for name, line in self.lines.items():
+            window = windows.get(name)
+            if window is None:
+                # The approach has no window starting on this date.
+                line.set_data([], [])
+            else:
+                index, history = window
+                line.set_data(index.to_numpy(), history)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.ax.set_title(f"Simulation Starting at {start_date:%Y-%m-%d}")
+
+
+class SweepExplorer(tk.Toplevel):
+    """Toplevel window with a start-date slider over ``histories``."""
+
+    def __init__(self, master, histories, start_date=None):
+        super().__init__(master)
+        self.title("Sweep Explorer")
+        self.geometry("900x600")
+        self.histories = histories
+        self._target = 0
+        self._redraw_job = None
+
+        fig = Figure(figsize=(8, 4))
+        self.plot = ScrubPlot(fig.add_subplot(), histories.names)
+        fig.autofmt_xdate()
+        self.canvas = FigureCanvasTkAgg(fig, master=self)
+        self.canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+
+        frame = tk.Frame(self)
+        frame.pack(side=tk.TOP, fill=tk.X, padx=10, pady=10)
+        self.lbl_date = tk.Label(frame, width=12)
+        self.lbl_date.pack(side=tk.LEFT)
+        self.scale = tk.Scale(frame, from_=0, to=len(histories) - 1, orient=tk.HORIZONTAL,
+                              showvalue=False, command=self._on_scale)
+        self.scale.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        position = histories.position(start_date) if start_date else 0
+        self.scale.set(position)
+        self._on_scale(position)
+
+    def _on_scale(self, value):
+        self._target = int(float(value))
+        self.lbl_date.config(text=f"{self.histories.start_dates[self._target]:%Y-%m-%d}")
+        if self._redraw_job is None:
+            self._redraw_job = self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_job = None
+        position = self._target
+        try:
+            windows = self.histories.at(position)
+        except Exception as e:
+            messagebox.showerror("Simulation Error", str(e), parent=self)
+            return
+        self.plot.show(windows, self.histories.start_dates[position])
+        self.canvas.draw_idle()
+
+    def destroy(self):
+        if self._redraw_job is not None:
+            self.after_cancel(self._redraw_job)
+            self._redraw_job = None
+        super().destroy()
@@ -7,8 +7,17 @@ file, select approaches and visualise the resulting equity curves.
 
 Tkinter is used for portability.  Matplotlib plots are embedded directly into
 the window so no external viewers are required.  Historical data is cached in
-``dfs_cache`` to avoid re-fetching when different strategies share the same
-ticker.
+the shared, memory-bounded ``DATA_CACHE`` (exposed as ``dfs_cache``) to avoid
+re-fetching when different strategies share the same ticker without holding
+every DataFrame for the lifetime of the window.
+
+Simulations run in a :class:`gui.sim_worker.SimulationWorker`.  The window
+polls it with ``after()`` and draws every curve as soon as its approach
+finishes, so the interface stays responsive and runs can be cancelled.
+"Explore Sweep" opens a :class:`gui.sweep_explorer.SweepExplorer` with a
+slider over every start date of the configured sweep.  "Save Trades" writes
+the fills of the selected approaches at the chosen start date (see
+:mod:`simulation.ledger`) to CSV or Parquet.
 """
 
 import tkinter as tk
@@ -23,7 +32,15 @@ import os
 
 from stock_market_simulator.utils.config_parser import parse_config_file
 from stock_market_simulator.data.data_fetcher import load_historical_data
+from stock_market_simulator.data.data_local_cache import DATA_CACHE
+from stock_market_simulator.simulation.ledger import trade_metrics, trades_frame, write_trades
+from stock_market_simulator.gui.sim_worker import SimulationWorker
 from stock_market_simulator.gui.simulation_runner import run_simulation
+from stock_market_simulator.gui.sweep_cache import SweepHistories
+from stock_market_simulator.gui.sweep_explorer import SweepExplorer
+
+# Milliseconds between checks for finished simulations.
+POLL_INTERVAL_MS = 50
 
 
 class SimulatorVisualizer(tk.Tk):
@@ -37,9 +54,17 @@ class SimulatorVisualizer(tk.Tk):
         # identical to the output of :func:`parse_config_file`.
         self.config_file_path = None
         self.config_data = None
-        self.dfs_cache = {}  # Cache: ticker -> DataFrame
+        self.config_options = None  # Run-level settings such as ``schedule``
+        self.dfs_cache = DATA_CACHE  # Shared LRU cache: ticker -> DataFrame
+
+        # Background simulations and the bookkeeping of the running batch.
+        self.worker = SimulationWorker()
+        self._poll_job = None
+        self._batch_total = 0
+        self._batch_done = 0
 
         self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def create_widgets(self):
         # Top frame: Config file selection and approach list.  Having two frames
@@ -82,8 +107,23 @@ class SimulatorVisualizer(tk.Tk):
         self.entry_cash.insert(0, "10000")
 
         # Trigger the simulation using whatever approaches are selected above.
-        btn_run = tk.Button(frame_params, text="Run Simulation", command=self.run_simulation)
-        btn_run.grid(row=3, column=0, columnspan=2, pady=10)
+        self.btn_run = tk.Button(frame_params, text="Run Simulation", command=self.run_simulation)
+        self.btn_run.grid(row=3, column=0, pady=10)
+
+        self.btn_cancel = tk.Button(frame_params, text="Cancel", command=self.cancel_simulation,
+                                    state=tk.DISABLED)
+        self.btn_cancel.grid(row=3, column=1, pady=10, sticky=tk.W)
+
+        self.lbl_status = tk.Label(frame_params, text="")
+        self.lbl_status.grid(row=3, column=2, padx=10, sticky=tk.W)
+
+        # Scrub through all start dates of the sweep in a separate window.
+        self.btn_explore = tk.Button(frame_params, text="Explore Sweep", command=self.explore_sweep)
+        self.btn_explore.grid(row=4, column=0, sticky=tk.W)
+
+        # Write the fills of the selected approaches at the start date.
+        self.btn_trades = tk.Button(frame_params, text="Save Trades", command=self.save_trades)
+        self.btn_trades.grid(row=4, column=1, sticky=tk.W)
 
         # Matplotlib figure embedded in the GUI.
         self.fig, self.ax = plt.subplots(figsize=(8, 4))
@@ -95,7 +135,9 @@ class SimulatorVisualizer(tk.Tk):
         if file_path:
             self.config_file_path = file_path
             try:
-                self.config_data = parse_config_file(file_path)
+                years, stepsize, approaches, options = parse_config_file(file_path, return_options=True)
+                self.config_data = (years, stepsize, approaches)
+                self.config_options = options
                 self.lbl_config.config(text=f"Loaded config: {os.path.basename(file_path)}")
                 # Populate approaches listbox.  Only the approach names are
                 # displayed; ticker details are pulled from ``config_data`` when
@@ -108,14 +150,13 @@ class SimulatorVisualizer(tk.Tk):
                 messagebox.showerror("Error", f"Failed to load config: {e}")
 
     def load_data_for_ticker(self, ticker):
-        if ticker not in self.dfs_cache:
-            try:
-                df = load_historical_data(ticker)
-                self.dfs_cache[ticker] = df
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to load data for {ticker}: {e}")
-                return None
-        return self.dfs_cache[ticker]
+        # ``load_historical_data`` consults and fills ``self.dfs_cache`` itself,
+        # so evicted tickers are transparently reloaded from the CSV cache.
+        try:
+            return load_historical_data(ticker)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load data for {ticker}: {e}")
+            return None
 
     def run_simulation(self):
         if not self.config_data:
@@ -143,34 +184,166 @@ class SimulatorVisualizer(tk.Tk):
             return
 
         _, _, approaches = self.config_data
+        jobs = [approaches[idx] for idx in selected_indices]
+
+        # Axes are reset once; curves are added as their approaches finish.
         self.ax.clear()
+        self.ax.set_title(f"Simulation Starting at {start_date}")
+        self.ax.set_xlabel("Date")
+        self.ax.set_ylabel("Total Return (%)")
+        self.canvas.draw_idle()
+
+        self.worker.submit(jobs, start_date, window_years, initial_cash)
+        self._batch_total = len(jobs)
+        self._batch_done = 0
+        self.btn_cancel.config(state=tk.NORMAL)
+        self._update_status()
+        if self._poll_job is None:
+            self._poll_job = self.after(POLL_INTERVAL_MS, self._poll_results)
 
+    def explore_sweep(self):
+        if not self.config_data:
+            messagebox.showwarning("Warning", "Please load a config file first.")
+            return
+        selected_indices = self.lst_approaches.curselection()
+        if not selected_indices:
+            messagebox.showwarning("Warning", "Please select at least one approach.")
+            return
+
+        years, stepsize, approaches = self.config_data
+        try:
+            # The window length and cash entries override the config if filled.
+            window_years = float(self.entry_years.get().strip() or years)
+            initial_cash = float(self.entry_cash.get().strip() or 10000)
+        except ValueError:
+            messagebox.showwarning("Warning", "Invalid numerical input for window years or initial cash.")
+            return
+        # The slider starts at the entered date, if any; check it before any
+        # data is loaded or the explorer window is built.
+        start_text = self.entry_start_date.get().strip()
+        try:
+            start_date = pd.to_datetime(start_text) if start_text else None
+        except ValueError:
+            start_date = pd.NaT
+        if start_date is pd.NaT:
+            messagebox.showwarning("Warning", f"Invalid start date '{start_text}'; use YYYY-MM-DD.")
+            return
+
+        jobs = [approaches[idx] for idx in selected_indices]
+        dfs_dict = {}
+        for _, ticker_info in jobs:
+            for ticker in ticker_info:
+                if ticker not in dfs_dict:
+                    df = self.load_data_for_ticker(ticker)
+                    if df is None:
+                        return
+                    dfs_dict[ticker] = df
+        try:
+            histories = SweepHistories(jobs, dfs_dict, window_years, stepsize,
+                                       self.config_options["schedule"], initial_cash)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Cannot explore sweep: {e}")
+            return
+        if not len(histories):
+            messagebox.showwarning("Warning", "No complete windows for the selected approaches.")
+            return
+        SweepExplorer(self, histories, start_date)
+
+    def save_trades(self):
+        if not self.config_data:
+            messagebox.showwarning("Warning", "Please load a config file first.")
+            return
+        start_date = self.entry_start_date.get().strip()
+        try:
+            window_years = float(self.entry_years.get().strip())
+            initial_cash = float(self.entry_cash.get().strip())
+        except ValueError:
+            messagebox.showwarning("Warning", "Invalid numerical input for window years or initial cash.")
+            return
+        selected_indices = self.lst_approaches.curselection()
+        if not start_date or not selected_indices:
+            messagebox.showwarning("Warning", "Please enter a start date and select at least one approach.")
+            return
+        path = filedialog.asksaveasfilename(
+            title="Save Trades", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("Parquet", "*.parquet")])
+        if not path:
+            return
+
+        # One window per approach is quick, so this runs on the Tk thread.
+        _, _, approaches = self.config_data
+        frames = []
+        summary = []
         for idx in selected_indices:
-            approach_name, ticker_info_dict = approaches[idx]
-            # Load historical data for each ticker in this approach.
+            approach_name, ticker_info = approaches[idx]
             dfs_dict = {}
-            for ticker in ticker_info_dict:
+            for ticker in ticker_info:
                 df = self.load_data_for_ticker(ticker)
-                if df is not None:
-                    dfs_dict[ticker] = df
-            if not dfs_dict:
-                continue
+                if df is None:
+                    return
+                dfs_dict[ticker] = df
+            trades = {}
             try:
-                # ``run_simulation`` returns the percent-return history and the
-                # associated DateTimeIndex which we plot directly.
-                history, final_index = run_simulation(
-                    ticker_info_dict, dfs_dict, start_date, window_years, initial_cash
-                )
-                self.ax.plot(final_index, history, label=approach_name)
+                history, final_index = run_simulation(ticker_info, dfs_dict, start_date, window_years,
+                                                      initial_cash, trades=trades)
             except Exception as e:
                 messagebox.showerror("Simulation Error", f"Approach {approach_name} failed: {e}")
-
-        self.ax.set_title(f"Simulation Starting at {start_date}")
-        self.ax.set_xlabel("Date")
-        self.ax.set_ylabel("Total Return (%)")
-        self.ax.legend()
-        self.fig.autofmt_xdate()
-        self.canvas.draw()
+                return
+            values = [initial_cash * (1 + pct / 100.0) for pct in history]
+            stats = trade_metrics(trades, values)
+            summary.append(f"{approach_name}: {stats['trades']} trades, turnover {stats['turnover']:.2f}")
+            df = trades_frame(trades, final_index)
+            df.insert(0, "approach", approach_name)
+            frames.append(df)
+        try:
+            write_trades(pd.concat(frames, ignore_index=True), path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to save trades: {e}")
+            return
+        messagebox.showinfo("Trades Saved", "\n".join(summary))
+
+    def _update_status(self, suffix=""):
+        self.lbl_status.config(text=f"{self._batch_done}/{self._batch_total} approaches done{suffix}")
+
+    def _poll_results(self):
+        """Draw curves of finished approaches; reschedules itself while busy."""
+        self._poll_job = None
+        finished = self.worker.poll()
+        errors = []
+        for approach_name, history, final_index, error in finished:
+            self._batch_done += 1
+            if error is not None:
+                errors.append(f"Approach {approach_name} failed: {error}")
+                continue
+            # ``run_simulation`` returns the percent-return history and the
+            # associated DateTimeIndex which we plot directly.
+            self.ax.plot(final_index, history, label=approach_name)
+        if finished:
+            if self.ax.get_lines():
+                self.ax.legend()
+            self.fig.autofmt_xdate()
+            self.canvas.draw_idle()
+            self._update_status()
+
+        if self.worker.busy:
+            self._poll_job = self.after(POLL_INTERVAL_MS, self._poll_results)
+        else:
+            self.btn_cancel.config(state=tk.DISABLED)
+        # Dialogs block, so show them after the canvas has been updated.
+        for message in errors:
+            messagebox.showerror("Simulation Error", message)
+
+    def cancel_simulation(self):
+        self.worker.cancel()
+        if self._poll_job is not None:
+            self.after_cancel(self._poll_job)
+            self._poll_job = None
+        self.btn_cancel.config(state=tk.DISABLED)
+        self._update_status(" (cancelled)")
+
+    def on_close(self):
+        self.worker.shutdown()
+        self.destroy()
 
 
 if __name__ == "__main__":
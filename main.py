@@ -11,34 +11,49 @@ Design highlights and rationale:
 
 * **Process based concurrency** – strategies rely on NumPy/pandas which release
   the GIL only partially.  Running each approach in a separate process provides
-  full CPU utilisation without complicated thread synchronization.
+  full CPU utilisation without complicated thread synchronization.  Approaches
+  that contain the same ticker leg run in the same tasks, so the leg is
+  simulated once per window (:mod:`simulation.legs`); the tasks split such
+  groups by start date, so every worker stays busy.
 * **Console capture** – during a sweep each worker prints progress; capturing
   that output into a buffer allows the project to dump a complete ``report.txt``
   at the end of the run.
 * **Post-processing visualisations** – once all approaches finish we create
   boxplots and a ranking histogram to facilitate quick comparison between
   strategies.
+* **Lazy plotting imports** – matplotlib and the PDF writer are imported inside
+  the reporting functions.  Worker processes import this module to run
+  :func:`run_approach`; keeping the module-level imports to the simulation
+  core means they start without loading the plotting stack.
 """
 
 import os
 import sys
 import shutil
 import concurrent.futures
-import matplotlib.pyplot as plt
 from io import StringIO
-from collections import defaultdict
 
 from stock_market_simulator.utils.config_parser import parse_config_file
 from stock_market_simulator.data.data_fetcher import load_historical_data
-from stock_market_simulator.simulation.simulator import run_configured_sweep
+from stock_market_simulator.simulation.legs import group_by_legs
+from stock_market_simulator.simulation.simulator import (
+    run_configured_sweep,
+    run_shared_windows,
+    summarize_sweep,
+)
 
+# Tasks per worker when groups are split by start date; more, smaller tasks
+# balance better at the cost of re-aligning the data in each task.
+TASKS_PER_WORKER = 4
 
-def run_approach(aname, ticker_strat_dict, years, stepsize):
+
+def run_approach(aname, ticker_strat_dict, years, stepsize, schedule="monthly", keep_histories=False):
     """Run a single approach in an isolated process.
 
     The main process uses :class:`concurrent.futures.ProcessPoolExecutor` to
     distribute work.  Each worker performs its own data loading to avoid sending
-    large DataFrames through inter-process queues.
+    large DataFrames through inter-process queues.  With ``keep_histories`` the
+    list of per-window percent histories is appended to the returned tuple.
     """
 
     needed = set(ticker_strat_dict.keys())
@@ -46,105 +61,185 @@ def run_approach(aname, ticker_strat_dict, years, stepsize):
     all_dfs = {tk: load_historical_data(tk) for tk in needed}
     # ``run_configured_sweep`` returns summary statistics along with the raw
     # run results which the parent process will collate.
-    return run_configured_sweep(all_dfs, aname, ticker_strat_dict, years, stepsize, 10000.0)
-
-def generate_boxplots(approach_data, output_dir, out_name):
-    """Visualise distribution of metrics across approaches.
-
-    ``approach_data`` is the aggregated output from each worker process.  For
-    every metric (final return, peak, valley and average annual return) we build
-    a box-and-whisker plot summarising the spread of results per approach.
-
-    Matplotlib's tableaus colour set is reused to give each approach a distinct
-    colour so that plots remain readable even when many strategies are compared.
+    histories = [] if keep_histories else None
+    result = run_configured_sweep(all_dfs, aname, ticker_strat_dict, years, stepsize, 10000.0,
+                                  schedule=schedule, histories=histories)
+    return result + (histories,) if keep_histories else result
+
+
+def run_approach_group(approaches, years, stepsize, schedule="monthly", keep_histories=False, part=None):
+    """Run approaches that share sub-simulations in one process.
+
+    ``approaches`` is one group from :func:`simulation.legs.group_by_legs`;
+    legs they have in common are simulated once per window (see
+    :func:`simulation.simulator.run_shared_windows`).  ``part=(i, n)`` runs
+    only the ``i``-th of ``n`` slices of the group's start dates, so large
+    groups still spread over the pool.  Returns ``{name: (results_list,
+    histories)}`` (``histories`` is None unless requested), or the exception
+    an approach raised.  A ticker that fails to load only fails the
+    approaches that use it.
     """
 
-    import matplotlib.colors as mcolors
-
-    # Four key metrics, the last one (avg_annual_return) was added later and is
-    # highlighted here so future readers understand its provenance.
-    metrics = {
-        'lowest_valley': 'Lowest Valley',
-        'highest_peak': 'Highest Peak',
-        'final_result': 'Final Result',
-        'avg_annual_return': 'Average Annual Return'
-    }
-
-    colors = list(mcolors.TABLEAU_COLORS.values())
-
-    for metric_key, metric_label in metrics.items():
-        data = []
-        approaches = []
-        approach_colors = {}
-
-        # Extract the relevant metric from each approach's run list.
-        for i, (approach_name, (summary, runs_list, _)) in enumerate(approach_data.items()):
-            # runs_list => (lv, hv, fr, aar, start_date)
-            if metric_key == 'lowest_valley':
-                metric_values = [run[0] for run in runs_list]
-            elif metric_key == 'highest_peak':
-                metric_values = [run[1] for run in runs_list]
-            elif metric_key == 'final_result':
-                metric_values = [run[2] for run in runs_list]
-            elif metric_key == 'avg_annual_return':
-                metric_values = [run[3] for run in runs_list]
-            else:
-                continue
-
-            if metric_values:
-                data.append(metric_values)
-                approaches.append(approach_name)
-                approach_colors[approach_name] = colors[i % len(colors)]
+    all_dfs = {}
+    load_errors = {}
+    for tk in {tk for _, tdict in approaches for tk in tdict}:
+        try:
+            all_dfs[tk] = load_historical_data(tk)
+        except Exception as e:
+            load_errors[tk] = e
+
+    results = {}
+    runnable = []
+    for aname, tdict in approaches:
+        missing = [tk for tk in tdict if tk in load_errors]
+        if missing:
+            results[aname] = load_errors[missing[0]]
+        else:
+            runnable.append((aname, tdict))
+    histories = {} if keep_histories else None
+    rows = run_shared_windows(all_dfs, runnable, years, stepsize, 10000.0, schedule=schedule,
+                              histories=histories, part=part)
+    for aname, r in rows.items():
+        results[aname] = r if isinstance(r, Exception) else (r, histories[aname] if keep_histories else None)
+    return {aname: results[aname] for aname, _ in approaches}
 
-        if not data:
-            print(f"No data for metric '{metric_key}'. Skipping plot.")
-            continue
 
-        # Determine y-limits to give a little breathing room around min/max.
-        all_values = [val for sublist in data for val in sublist]
-        y_min = min(all_values) * 0.95
-        y_max = max(all_values) * 1.05
+def group_parts(groups, workers):
+    """Number of start-date slices each group is split into.
 
-        # Create the boxplot.  Matplotlib 3.9 renamed "labels" -> "tick_labels";
-        # using the new name keeps the project forward compatible.
-        plt.figure(figsize=(10, 6))
-        box = plt.boxplot(data, tick_labels=approaches, patch_artist=True, showfliers=True)
+    About ``TASKS_PER_WORKER`` tasks per worker, shared in proportion to the
+    groups' sizes; with one worker every group runs whole.
+    """
+    if workers <= 1:
+        return [1] * len(groups)
+    total = sum(len(group) for group in groups)
+    return [max(1, round(workers * TASKS_PER_WORKER * len(group) / total)) for group in groups]
 
-        # Fill each box with the colour assigned above so the legend is obvious
-        # even without additional chart elements.
-        for patch, approach in zip(box['boxes'], approaches):
-            patch.set_facecolor(approach_colors[approach])
 
-        plt.title(f'{metric_label} Across Approaches', fontsize=14)
-        plt.xlabel('Approaches', fontsize=12)
-        plt.ylabel(metric_label, fontsize=12)
-        plt.ylim(y_min, y_max)
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
+def run_groups(groups, years, stepsize, schedule="monthly", keep_histories=False, workers=1):
+    """Run the groups of :func:`simulation.legs.group_by_legs` on a process pool.
 
-        plot_filename = f"{metric_key}_boxplot_{out_name}.png"
-        plot_path = os.path.join(output_dir, plot_filename)
-        plt.savefig(plot_path)
-        plt.close()
+    Every group is split by start date into :func:`group_parts` tasks, and the
+    parts' rows are stitched back in start-date order.  Returns ``{name:
+    result}`` with :func:`run_approach`'s result tuples or the approach's
+    exception.
+    """
+    parts = group_parts(groups, workers)
+    tasks = [(g, (i, n)) for g, n in enumerate(parts) for i in range(n)]
+    outputs = [[None] * n for n in parts]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max(1, min(workers, len(tasks)))) as executor:
+        future_map = {
+            executor.submit(run_approach_group, groups[g], years, stepsize, schedule, keep_histories,
+                            part if parts[g] > 1 else None): (g, part[0])
+            for g, part in tasks
+        }
+        for fut in concurrent.futures.as_completed(future_map):
+            g, i = future_map[fut]
+            try:
+                outputs[g][i] = fut.result()
+            except Exception as e:
+                outputs[g][i] = {aname: e for aname, _ in groups[g]}
+
+    results = {}
+    for group, group_outputs in zip(groups, outputs):
+        for aname, _ in group:
+            pieces = [out[aname] for out in group_outputs]
+            failed = [p for p in pieces if isinstance(p, Exception)]
+            if failed:
+                results[aname] = failed[0]
+                continue
+            results_list = [row for rows, _ in pieces for row in rows]
+            try:
+                result = summarize_sweep(aname, results_list, years)
+            except Exception as e:
+                results[aname] = e
+                continue
+            if keep_histories:
+                result += ([h for _, hists in pieces for h in hists],)
+            results[aname] = result
+    return results
 
-        print(f"Saved boxplot for '{metric_key}' to '{plot_path}'.")
+def generate_boxplots(approach_data, output_dir, out_name):
+    """Visualise distribution of metrics across approaches.
 
+    For every metric (final return, peak, valley and average annual return) a
+    box-and-whisker plot summarises the spread of results per approach.  The
+    drawing lives in :mod:`utils.plotting`; :func:`write_reports` renders
+    these together with the rank histogram in parallel.
+    """
 
-def main():
-    # Basic argument parsing.  A missing config or output directory name is a
-    # common user error, hence the explicit usage message.
-    if len(sys.argv) < 3:
-        print(
-            "Usage: python -m stock_market_simulator.main <config_file> <output_dir_name> [workers]"
-        )
-        return
+    from stock_market_simulator.utils import plotting
 
-    config_path = sys.argv[1]
-    out_name = sys.argv[2]
-    # Allow the user to override worker count; default to CPU count if omitted.
-    workers = int(sys.argv[3]) if len(sys.argv) >= 4 else (os.cpu_count() or 1)
+    inputs = plotting.plot_inputs(approach_data)
+    for metric_key in plotting.METRICS:
+        path = plotting.draw_boxplot(metric_key, inputs["approaches"], inputs["metrics"][metric_key],
+                                     output_dir, out_name)
+        if path is None:
+            print(f"No data for metric '{metric_key}'. Skipping plot.")
+        else:
+            print(f"Saved boxplot for '{metric_key}' to '{path}'.")
+
+
+def _origin(key):
+    """Label of the run a summary extreme came from: its start date or path number."""
+    return f"start {key.date()}" if hasattr(key, "date") else f"path {key}"
+
+
+def print_summary(aname, summary, myprint=print):
+    """Render one approach's summary statistics in a human readable form."""
+
+    myprint(f"=== Approach: {aname} ===")
+
+    lv = summary["lowest_valley"]
+    myprint(
+        f"lowest_valley => "
+        f"min:{lv['min_val']:.2f} ({_origin(lv['min_start_date'])}), "
+        f"max:{lv['max_val']:.2f} ({_origin(lv['max_start_date'])}), "
+        f"avg:{lv['avg_val']:.2f}"
+    )
+
+    hv = summary["highest_peak"]
+    myprint(
+        f"highest_peak  => "
+        f"min:{hv['min_val']:.2f} ({_origin(hv['min_start_date'])}), "
+        f"max:{hv['max_val']:.2f} ({_origin(hv['max_start_date'])}), "
+        f"avg:{hv['avg_val']:.2f}"
+    )
+
+    fr = summary["final_result"]
+    myprint(
+        f"final_result  => "
+        f"min:{fr['min_val']:.2f} ({_origin(fr['min_start_date'])}), "
+        f"max:{fr['max_val']:.2f} ({_origin(fr['max_start_date'])}), "
+        f"avg:{fr['avg_val']:.2f}"
+    )
+
+    aar = summary["avg_annual_return"]
+    myprint(
+        f"avg_annual_return => "
+        f"min:{aar['min_val']:.2f}% ({_origin(aar['min_start_date'])}), "
+        f"max:{aar['max_val']:.2f}% ({_origin(aar['max_start_date'])}), "
+        f"avg:{aar['avg_val']:.2f}%\n"
+    )
+
+
+def write_reports(config_path, out_name, approaches, approach_data, errors=None, base_dir="reports",
+                  plots=True, plot_workers=None, histories=None):
+    """Write the report directory of one finished sweep.
+
+    ``approaches`` is the parsed approach list (for ordering), ``approach_data``
+    maps approach name -> ``(summary, runs_list, final_map)`` and ``errors``
+    maps failed approach names to their exception.  Produces ``report.txt``,
+    the plots, a copy of the config and the PDF under ``base_dir/out_name``.
+    Used by :func:`main` and by :mod:`batch_runner` for each of its configs.
+
+    The per-window results (and ``histories``, approach -> list of percent
+    histories, when given) are exported with :mod:`utils.results_io`.  Plots
+    are rendered by up to ``plot_workers`` processes.  With ``plots=False``
+    plots and PDF are left to :func:`utils.plotting.render_saved`, which
+    reads the exported results.
+    """
 
-    base_dir = "reports"
     out_dir = os.path.join(base_dir, out_name)
     if not os.path.exists(out_dir):
         os.makedirs(out_dir)
@@ -159,138 +254,33 @@ def main():
         print(*args, file=buffer, **{k: v for k, v in kwargs.items() if k != 'file'})
 
     try:
-        years, stepsize, approaches = parse_config_file(config_path)
-        approach_data = {}
-
-        # Limit the number of worker processes to the number of approaches so we
-        # do not spawn idle processes.
-        max_workers = min(workers, len(approaches)) if approaches else 1
-        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-            future_map = {executor.submit(run_approach, aname, tdict, years, stepsize): aname for aname, tdict in approaches}
-            for fut in concurrent.futures.as_completed(future_map):
-                aname = future_map[fut]
-                try:
-                    summary, runs_list, final_map = fut.result()
-                    approach_data[aname] = (summary, runs_list, final_map)
-                except Exception as e:
-                    # Exceptions are rendered to the report but do not abort the
-                    # entire sweep so other approaches can still succeed.
-                    myprint(f"Approach {aname} => ERROR: {e}")
+        for aname, e in (errors or {}).items():
+            # Exceptions are rendered to the report but do not abort the
+            # entire sweep so other approaches can still succeed.
+            myprint(f"Approach {aname} => ERROR: {e}")
 
         # Render per-approach summaries in a human readable form.
         for aname, _ in approaches:
             if aname not in approach_data:
                 continue
-            summary, runs_list, _ = approach_data[aname]
-
-            myprint(f"=== Approach: {aname} ===")
-
-            lv = summary["lowest_valley"]
-            myprint(
-                f"lowest_valley => "
-                f"min:{lv['min_val']:.2f} (start {lv['min_start_date'].date()}), "
-                f"max:{lv['max_val']:.2f} (start {lv['max_start_date'].date()}), "
-                f"avg:{lv['avg_val']:.2f}"
-            )
-
-            hv = summary["highest_peak"]
-            myprint(
-                f"highest_peak  => "
-                f"min:{hv['min_val']:.2f} (start {hv['min_start_date'].date()}), "
-                f"max:{hv['max_val']:.2f} (start {hv['max_start_date'].date()}), "
-                f"avg:{hv['avg_val']:.2f}"
-            )
-
-            fr = summary["final_result"]
-            myprint(
-                f"final_result  => "
-                f"min:{fr['min_val']:.2f} (start {fr['min_start_date'].date()}), "
-                f"max:{fr['max_val']:.2f} (start {fr['max_start_date'].date()}), "
-                f"avg:{fr['avg_val']:.2f}"
-            )
-
-            aar = summary["avg_annual_return"]
-            myprint(
-                f"avg_annual_return => "
-                f"min:{aar['min_val']:.2f}% (start {aar['min_start_date'].date()}), "
-                f"max:{aar['max_val']:.2f}% (start {aar['max_start_date'].date()}), "
-                f"avg:{aar['avg_val']:.2f}%\n"
-            )
+            print_summary(aname, approach_data[aname][0], myprint)
 
         # If no successful approaches, skip everything else
         if not approach_data:
             myprint("No successful approaches => exit.")
         else:
-            # Build a rank histogram showing how often each approach achieved a
-            # particular rank for identical start dates.  This focuses on the
-            # final portfolio value metric which tends to be the most intuitive
-            # for casual users.
-            approach_start_sets = []
-            for aname, data_tuple in approach_data.items():
-                final_map = data_tuple[2]  # summary, runs_list, final_map
-                approach_start_sets.append(set(final_map.keys()))
-            common_starts = set.intersection(*approach_start_sets) if approach_start_sets else set()
-
-            if not common_starts:
-                myprint("No common starts => skipping rank histogram.")
+            from stock_market_simulator.utils import plotting
+            from stock_market_simulator.utils.results_io import write_results
+
+            for path in write_results(approach_data, out_dir, histories):
+                myprint(f"Results saved to {path}")
+            if plots:
+                # Rank histogram and the boxplots (including avg_annual_return).
+                plotting.render_plots(plotting.plot_inputs(approach_data), out_dir, out_name,
+                                      plot_workers, myprint)
             else:
-                rank_counts = {aname: defaultdict(int) for aname in approach_data.keys()}
-
-                # For each start date in common, rank by final_result (only)
-                for sd in common_starts:
-                    results = []
-                    for aname in approach_data.keys():
-                        fm = approach_data[aname][2]
-                        val = fm[sd]
-                        results.append((aname, val))
-                    # Sort descending so rank 1 is best
-                    results.sort(key=lambda x: x[1], reverse=True)
-                    for i, (a, _) in enumerate(results):
-                        rank_counts[a][i + 1] += 1
-
-                import matplotlib.pyplot as plt
-                from matplotlib.patches import Patch
-
-                n_approaches = len(approach_data)
-                rank_range = range(1, n_approaches + 1)
-                bar_data = {r: [rank_counts[ap][r] for ap in approach_data.keys()] for r in rank_range}
-
-                color_map = plt.colormaps['tab10'].resampled(n_approaches)  # Resample the colormap
-                approach_colors = {ap: color_map(i) for i, ap in enumerate(approach_data.keys())}
-
-                fig, ax = plt.subplots(figsize=(8, 5))
-
-                for r in rank_range:
-                    y_vals = bar_data[r]
-                    bottom = 0
-                    for i, ap in enumerate(approach_data.keys()):
-                        height = y_vals[i]
-                        ax.bar(
-                            r,
-                            height,
-                            bottom=bottom,
-                            color=approach_colors[ap],
-                            edgecolor='black',
-                        )
-                        bottom += height
-
-                legend_patches = [Patch(color=approach_colors[ap], label=ap) for ap in approach_data.keys()]
-
-                ax.legend(handles=legend_patches, bbox_to_anchor=(1.05, 1), loc='upper left')
-                ax.set_xticks(list(rank_range))
-                ax.set_xlabel("Rank (1=best, N=worst)")
-                ax.set_ylabel("Count (# of times approach had this rank)")
-                ax.set_title("Rank Histogram Across Common Monthly Starts")
-                plt.tight_layout()
-
-                hist_path = os.path.join(out_dir, "histogram.png")
-                plt.savefig(hist_path)
-                plt.close()
-
-                myprint(f"Histogram saved to {hist_path}")
-
-            # Now generate boxplots (including the new avg_annual_return)
-            generate_boxplots(approach_data, out_dir, out_name)
+                myprint("Plots skipped; render them with "
+                        f"'python -m stock_market_simulator.utils.plotting {out_dir}'")
 
     finally:
         # Save the console buffer to 'report.txt'
@@ -304,11 +294,57 @@ def main():
 
         buffer.close()
 
-        try:
-            from stock_market_simulator.utils.pdf_report import create_pdf_report
-            create_pdf_report(out_dir)
-        except Exception as e:
-            print(f"Failed to create PDF report: {e}")
+        # With plots skipped the PDF is built by ``render_saved`` instead.
+        if plots:
+            try:
+                from stock_market_simulator.utils.pdf_report import create_pdf_report
+                create_pdf_report(out_dir)
+            except Exception as e:
+                print(f"Failed to create PDF report: {e}")
+
+
+def main():
+    # Basic argument parsing.  A missing config or output directory name is a
+    # common user error, hence the explicit usage message.
+    # ``--skip-plots`` defers plots and PDF (see :mod:`utils.plotting`);
+    # ``--save-histories`` also exports every window's daily history.
+    args = [a for a in sys.argv[1:] if a not in ("--skip-plots", "--save-histories")]
+    plots = "--skip-plots" not in sys.argv[1:]
+    keep_histories = "--save-histories" in sys.argv[1:]
+    if len(args) < 2:
+        print(
+            "Usage: python -m stock_market_simulator.main <config_file> <output_dir_name> [workers]"
+            " [--skip-plots] [--save-histories]"
+        )
+        return
+
+    config_path = args[0]
+    out_name = args[1]
+    # Allow the user to override worker count; default to CPU count if omitted.
+    workers = int(args[2]) if len(args) >= 3 else (os.cpu_count() or 1)
+
+    approaches = []
+    approach_data = {}
+    histories = {} if keep_histories else None
+    errors = {}
+    try:
+        years, stepsize, approaches, options = parse_config_file(config_path, return_options=True)
+
+        # Approaches that share a ticker leg run together so the leg is
+        # simulated once per window; each group is split by start date so
+        # even a config that forms one big group uses every worker.
+        groups = group_by_legs(list(approaches))
+        for aname, result in run_groups(groups, years, stepsize, options["schedule"], keep_histories,
+                                        workers).items():
+            if isinstance(result, Exception):
+                errors[aname] = result
+                continue
+            approach_data[aname] = result[:3]
+            if keep_histories:
+                histories[aname] = result[3]
+    finally:
+        write_reports(config_path, out_name, approaches, approach_data, errors, plots=plots,
+                      plot_workers=workers, histories=histories)
 
 if __name__ == "__main__":
     main()
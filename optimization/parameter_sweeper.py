@@ -8,6 +8,10 @@ the code uses :class:`concurrent.futures.ProcessPoolExecutor` with an
 initialisation step that shares large read-only data structures via global
 variables.  This avoids repeatedly pickling the historical price DataFrames for
 each task.
+
+With ``spool_dir`` the candidates are instead published in chunks to a
+spool directory that workers on other machines poll
+(:mod:`simulation.distributed`); each worker reads the price data once.
 """
 
 import itertools
@@ -15,13 +19,13 @@ import concurrent.futures
 import os
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
 from stock_market_simulator.simulation.simulator import (
     run_hybrid_multi_fund,
-    intersect_all_indexes,
     find_monthly_starts_first_open,
     HybridMultiFundPortfolio,
 )
+from stock_market_simulator.simulation.alignment import align
+from stock_market_simulator.simulation.distributed import DEFAULT_TIMEOUT as SPOOL_TIMEOUT
 
 # Shared data loaded once per worker.  These globals are populated by the
 # process pool initializer to avoid repeatedly sending large DataFrames to every
@@ -29,6 +33,9 @@ from stock_market_simulator.simulation.simulator import (
 _DFS_DICT = None
 _TICKER_INFO_DICT = None
 
+# Number of tasks a sweep is split into when it runs on a spool.
+SPOOL_TASKS = 256
+
 
 def _init_worker(dfs_dict, ticker_info_dict):
     """Initializer for worker processes."""
@@ -54,18 +61,15 @@ def run_advanced_daytrading_simulation(ticker_info_dict, dfs_dict, start_date, y
       If return_history is False: final percent return.
       If return_history is True: the full history list.
     """
-    sim_dfs = {}
     end_date = start_date + pd.Timedelta(days=years * 242)
-    for ticker, df in dfs_dict.items():
-        subdf = df.loc[(df.index >= start_date) & (df.index < end_date)]
-        sim_dfs[ticker] = subdf
-
-    common_idx = intersect_all_indexes(sim_dfs)
-    if common_idx.empty:
+    # The calendar for ``dfs_dict`` is memoized, so candidates sharing the same
+    # data reuse one intersection instead of recomputing it per window.
+    calendar = align(dfs_dict)
+    i0, i1 = calendar.window(start_date, end_date)
+    if i1 <= i0:
         raise ValueError("No common trading days in the simulation window.")
 
-    for ticker in sim_dfs:
-        sim_dfs[ticker] = sim_dfs[ticker].reindex(common_idx, method='ffill')
+    sim_dfs = calendar.take(dfs_dict, i0, i1)
 
     portfolio = HybridMultiFundPortfolio(ticker_info_dict, initial_cash=initial_cash)
     history, _ = run_hybrid_multi_fund(sim_dfs, portfolio)
@@ -109,6 +113,19 @@ def metric_median(history, years):
     return np.median(history)
 
 
+def apply_advanced_params(ticker_info_dict, ts_pct, lb_discount, pl_days):
+    """Return a copy of ``ticker_info_dict`` with the advanced_daytrading parameters set."""
+    modified_ticker_info = {}
+    for ticker, info in ticker_info_dict.items():
+        new_info = info.copy()
+        if info["strategy"].__name__ == "advanced_daytrading":
+            new_info["trailing_stop_pct"] = ts_pct
+            new_info["limit_buy_discount_pct"] = lb_discount
+            new_info["pending_limit_days"] = pl_days
+        modified_ticker_info[ticker] = new_info
+    return modified_ticker_info
+
+
 def candidate_worker(args):
     """Run a single candidate simulation.
 
@@ -129,14 +146,7 @@ def candidate_worker(args):
         ticker_info_dict = _TICKER_INFO_DICT
         dfs_dict = _DFS_DICT
 
-    modified_ticker_info = {}
-    for ticker, info in ticker_info_dict.items():
-        new_info = info.copy()
-        if info["strategy"].__name__ == "advanced_daytrading":
-            new_info["trailing_stop_pct"] = ts_pct
-            new_info["limit_buy_discount_pct"] = lb_discount
-            new_info["pending_limit_days"] = pl_days
-        modified_ticker_info[ticker] = new_info
+    modified_ticker_info = apply_advanced_params(ticker_info_dict, ts_pct, lb_discount, pl_days)
     try:
         history = run_advanced_daytrading_simulation(modified_ticker_info, dfs_dict, start_date, years, initial_cash,
                                                      return_history=True)
@@ -146,9 +156,19 @@ def candidate_worker(args):
         return (start_date, years, ts_pct, lb_discount, pl_days, None)
 
 
+def candidate_chunk(dfs_dict, ticker_info_dict, tasks):
+    """Run a list of candidate tasks with the given data (a spool task).
+
+    See :mod:`simulation.distributed`; ``dfs_dict`` is fetched by the worker.
+    """
+    _init_worker(dfs_dict, ticker_info_dict)
+    return [candidate_worker(task) for task in tasks]
+
+
 def full_parameter_sweep_advanced_daytrading(ticker_info_dict, dfs_dict, candidate_years, initial_cash,
                                              trailing_stop_values, limit_buy_discount_values, pending_limit_days_values,
-                                             metric_selector=metric_final, max_workers=None):
+                                             metric_selector=metric_final, max_workers=None, spool_dir=None,
+                                             spool_timeout=SPOOL_TIMEOUT):
     """
     Performs a grid search over simulation parameters and advanced_daytrading strategy parameters.
 
@@ -161,12 +181,16 @@ def full_parameter_sweep_advanced_daytrading(ticker_info_dict, dfs_dict, candida
 
     Parameters:
       max_workers: Maximum number of worker processes to use (default uses all available).
+      spool_dir: Publish the candidates to the workers of this spool directory instead of
+                 a local process pool (see :mod:`simulation.distributed`).
+      spool_timeout: Raise ``TimeoutError`` when no spool worker runs a candidate for this
+                     many seconds (None waits forever).
 
     Returns:
       results: A list of tuples:
          (start_date, years, trailing_stop_pct, limit_buy_discount_pct, pending_limit_days, metric_value)
     """
-    common_idx = intersect_all_indexes(dfs_dict)
+    common_idx = align(dfs_dict).index
     monthly_starts = find_monthly_starts_first_open(common_idx)
     results = []
     last_common_date = common_idx[-1]
@@ -184,6 +208,25 @@ def full_parameter_sweep_advanced_daytrading(ticker_info_dict, dfs_dict, candida
                 tasks.append((start_date, years_val, ts_pct, lb_discount, pl_days,
                               initial_cash, metric_selector))
 
+    # The progress bar is only needed here in the parent; workers re-importing
+    # this module skip tqdm.
+    from tqdm import tqdm
+
+    if spool_dir is not None:
+        from stock_market_simulator.simulation.distributed import chunk_bounds, run_tasks
+
+        # Spool tasks are files, so they are larger than pool chunks: a few
+        # hundred per sweep keeps the file traffic small.
+        bounds = chunk_bounds(len(tasks), SPOOL_TASKS)
+        calls = [(candidate_chunk, list(dfs_dict), (ticker_info_dict, tasks[start:stop]))
+                 for start, stop in bounds]
+        chunks = [None] * len(bounds)
+        with tqdm(total=len(tasks), desc="Running simulations") as progress:
+            for i, chunk in run_tasks(spool_dir, dfs_dict, calls, timeout=spool_timeout):
+                chunks[i] = chunk
+                progress.update(len(chunk))
+        return [result for chunk in chunks for result in chunk]
+
     # Use ProcessPoolExecutor to run tasks in parallel. The historical data and
     # ticker info are loaded once per worker via the initializer to avoid
     # pickling large objects for every task.
@@ -203,7 +246,8 @@ def full_parameter_sweep_advanced_daytrading(ticker_info_dict, dfs_dict, candida
 
 def optimize_full_advanced_daytrading(ticker_info_dict, dfs_dict, candidate_years, initial_cash,
                                       trailing_stop_values, limit_buy_discount_values, pending_limit_days_values,
-                                      metric_selector=metric_final, max_workers=None):
+                                      metric_selector=metric_final, max_workers=None, spool_dir=None,
+                                      spool_timeout=SPOOL_TIMEOUT):
     """
     Optimizes the advanced_daytrading strategy parameters along with the simulation window (years)
     by performing a grid search over:
@@ -226,6 +270,8 @@ def optimize_full_advanced_daytrading(ticker_info_dict, dfs_dict, candidate_year
       pending_limit_days_values: List of candidate days to wait before converting a limit order.
       metric_selector: Function that takes (history, years) and returns a performance metric.
       max_workers: Maximum number of parallel workers to use (default uses all available).
+      spool_dir, spool_timeout: Run the sweep on the workers of this spool directory (see
+                                :func:`full_parameter_sweep_advanced_daytrading`).
 
     Returns:
       best_by_year: A dictionary mapping each candidate year (window length) to a tuple:
@@ -238,7 +284,8 @@ def optimize_full_advanced_daytrading(ticker_info_dict, dfs_dict, candidate_year
     results = full_parameter_sweep_advanced_daytrading(
         ticker_info_dict, dfs_dict, candidate_years, initial_cash,
         trailing_stop_values, limit_buy_discount_values, pending_limit_days_values,
-        metric_selector=metric_selector, max_workers=max_workers
+        metric_selector=metric_selector, max_workers=max_workers, spool_dir=spool_dir,
+        spool_timeout=spool_timeout
     )
 
     # Each result is: (start_date, years, ts_pct, lb_discount, pl_days, metric_value)
@@ -0,0 +1,189 @@
+# stock_market_simulator/optimization/walk_forward.py
+
+"""Walk-forward optimisation of the ``advanced_daytrading`` parameters.
+
+:func:`optimization.parameter_sweeper.optimize_full_advanced_daytrading`
+averages a metric over every start date and picks one parameter set per
+window length, i.e. it scores parameters with data from after the dates it
+would trade them on.  Walk-forward testing avoids that look-ahead:
+
+1. The common calendar is cut into consecutive *segments* of
+   ``out_of_sample_years`` each (segment ``k`` starts on the first trading
+   day on or after ``first_date + k * out_of_sample_years * 365`` days).
+2. Fold ``f`` uses segments ``f .. f + n - 1`` as the in-sample span (``n =
+   in_sample_years / out_of_sample_years``).  Every parameter set is scored
+   by the average of ``metric_selector`` over those segments, the same way the
+   grid search averages over start dates, and the best one is chosen.
+3. The chosen parameters are then simulated on segment ``f + n``, the
+   out-of-sample span, and the out-of-sample curves of all folds are
+   chained into one equity curve.
+
+Because consecutive in-sample spans share all but one segment, each
+``(segment, parameters)`` simulation is run once and its metric reused by
+every fold that contains the segment.  A full walk forward therefore costs
+about as much as one grid search over the segments instead of one per fold.
+Simulations run in a process pool with the price data shipped once per worker,
+like :func:`optimization.parameter_sweeper.full_parameter_sweep_advanced_daytrading`.
+"""
+
+import concurrent.futures
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+from stock_market_simulator.optimization.parameter_sweeper import apply_advanced_params, metric_final
+from stock_market_simulator.simulation.alignment import align
+from stock_market_simulator.simulation.simulator import HybridMultiFundPortfolio, run_hybrid_multi_fund
+
+# Shared data loaded once per worker by the process pool initializer.
+_DFS_DICT = None
+_TICKER_INFO_DICT = None
+
+
+def _init_worker(dfs_dict, ticker_info_dict):
+    """Initializer for worker processes."""
+    global _DFS_DICT, _TICKER_INFO_DICT
+    _DFS_DICT = dfs_dict
+    _TICKER_INFO_DICT = ticker_info_dict
+
+
+def segment_bounds(index, segment_years):
+    """Return the ``[start, end)`` positions of the full segments of ``index``."""
+    values = np.asarray(index.values)
+    if len(values) == 0:
+        return []
+    step = np.timedelta64(pd.Timedelta(days=segment_years * 365))
+    # Segment boundaries are anchored on the first date so they do not drift
+    # with the trading calendar; a segment whose end lies past the data is
+    # incomplete and dropped.
+    n_full = 0
+    while values[0] + (n_full + 1) * step <= values[-1]:
+        n_full += 1
+    boundaries = values.searchsorted(values[0] + np.arange(n_full + 1) * step, side="left")
+    return [(int(a), int(b)) for a, b in zip(boundaries[:-1], boundaries[1:]) if b > a]
+
+
+def simulate_segment(ticker_info_dict, dfs_dict, params, i0, i1, initial_cash=10000.0):
+    """Return the percent history of ``params`` on calendar positions ``[i0, i1)``."""
+    calendar = align(dfs_dict)
+    sim_dfs = calendar.take(dfs_dict, i0, i1)
+    portfolio = HybridMultiFundPortfolio(apply_advanced_params(ticker_info_dict, *params),
+                                         initial_cash=initial_cash)
+    history, _ = run_hybrid_multi_fund(sim_dfs, portfolio)
+    return history
+
+
+def segment_worker(args):
+    """Score one ``(segment, params)`` pair; returns ``(segment, params, metric)``.
+
+    The metric is None when the simulation fails, as in
+    :func:`optimization.parameter_sweeper.candidate_worker`.
+    """
+    segment, (i0, i1), params, years, initial_cash, metric_selector = args
+    try:
+        history = simulate_segment(_TICKER_INFO_DICT, _DFS_DICT, params, i0, i1, initial_cash)
+        return segment, params, metric_selector(history, years)
+    except Exception:
+        return segment, params, None
+
+
+def _score_segments(tasks, dfs_dict, ticker_info_dict, max_workers):
+    if max_workers == 1 or len(tasks) <= 1:
+        _init_worker(dfs_dict, ticker_info_dict)
+        return [segment_worker(task) for task in tasks]
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(dfs_dict, ticker_info_dict)) as executor:
+        n_workers = max_workers or os.cpu_count() or 1
+        chunk_size = max(1, len(tasks) // (n_workers * 4))
+        return list(executor.map(segment_worker, tasks, chunksize=chunk_size))
+
+
+def walk_forward_advanced_daytrading(ticker_info_dict, dfs_dict, in_sample_years, out_of_sample_years,
+                                     initial_cash, trailing_stop_values, limit_buy_discount_values,
+                                     pending_limit_days_values, metric_selector=metric_final,
+                                     max_workers=None):
+    """
+    Walk-forward optimisation over the advanced_daytrading parameter grid.
+
+    Parameters are those of :func:`optimize_full_advanced_daytrading`, with the
+    window length replaced by ``in_sample_years`` (must be a whole multiple of
+    ``out_of_sample_years``) and ``out_of_sample_years``.  ``max_workers=1``
+    runs everything in this process.
+
+    Returns a dictionary with:
+      folds: list of dicts with ``in_sample`` and ``out_of_sample`` (first,
+             last) dates, the chosen ``params`` tuple (trailing_stop_pct,
+             limit_buy_discount_pct, pending_limit_days), its
+             ``in_sample_metric`` and its ``out_of_sample_return`` in percent.
+      index: DatetimeIndex of the stitched out-of-sample curve.
+      equity: stitched out-of-sample percent return on each date of ``index``.
+      simulations: number of simulations run.
+    """
+    ratio = in_sample_years / out_of_sample_years
+    n_in_sample = int(round(ratio))
+    if n_in_sample < 1 or abs(ratio - n_in_sample) > 1e-9:
+        raise ValueError("in_sample_years must be a whole multiple of out_of_sample_years.")
+
+    common_idx = align(dfs_dict).index
+    segments = segment_bounds(common_idx, out_of_sample_years)
+    n_folds = len(segments) - n_in_sample
+    if n_folds < 1:
+        raise ValueError("Not enough data for one in-sample and one out-of-sample span.")
+
+    grid = list(itertools.product(trailing_stop_values, limit_buy_discount_values, pending_limit_days_values))
+
+    # Every segment that is part of some in-sample span is scored once per
+    # parameter set; folds then only average the memoized metrics.
+    tasks = [(k, segments[k], params, out_of_sample_years, initial_cash, metric_selector)
+             for k in range(len(segments) - 1) for params in grid]
+    metrics = {(k, params): value
+               for k, params, value in _score_segments(tasks, dfs_dict, ticker_info_dict, max_workers)}
+    simulations = len(tasks)
+
+    folds = []
+    index_parts = []
+    equity_parts = []
+    growth = 1.0
+    for f in range(n_folds):
+        best_params, best_score = None, None
+        for params in grid:
+            values = [metrics[(k, params)] for k in range(f, f + n_in_sample)]
+            if any(v is None for v in values):
+                continue
+            score = sum(values) / len(values)
+            if best_score is None or score > best_score:
+                best_params, best_score = params, score
+        if best_params is None:
+            raise ValueError(f"No parameter set could be simulated in fold {f}.")
+
+        oos = f + n_in_sample
+        i0, i1 = segments[oos]
+        history = simulate_segment(ticker_info_dict, dfs_dict, best_params, i0, i1, initial_cash)
+        simulations += 1
+
+        # Chain the out-of-sample curves: each fold starts from the growth
+        # factor the previous ones ended with.
+        factors = growth * (1.0 + np.asarray(history, dtype=float) / 100.0)
+        growth = float(factors[-1])
+        index_parts.append(common_idx[i0:i1])
+        equity_parts.append((factors - 1.0) * 100.0)
+
+        is0, is1 = segments[f][0], segments[oos - 1][1]
+        folds.append({
+            "in_sample": (common_idx[is0], common_idx[is1 - 1]),
+            "out_of_sample": (common_idx[i0], common_idx[i1 - 1]),
+            "params": best_params,
+            "in_sample_metric": best_score,
+            "out_of_sample_return": history[-1],
+        })
+
+    return {
+        "folds": folds,
+        "index": index_parts[0].append(index_parts[1:]),
+        "equity": np.concatenate(equity_parts).tolist(),
+        "simulations": simulations,
+    }
@@ -6,14 +6,24 @@ ranges and then calls :func:`optimize_full_advanced_daytrading` to exhaustively
 search those combinations.  The best results for each simulation window are
 reported on the console and summarised in a PDF.
 
+``--walk-forward IN OUT`` runs :mod:`optimization.walk_forward` instead:
+parameters are re-optimised on every ``IN``-year span and tested on the
+following ``OUT`` years; the chosen parameters per fold are printed and the
+stitched out-of-sample curve is written to ``walk_forward.csv``.
+
+``--spool DIR`` hands the grid to workers polling that directory, possibly on
+other machines (see :mod:`simulation.distributed`); ``--spool-timeout`` sets
+how long to wait while no worker runs a task.
+
 The script is intentionally example-driven.  Users are expected to modify the
 lists of candidate values or the strategy mapping to suit their own needs.
 """
 
+import argparse
 import os
-import sys
 import pandas as pd
 import multiprocessing
+from typing import Iterable
 
 from stock_market_simulator.data.data_fetcher import load_historical_data
 from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
@@ -21,17 +31,25 @@ from stock_market_simulator.optimization.parameter_sweeper import (
     optimize_full_advanced_daytrading,
     metric_cagr,
 )
-from stock_market_simulator.optimization.report_pdf import create_pdf_report
+from stock_market_simulator.optimization.walk_forward import walk_forward_advanced_daytrading
+from stock_market_simulator.simulation.distributed import DEFAULT_TIMEOUT as SPOOL_TIMEOUT
 
 
-def main():
+def main(argv: Iterable[str] | None = None):
     """Run the optimisation sweep and generate a PDF summary."""
 
-    output_name = "optimization_output"
-    if len(sys.argv) >= 2:
-        output_name = sys.argv[1]
-
-    out_dir = os.path.join("reports", output_name)
+    parser = argparse.ArgumentParser(description="Optimise advanced_daytrading parameters")
+    parser.add_argument("output_name", nargs="?", default="optimization_output",
+                        help="Report directory name under reports/")
+    parser.add_argument("--walk-forward", nargs=2, type=float, metavar=("IN", "OUT"),
+                        help="Walk-forward mode with IN in-sample and OUT out-of-sample years")
+    parser.add_argument("--spool", metavar="DIR",
+                        help="Run the grid on spool workers (simulation/distributed.py) instead of local processes")
+    parser.add_argument("--spool-timeout", type=float, default=SPOOL_TIMEOUT, metavar="SECS",
+                        help="Give up when no spool worker runs a task for SECS seconds (0 waits forever)")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    out_dir = os.path.join("reports", args.output_name)
     os.makedirs(out_dir, exist_ok=True)
 
     # Specify the ticker and load historical data.  ``QQQ`` is used as a default
@@ -62,6 +80,32 @@ def main():
     pending_limit_days_values = [30, 35, 40, 45, 50, 55, 60]
     initial_cash = 10000.0
 
+    if args.walk_forward:
+        in_sample_years, out_of_sample_years = args.walk_forward
+        result = walk_forward_advanced_daytrading(
+            ticker_info_dict,
+            dfs_dict,
+            in_sample_years,
+            out_of_sample_years,
+            initial_cash,
+            trailing_stop_values,
+            limit_buy_discount_values,
+            pending_limit_days_values,
+            metric_selector=metric_cagr,
+            max_workers=None,
+        )
+        for fold in result["folds"]:
+            oos_start, oos_end = fold["out_of_sample"]
+            ts_pct, lb_discount, pl_days = fold["params"]
+            print(f"{oos_start.date()} - {oos_end.date()}: Trailing Stop: {ts_pct}%, "
+                  f"Limit Discount: {lb_discount}%, Pending Limit Days: {pl_days} "
+                  f"-> {fold['out_of_sample_return']:.2f}%")
+        print(f"Stitched out-of-sample return: {result['equity'][-1]:.2f}% "
+              f"({result['simulations']} simulations)")
+        curve = pd.DataFrame({"equity_pct": result["equity"]}, index=result["index"])
+        curve.to_csv(os.path.join(out_dir, "walk_forward.csv"), index_label="Date")
+        return
+
     # Optimise using compound annual growth rate (CAGR) as the metric.  ``None``
     # for ``max_workers`` means "use all available cores".
     best_by_year = optimize_full_advanced_daytrading(
@@ -74,6 +118,8 @@ def main():
         pending_limit_days_values,
         metric_selector=metric_cagr,
         max_workers=None,
+        spool_dir=args.spool,
+        spool_timeout=args.spool_timeout or None,
     )
 
     # Present results for each candidate year window.  ``best_by_year`` maps a
@@ -89,7 +135,9 @@ def main():
         # for params, avg_metric in all_groups.items():
         #     print(f"    {params}: {avg_metric:.2f}%")
 
-    # Generate PDF summary report for easy sharing.
+    # Generate PDF summary report for easy sharing.  Imported here so spawned
+    # sweep workers, which re-import this script, do not load matplotlib.
+    from stock_market_simulator.optimization.report_pdf import create_pdf_report
     create_pdf_report(best_by_year, out_dir)
 
 
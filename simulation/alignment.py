@@ -0,0 +1,151 @@
+"""Shared trading calendars for groups of tickers.
+
+Every simulation needs the dates on which *all* of its tickers traded.  The
+sweep driver, the optimiser (once per candidate) and the GUI used to
+recompute that intersection for every window, even though the underlying
+DataFrames never change during a run.  :func:`align` computes it once per
+ticker set and memoizes the result together with integer position maps from
+the common calendar into each ticker's own rows.  Windows can then be cut with
+two ``searchsorted`` calls and ``iloc`` lookups instead of boolean masks and
+``reindex``.
+
+Memo entries are keyed by the ticker names and a *data version* for each
+DataFrame – the identity and length of its index.  Loading or updating a
+ticker produces a new index object, so stale calendars are never reused.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Small bound: a process typically works with a handful of ticker sets.
+_MAX_CALENDARS = 64
+_CALENDARS = OrderedDict()
+_LOCK = threading.Lock()
+
+
+class AlignedCalendar:
+    """Common trading days of a ticker set plus per-ticker row positions.
+
+    Attributes
+    ----------
+    index:
+        Sorted :class:`pandas.DatetimeIndex` of dates present in every ticker.
+    positions:
+        Mapping ticker -> ``int64`` array; ``positions[tk][i]`` is the row in
+        that ticker's DataFrame for ``index[i]``.
+    """
+
+    def __init__(self, index, positions):
+        self.index = index
+        self.positions = positions
+        self._values = index.values
+        self._matrices = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def window(self, start_date, end_date):
+        """Return ``(i0, i1)`` so that ``index[i0:i1]`` spans ``[start, end)``."""
+        i0 = int(self._values.searchsorted(np.datetime64(pd.Timestamp(start_date)), side="left"))
+        i1 = int(self._values.searchsorted(np.datetime64(pd.Timestamp(end_date)), side="left"))
+        return i0, i1
+
+    def take(self, dfs_dict, i0=0, i1=None):
+        """Return ``{ticker: DataFrame}`` restricted to ``index[i0:i1]``.
+
+        Equivalent to slicing each frame to the window and reindexing onto the
+        common dates, without the boolean masks.
+        """
+        return {tk: df.iloc[self.positions[tk][i0:i1]] for tk, df in dfs_dict.items()}
+
+    def matrix(self, dfs_dict, tickers, column="Close"):
+        """Return a ``(len(index), len(tickers))`` float array of ``column``.
+
+        Built once per calendar, ticker order and column; windows are then plain
+        row slices.
+        """
+        key = (tuple(tickers), column)
+        mat = self._matrices.get(key)
+        if mat is None:
+            mat = np.column_stack([
+                dfs_dict[tk][column].to_numpy(dtype=float)[self.positions[tk]] for tk in tickers
+            ])
+            self._matrices[key] = mat
+        return mat
+
+
+def _data_version(df):
+    return id(df.index), len(df.index)
+
+
+def _positions(df_index, common):
+    if df_index.is_unique:
+        return df_index.get_indexer(common).astype(np.int64)
+    # Duplicate dates: use the first occurrence, matching ``.loc[...].iloc[0]``.
+    return df_index.searchsorted(common, side="left").astype(np.int64)
+
+
+def build_calendar(dfs_dict) -> AlignedCalendar:
+    """Compute an :class:`AlignedCalendar` for ``dfs_dict`` without memoizing."""
+    if not dfs_dict:
+        raise ValueError("No DataFrames to intersect!")
+    indexes = [df.index for df in dfs_dict.values()]
+    common = indexes[0]
+    for idx in indexes[1:]:
+        common = common.intersection(idx)
+    common = common.sort_values()
+    positions = {tk: _positions(df.index, common) for tk, df in dfs_dict.items()}
+    return AlignedCalendar(common, positions)
+
+
+def align(dfs_dict) -> AlignedCalendar:
+    """Return the memoized :class:`AlignedCalendar` for ``dfs_dict``."""
+    key = tuple(sorted((tk, _data_version(df)) for tk, df in dfs_dict.items()))
+    with _LOCK:
+        entry = _CALENDARS.get(key)
+        if entry is not None:
+            calendar, indexes = entry
+            # ``id`` values can be recycled once an index is freed; confirm we
+            # still hold the very same objects before reusing the calendar.
+            if all(indexes[tk] is df.index for tk, df in dfs_dict.items()):
+                _CALENDARS.move_to_end(key)
+                return calendar
+
+    calendar = build_calendar(dfs_dict)
+    with _LOCK:
+        _CALENDARS[key] = (calendar, {tk: df.index for tk, df in dfs_dict.items()})
+        while len(_CALENDARS) > _MAX_CALENDARS:
+            _CALENDARS.popitem(last=False)
+    return calendar
+
+
+def union_matrix(dfs_dict, tickers, column="Close"):
+    """Return ``(index, matrix)`` over the *union* of the tickers' dates.
+
+    Cross-sectional universes contain tickers that list and delist at
+    different times, so the intersection would shrink to the shortest history.
+    Missing prices are NaN.
+    """
+    if not tickers:
+        raise ValueError("No DataFrames to combine!")
+    index = dfs_dict[tickers[0]].index
+    for tk in tickers[1:]:
+        index = index.union(dfs_dict[tk].index)
+    index = index.sort_values()
+    mat = np.full((len(index), len(tickers)), np.nan)
+    for j, tk in enumerate(tickers):
+        series = dfs_dict[tk][column]
+        if not series.index.is_unique:
+            series = series[~series.index.duplicated(keep="first")]
+        rows = index.get_indexer(series.index)
+        mat[rows, j] = series.to_numpy(dtype=float)
+    return index, mat
+
+
+def clear_calendar_cache():
+    """Forget all memoized calendars."""
+    with _LOCK:
+        _CALENDARS.clear()
@@ -0,0 +1,245 @@
+"""Transaction cost models: volume-dependent slippage and commissions.
+
+``spread=`` covers the bid/ask spread as a fixed percentage.  The models here
+add the costs that depend on the size of a fill:
+
+* :class:`VolumeSlippage` – market impact growing with the fill's share of
+  the bar's volume, ``impact_pct * (quantity / volume) ** exponent`` percent
+  of the price (square-root impact by default).  Without volume data (NaN or
+  zero) the impact is zero.
+* :class:`PercentCommission`, :class:`PerShareCommission` and
+  :class:`FlatCommission` – broker fees with optional minimums (and a cap for
+  per-share schedules), charged in cash on top of the fill.
+
+Every model has a scalar form, used by :mod:`simulation.execution` for the
+occasional fill of a strategy, and a batched form over NumPy arrays of fills,
+used by the rebalancing engine (:mod:`simulation.multi_asset`) which trades
+many tickers at once.  Both compute the same numbers.
+
+Models are configured per ticker line::
+
+    ticker=SPY, strategy=sma_trading, spread=0.02, slippage=volume:0.1, commission=per_share:0.005:1
+
+and stored as one :class:`CostModel` under ``"costs"`` in the ticker's
+settings.  Portfolios without costs keep ``costs=None`` and execute exactly as
+before; the only added work on the fill path is that one check.
+"""
+
+import numpy as np
+
+
+class CostModel:
+    """Slippage plus commission of one ticker's fills; the base charges nothing.
+
+    ``slippage`` returns a fraction of the price (buys pay ``price * (1 +
+    s)``, sells receive ``price * (1 - s)``); ``commission`` returns a cash
+    fee for a fill of ``notional`` value and ``quantity`` shares.
+    """
+
+    needs_volume = False
+
+    def slippage(self, price, quantity, volume):
+        return 0.0
+
+    def commission(self, notional, quantity):
+        return 0.0
+
+    def slippage_batch(self, prices, quantities, volumes):
+        return np.zeros(np.shape(prices))
+
+    def commission_batch(self, notionals, quantities):
+        return np.zeros(np.shape(notionals))
+
+    def key(self):
+        """Hashable description; equal keys mean identical costs."""
+        return (type(self).__name__,) + tuple(sorted(vars(self).items()))
+
+    def __eq__(self, other):
+        return isinstance(other, CostModel) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        args = ", ".join(f"{k}={v!r}" for k, v in sorted(vars(self).items()))
+        return f"{type(self).__name__}({args})"
+
+
+class VolumeSlippage(CostModel):
+    """Impact of ``impact_pct * participation ** exponent`` percent."""
+
+    needs_volume = True
+
+    def __init__(self, impact_pct, exponent=0.5):
+        self.impact_pct = float(impact_pct)
+        self.exponent = float(exponent)
+
+    def slippage(self, price, quantity, volume):
+        if volume is None or not volume > 0 or quantity <= 0:
+            return 0.0
+        return self.impact_pct / 100.0 * (quantity / volume) ** self.exponent
+
+    def slippage_batch(self, prices, quantities, volumes):
+        volumes = np.asarray(volumes, dtype=float)
+        quantities = np.asarray(quantities, dtype=float)
+        ok = (volumes > 0) & (quantities > 0)
+        participation = np.divide(quantities, volumes, out=np.zeros(np.shape(quantities)), where=ok)
+        return np.where(ok, self.impact_pct / 100.0 * participation ** self.exponent, 0.0)
+
+
+class PercentCommission(CostModel):
+    """``pct`` percent of the notional, at least ``minimum`` per fill."""
+
+    def __init__(self, pct, minimum=0.0):
+        self.pct = float(pct)
+        self.minimum = float(minimum)
+
+    def commission(self, notional, quantity):
+        if notional <= 0:
+            return 0.0
+        return max(self.minimum, notional * self.pct / 100.0)
+
+    def commission_batch(self, notionals, quantities):
+        notionals = np.asarray(notionals, dtype=float)
+        return np.where(notionals > 0, np.maximum(self.minimum, notionals * self.pct / 100.0), 0.0)
+
+
+class PerShareCommission(CostModel):
+    """``per_share`` per share, at least ``minimum``, at most ``max_pct`` of notional."""
+
+    def __init__(self, per_share, minimum=0.0, max_pct=None):
+        self.per_share = float(per_share)
+        self.minimum = float(minimum)
+        self.max_pct = None if max_pct is None else float(max_pct)
+
+    def commission(self, notional, quantity):
+        if notional <= 0:
+            return 0.0
+        fee = max(self.minimum, quantity * self.per_share)
+        if self.max_pct is not None:
+            fee = min(fee, notional * self.max_pct / 100.0)
+        return fee
+
+    def commission_batch(self, notionals, quantities):
+        notionals = np.asarray(notionals, dtype=float)
+        fee = np.maximum(self.minimum, np.asarray(quantities, dtype=float) * self.per_share)
+        if self.max_pct is not None:
+            fee = np.minimum(fee, notionals * self.max_pct / 100.0)
+        return np.where(notionals > 0, fee, 0.0)
+
+
+class FlatCommission(CostModel):
+    """A fixed ``fee`` per fill."""
+
+    def __init__(self, fee):
+        self.fee = float(fee)
+
+    def commission(self, notional, quantity):
+        return self.fee if notional > 0 else 0.0
+
+    def commission_batch(self, notionals, quantities):
+        return np.where(np.asarray(notionals, dtype=float) > 0, self.fee, 0.0)
+
+
+class CombinedCosts(CostModel):
+    """Sum of several models, e.g. one slippage and one commission model."""
+
+    def __init__(self, *models):
+        self.models = tuple(models)
+        self.needs_volume = any(m.needs_volume for m in models)
+
+    def slippage(self, price, quantity, volume):
+        return sum(m.slippage(price, quantity, volume) for m in self.models)
+
+    def commission(self, notional, quantity):
+        return sum(m.commission(notional, quantity) for m in self.models)
+
+    def slippage_batch(self, prices, quantities, volumes):
+        return sum(m.slippage_batch(prices, quantities, volumes) for m in self.models)
+
+    def commission_batch(self, notionals, quantities):
+        return sum(m.commission_batch(notionals, quantities) for m in self.models)
+
+    def key(self):
+        return (type(self).__name__,) + tuple(m.key() for m in self.models)
+
+
+SLIPPAGE_MODELS = {"volume": VolumeSlippage}
+COMMISSION_MODELS = {
+    "percent": PercentCommission,
+    "per_share": PerShareCommission,
+    "flat": FlatCommission,
+}
+
+
+def parse_cost_spec(kind, spec):
+    """Build a model from a config value such as ``"percent:0.05:1"``.
+
+    ``kind`` is ``"slippage"`` or ``"commission"``; the fields after the model
+    name are its positional parameters.
+    """
+    registry = SLIPPAGE_MODELS if kind == "slippage" else COMMISSION_MODELS
+    name, *params = [p.strip() for p in spec.split(":")]
+    cls = registry.get(name.lower())
+    if cls is None:
+        raise ValueError(f"Unknown {kind} model '{name}'; expected one of {', '.join(registry)}")
+    try:
+        return cls(*[float(p) for p in params])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid {kind} parameters '{spec}': {e}") from None
+
+
+def combine_costs(models):
+    """Return one model for ``models`` (None when there are none)."""
+    models = [m for m in models if m is not None]
+    if not models:
+        return None
+    return models[0] if len(models) == 1 else CombinedCosts(*models)
+
+
+def needs_volume(ticker_info_dict):
+    """True when some ticker's cost model depends on the bar volume."""
+    return any(getattr(info.get("costs"), "needs_volume", False) for info in ticker_info_dict.values())
+
+
+def buy_fill_parts(costs, cash, price, quantity, volume):
+    """Return ``(shares, fill_price, notional, fee)`` of a buy under ``costs``.
+
+    ``quantity`` None spends all cash.  Slippage uses the intended order size
+    for its participation; the commission is then taken out of the budget.
+    """
+    want = cash / price if quantity is None else min(quantity, cash / price)
+    if want <= 0:
+        return 0.0, price, 0.0, 0.0
+    fill_price = price * (1 + costs.slippage(price, want, volume))
+    shares = cash / fill_price if quantity is None else min(quantity, cash / fill_price)
+    notional = shares * fill_price
+    fee = costs.commission(notional, shares)
+    if notional + fee > cash:
+        # One fixed-point step ``n = cash - fee(n)`` from above lands at or
+        # below the largest affordable notional for increasing fee schedules.
+        notional = cash - costs.commission(cash, cash / fill_price)
+        if notional <= 0:
+            return 0.0, fill_price, 0.0, 0.0
+        shares = notional / fill_price
+        fee = costs.commission(notional, shares)
+    return shares, fill_price, notional, fee
+
+
+def buy_fill(costs, cash, price, quantity, volume):
+    """Return ``(shares, cash_spent)`` of a buy under ``costs``."""
+    shares, _, notional, fee = buy_fill_parts(costs, cash, price, quantity, volume)
+    return shares, notional + fee
+
+
+def sell_fill_parts(costs, shares, price, volume):
+    """Return ``(fill_price, proceeds, fee)`` of selling ``shares``."""
+    fill_price = price * (1 - costs.slippage(price, shares, volume))
+    proceeds = shares * fill_price
+    return fill_price, proceeds, costs.commission(proceeds, shares)
+
+
+def sell_fill(costs, shares, price, volume):
+    """Return the cash received for selling ``shares`` under ``costs``."""
+    _, proceeds, fee = sell_fill_parts(costs, shares, price, volume)
+    return proceeds - fee
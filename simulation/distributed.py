@@ -0,0 +1,463 @@
+"""Running sweeps on several machines through a shared spool directory.
+
+One machine's process pool limits how large an optimiser grid can get.  This
+module splits the same work into tasks that any number of workers can pick
+up, on this host or on others.  The only thing they need in common is a
+directory that every host can read and write (an NFS/SMB mount, or a plain
+local directory for local workers).  No server has to run.
+
+Layout of a spool::
+
+    blobs/<hash>.pkl          price DataFrames, named by a hash of their bytes
+                              (kept for later jobs until ``--clean``)
+    jobs/<job>                present while the coordinator waits for results
+    tasks/<job>-<n>.pkl       published tasks: (function, {ticker: hash}, args)
+    claimed/<job>-<n>@<worker>  a task a worker is running
+    results/<job>-<n>.pkl     the task's (ok, value)
+    stop                      workers exit when this file exists
+
+The coordinator (:func:`run_tasks`) writes each ticker's DataFrame once as a
+blob, publishes the tasks and reads results as they arrive.  A worker
+(:class:`SpoolWorker`) claims a task by renaming it into ``claimed/``; the
+rename is atomic, so only one worker gets each task.  Frames are fetched by
+hash and kept in a memory-bounded :class:`data.data_local_cache.LRUCache`, so
+a worker reads each price series once however many tasks use it.  While a
+task runs, the worker touches its claim file.  If a claim stops changing for
+``lease`` seconds (the worker died or lost the mount), the coordinator puts
+the task back.  Only mtime changes are compared, so clock differences
+between hosts do not matter.  When no worker finishes or runs a task for
+``timeout`` seconds (five minutes by default, e.g. because none was started)
+the coordinator raises ``TimeoutError`` instead of waiting forever.
+
+Blobs stay in the spool so later jobs on the same data skip the upload;
+``--clean`` deletes them once no job is running.
+
+Task functions are pickled by reference, so workers need the same version of
+the package installed.  Spools hold pickles: share them only between
+machines you trust.
+
+:func:`simulation.simulator.run_configured_sweep` and
+:func:`optimization.parameter_sweeper.full_parameter_sweep_advanced_daytrading`
+take ``spool_dir=`` to run this way.  Start workers on every host with::
+
+    python -m stock_market_simulator.simulation.distributed /mnt/spool --processes 8
+"""
+
+import argparse
+import hashlib
+import math
+import os
+import pickle
+import socket
+import threading
+import time
+import uuid
+from typing import Iterable
+
+from stock_market_simulator.data.data_local_cache import DEFAULT_MAX_BYTES, LRUCache
+
+SUBDIRS = ("blobs", "jobs", "tasks", "claimed", "results")
+
+# Default number of tasks a sweep is split into; more tasks balance better
+# across workers of different speed at the cost of more small files.
+DEFAULT_TASKS = 64
+# Seconds between a busy worker's claim touches, and seconds without one
+# after which the coordinator re-publishes the task.
+HEARTBEAT_SECS = 5.0
+DEFAULT_LEASE = 60.0
+# Seconds the coordinator waits while no worker finishes or runs any of its
+# tasks (e.g. none is started) before giving up.
+DEFAULT_TIMEOUT = 300.0
+
+
+def chunk_bounds(n, tasks=DEFAULT_TASKS):
+    """Split ``range(n)`` into at most ``tasks`` consecutive ``(start, stop)`` pairs."""
+    size = max(1, math.ceil(n / max(1, tasks)))
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+class Spool:
+    """File operations on a spool directory shared by a coordinator and workers."""
+
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        for sub in SUBDIRS:
+            os.makedirs(os.path.join(self.path, sub), exist_ok=True)
+
+    def _join(self, *parts):
+        return os.path.join(self.path, *parts)
+
+    def _write(self, path, data):
+        # Write-then-rename so readers never see a partial file.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def put_frame(self, df):
+        """Store ``df`` as a blob and return its content hash."""
+        data = pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        path = self._join("blobs", f"{digest}.pkl")
+        if not os.path.exists(path):
+            self._write(path, data)
+        return digest
+
+    def get_frame(self, digest):
+        with open(self._join("blobs", f"{digest}.pkl"), "rb") as f:
+            return pickle.load(f)
+
+    # Coordinator side -----------------------------------------------------
+
+    def open_job(self):
+        """Register a new job and return its id (ids sort by creation time)."""
+        job = f"{time.time_ns():016x}{uuid.uuid4().hex[:8]}"
+        self._write(self._join("jobs", job), b"")
+        return job
+
+    def close_job(self, job):
+        """Unregister ``job`` and withdraw its unclaimed tasks and results."""
+        for sub in ("jobs", "tasks", "results"):
+            for name in os.listdir(self._join(sub)):
+                if name.startswith(job):
+                    try:
+                        os.remove(self._join(sub, name))
+                    except FileNotFoundError:
+                        pass
+
+    def submit(self, task_id, func, data, args):
+        self._write(self._join("tasks", f"{task_id}.pkl"),
+                    pickle.dumps((func, data, args), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def ready(self, job):
+        """Ids of the finished tasks of ``job``."""
+        return sorted(name[:-4] for name in os.listdir(self._join("results"))
+                      if name.startswith(job) and name.endswith(".pkl"))
+
+    def pop_result(self, task_id):
+        """Return and remove the ``(ok, value)`` of ``task_id``, or None."""
+        path = self._join("results", f"{task_id}.pkl")
+        try:
+            with open(path, "rb") as f:
+                result = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        os.remove(path)
+        return result
+
+    def claims(self, job):
+        """``{claim file name: mtime}`` of the running tasks of ``job``."""
+        out = {}
+        for name in os.listdir(self._join("claimed")):
+            if name.startswith(job):
+                try:
+                    out[name] = os.stat(self._join("claimed", name)).st_mtime_ns
+                except FileNotFoundError:
+                    pass
+        return out
+
+    def requeue(self, claim_name):
+        task_id = claim_name.split("@", 1)[0]
+        try:
+            os.rename(self._join("claimed", claim_name), self._join("tasks", f"{task_id}.pkl"))
+        except FileNotFoundError:
+            pass
+
+    def clean(self):
+        """Remove blobs and leftovers of finished jobs; return the number of files.
+
+        Blobs are shared by all jobs, so nothing is removed (None is
+        returned) while any job is open.
+        """
+        if os.listdir(self._join("jobs")):
+            return None
+        removed = 0
+        for sub in SUBDIRS:
+            for name in os.listdir(self._join(sub)):
+                try:
+                    os.remove(self._join(sub, name))
+                    removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def stop(self):
+        """Ask every worker of this spool to exit."""
+        self._write(self._join("stop"), b"")
+
+    # Worker side ----------------------------------------------------------
+
+    def stopped(self):
+        return os.path.exists(self._join("stop"))
+
+    def job_open(self, task_id):
+        return os.path.exists(self._join("jobs", task_id.rsplit("-", 1)[0]))
+
+    def claim(self, worker):
+        """Claim the oldest task; return ``(task_id, claim_path)`` or None."""
+        for name in sorted(os.listdir(self._join("tasks"))):
+            if not name.endswith(".pkl"):
+                continue
+            task_id = name[:-4]
+            claim_path = self._join("claimed", f"{task_id}@{worker}")
+            try:
+                os.rename(self._join("tasks", name), claim_path)
+            except FileNotFoundError:
+                continue  # another worker was faster
+            return task_id, claim_path
+        return None
+
+    def finish(self, task_id, claim_path, ok, value):
+        if self.job_open(task_id):
+            try:
+                data = pickle.dumps((ok, value), protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                data = pickle.dumps((False, RuntimeError(f"Unpicklable task result: {e!r}")))
+            self._write(self._join("results", f"{task_id}.pkl"), data)
+        try:
+            os.remove(claim_path)
+        except FileNotFoundError:
+            pass  # re-published after a missed lease
+
+
+def run_tasks(spool_dir, dfs_dict, calls, timeout=DEFAULT_TIMEOUT, lease=DEFAULT_LEASE, poll=0.05):
+    """Run ``calls`` on the workers of ``spool_dir`` and yield ``(i, result)``.
+
+    Each call is ``(func, tickers, args)`` and runs as
+    ``func({tk: dfs_dict[tk] for tk in tickers}, *args)`` on some worker.
+    ``func`` must be importable by the workers.  Results are yielded in
+    completion order.  A task's exception is raised here.  ``TimeoutError``
+    is raised when, for ``timeout`` seconds, no task finishes and no worker
+    is running one (None waits forever).  However the generator ends, the
+    job's unclaimed tasks are withdrawn.
+    """
+    spool = Spool(spool_dir)
+    job = spool.open_job()
+    try:
+        hashes = {}
+        for i, (func, tickers, args) in enumerate(calls):
+            for tk in tickers:
+                if tk not in hashes:
+                    hashes[tk] = spool.put_frame(dfs_dict[tk])
+            spool.submit(f"{job}-{i:06d}", func, {tk: hashes[tk] for tk in tickers}, args)
+
+        pending = set(range(len(calls)))
+        seen = {}  # claim name -> (mtime, monotonic time it was first seen)
+        scan_every = min(x for x in (HEARTBEAT_SECS, lease and lease / 4, timeout and timeout / 4) if x)
+        last_progress = last_scan = time.monotonic()
+        while pending:
+            finished = False
+            for task_id in spool.ready(job):
+                i = int(task_id.rsplit("-", 1)[1])
+                result = spool.pop_result(task_id)
+                if result is None or i not in pending:
+                    continue
+                pending.discard(i)
+                finished = True
+                ok, value = result
+                if not ok:
+                    raise value
+                yield i, value
+            now = time.monotonic()
+            if finished:
+                last_progress = now
+            if now - last_scan >= scan_every:
+                last_scan = now
+                claims = spool.claims(job)
+                for name, mtime in claims.items():
+                    if name not in seen or seen[name][0] != mtime:
+                        # A new or touched claim: some worker is busy on it.
+                        seen[name] = (mtime, now)
+                        last_progress = now
+                    elif lease is not None and now - seen[name][1] > lease:
+                        spool.requeue(name)
+                        del seen[name]
+                for name in set(seen) - set(claims):
+                    del seen[name]
+            if timeout is not None and now - last_progress > timeout:
+                raise TimeoutError(
+                    f"No spool worker ran a task for {timeout:g}s; start workers with "
+                    f"'python -m stock_market_simulator.simulation.distributed {spool.path}'")
+            if not finished:
+                time.sleep(poll)
+    finally:
+        spool.close_job(job)
+
+
+class SpoolWorker:
+    """Runs tasks of a spool until told to stop.
+
+    ``cache_bytes`` bounds the frames kept in memory between tasks;
+    :attr:`fetches` counts blob reads.
+    """
+
+    def __init__(self, spool_dir, name=None, cache_bytes=DEFAULT_MAX_BYTES,
+                 heartbeat=HEARTBEAT_SECS, poll=0.2):
+        self.spool = Spool(spool_dir)
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.frames = LRUCache(cache_bytes)
+        self.heartbeat = heartbeat
+        self.poll = poll
+        self.fetches = 0
+
+    def frame(self, digest):
+        df = self.frames.get(digest)
+        if df is None:
+            df = self.spool.get_frame(digest)
+            self.fetches += 1
+            self.frames.put(digest, df)
+        return df
+
+    def _touch_until(self, claim_path, done):
+        while not done.wait(self.heartbeat):
+            try:
+                os.utime(claim_path)
+            except FileNotFoundError:
+                return
+
+    def run_task(self, task_id, claim_path):
+        done = threading.Event()
+        beat = threading.Thread(target=self._touch_until, args=(claim_path, done), daemon=True)
+        beat.start()
+        try:
+            with open(claim_path, "rb") as f:
+                func, data, args = pickle.load(f)
+            dfs = {tk: self.frame(digest) for tk, digest in data.items()}
+            ok, value = True, func(dfs, *args)
+        except Exception as e:
+            ok, value = False, e
+        finally:
+            done.set()
+            beat.join()
+        self.spool.finish(task_id, claim_path, ok, value)
+
+    def run(self, idle_exit=None, max_tasks=None):
+        """Process tasks; return how many ran.
+
+        Stops when the spool's ``stop`` file appears, after ``max_tasks``
+        tasks, or once no task was available for ``idle_exit`` seconds.
+        """
+        done = 0
+        idle_since = time.monotonic()
+        while not self.spool.stopped():
+            claimed = self.spool.claim(self.name)
+            if claimed is None:
+                if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                    break
+                time.sleep(self.poll)
+                continue
+            task_id, claim_path = claimed
+            if self.spool.job_open(task_id):
+                self.run_task(task_id, claim_path)
+                done += 1
+            else:
+                # The coordinator gave up on this job while the task waited.
+                try:
+                    os.remove(claim_path)
+                except FileNotFoundError:
+                    pass
+            idle_since = time.monotonic()
+            if max_tasks is not None and done >= max_tasks:
+                break
+        return done
+
+
+def run_worker(spool_dir, idle_exit=None, max_tasks=None, name=None):
+    """Entry point of one worker process."""
+    return SpoolWorker(spool_dir, name=name).run(idle_exit, max_tasks)
+
+
+def start_local_workers(spool_dir, processes, idle_exit=None, max_tasks=None):
+    """Start ``processes`` worker processes on this host and return them."""
+    import multiprocessing
+
+    procs = [multiprocessing.Process(target=run_worker, args=(spool_dir, idle_exit, max_tasks), daemon=True)
+             for _ in range(processes)]
+    for p in procs:
+        p.start()
+    return procs
+
+
+def sweep_chunk(dfs_dict, approach_name, ticker_info_dict, years, stepsize, initial_cash, schedule,
+                start, stop, keep_histories=False, keep_trades=False):
+    """Task: windows ``start:stop`` of a sweep as ``(rows, histories, trades)``."""
+    from stock_market_simulator.simulation.simulator import run_sweep_windows
+
+    histories = [] if keep_histories else None
+    trades = [] if keep_trades else None
+    rows = run_sweep_windows(dfs_dict, approach_name, ticker_info_dict, years, stepsize, initial_cash,
+                             schedule, window_slice=slice(start, stop), histories=histories,
+                             trades=trades)
+    return rows, histories, trades
+
+
+def spool_sweep_windows(spool_dir, dfs_dict, approach_name, ticker_info_dict, years, stepsize,
+                        initial_cash=10000.0, schedule="monthly", histories=None, trades=None,
+                        tasks=DEFAULT_TASKS, timeout=DEFAULT_TIMEOUT):
+    """:func:`simulation.simulator.run_sweep_windows` over the workers of a spool.
+
+    The sweep's windows are split into ``tasks`` chunks; the returned rows
+    (and ``histories``/``trades``) are in window order, identical to a local
+    run.  ``timeout`` is passed to :func:`run_tasks`.
+    """
+    from stock_market_simulator.simulation.simulator import sweep_window_count
+
+    n = sweep_window_count(dfs_dict, approach_name, ticker_info_dict, years, stepsize, schedule)
+    bounds = chunk_bounds(n, tasks)
+    tickers = list(ticker_info_dict)
+    calls = [(sweep_chunk, tickers,
+              (approach_name, ticker_info_dict, years, stepsize, initial_cash, schedule,
+               start, stop, histories is not None, trades is not None))
+             for start, stop in bounds]
+    chunks = [None] * len(bounds)
+    for i, chunk in run_tasks(spool_dir, dfs_dict, calls, timeout=timeout):
+        chunks[i] = chunk
+
+    rows = []
+    for chunk_rows, chunk_hists, chunk_trades in chunks:
+        rows.extend(chunk_rows)
+        if histories is not None:
+            histories.extend(chunk_hists)
+        if trades is not None:
+            trades.extend(chunk_trades)
+    return rows
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run sweep tasks from a shared spool directory")
+    parser.add_argument("spool", help="Spool directory shared with the coordinator")
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes on this host")
+    parser.add_argument("--idle-exit", type=float, default=None,
+                        help="Exit after this many seconds without tasks")
+    parser.add_argument("--max-tasks", type=int, default=None, help="Exit after this many tasks")
+    parser.add_argument("--stop", action="store_true",
+                        help="Tell all workers of the spool to exit (delete <spool>/stop to reuse it)")
+    parser.add_argument("--clean", action="store_true",
+                        help="Delete the stored price blobs and leftovers of finished jobs")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    if args.stop:
+        Spool(args.spool).stop()
+        return
+    if args.clean:
+        removed = Spool(args.spool).clean()
+        if removed is None:
+            print("Warning: jobs are still running on this spool; nothing was removed.")
+        else:
+            print(f"Removed {removed} files")
+        return
+    if args.processes <= 1:
+        done = run_worker(args.spool, args.idle_exit, args.max_tasks)
+        print(f"{done} tasks done")
+        return
+    procs = start_local_workers(args.spool, args.processes, args.idle_exit, args.max_tasks)
+    for p in procs:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,153 @@ orders and executes those whose conditions are met.  The design is intentionally
 minimal – it does not attempt to model a full exchange but instead applies a
 simple fixed bid/ask spread and supports a handful of order types relevant to
 the built-in strategies.
+
+Two execution modes exist:
+
+* ``"close"`` (default) – every order is evaluated against the bar's close
+  only.  A limit, stop or trailing order whose level was crossed intraday but
+  not at the close stays pending.
+* ``"ohlc"`` – the bar's Open/High/Low/Close are walked in a fixed order
+  (O→L→H→C for up bars, O→H→L→C for down bars).  Market orders fill at the
+  open; a trigger that is already met at the open fills there (a gap),
+  otherwise it fills at its own level when the path crosses it.
+
+The mode is chosen per sub-portfolio via ``portfolio.execution``.  Single
+bars can be passed as ``execute_orders(..., bar=(open, high, low, close))``;
+the simulator instead builds the spread-adjusted paths of a whole window with
+:func:`window_paths` (array operations) and calls :func:`execute_orders_on_path`
+per bar, so OHLC mode adds no per-bar preparation over close-only execution.
+
+Fills of portfolios with a ``costs`` model (:mod:`simulation.costs`) also pay
+slippage and commission on top of the spread; every fill goes through
+:func:`_buy` / :func:`_sell`, which check for it.  The same two functions
+append each fill to ``portfolio.ledger`` when one is attached
+(:mod:`simulation.ledger`); without a ledger that is one attribute check per
+fill, and nothing per bar.
 """
 
+import numpy as np
+
+from stock_market_simulator.simulation.costs import buy_fill_parts, sell_fill_parts
 from stock_market_simulator.simulation.portfolio import Portfolio, Order
 
+EXECUTION_MODES = ("close", "ohlc")
+
+
+def _buy(portfolio, order, price, day_index=None):
+    costs = portfolio.costs
+    if costs is not None:
+        shares, fill_price, notional, fee = buy_fill_parts(
+            costs, portfolio.cash, price, order.quantity, portfolio.bar_volume)
+        if shares > 0:
+            portfolio.shares += shares
+            portfolio.cash -= notional + fee
+            if portfolio.ledger is not None:
+                portfolio.ledger.record(day_index, "buy", order.order_type, shares, fill_price, fee)
+        return
+    to_buy = (portfolio.cash / price if order.quantity is None
+              else min(order.quantity, portfolio.cash / price))
+    if to_buy > 0:
+        portfolio.shares += to_buy
+        portfolio.cash -= to_buy * price
+        if portfolio.ledger is not None:
+            portfolio.ledger.record(day_index, "buy", order.order_type, to_buy, price)
+
+
+def _sell(portfolio, order, price, day_index=None):
+    to_sell = (portfolio.shares if order.quantity is None
+               else min(order.quantity, portfolio.shares))
+    if to_sell > 0:
+        costs = portfolio.costs
+        fee = 0.0
+        if costs is None:
+            portfolio.cash += to_sell * price
+        else:
+            price, proceeds, fee = sell_fill_parts(costs, to_sell, price, portfolio.bar_volume)
+            portfolio.cash += proceeds - fee
+        portfolio.shares -= to_sell
+        if portfolio.ledger is not None:
+            portfolio.ledger.record(day_index, "sell", order.order_type, to_sell, price, fee)
+
+
+def bar_path(open_, high, low, close):
+    """Intrabar price path assumed by OHLC execution."""
+    if close >= open_:
+        return (open_, low, high, close)
+    return (open_, high, low, close)
+
+
+def window_paths(open_, high, low, close, spread=0.0):
+    """Return ``(buy_paths, sell_paths)`` lists with one path per bar.
+
+    Vectorized form of :func:`bar_path` with the half spread applied for each
+    side, as expected by :func:`execute_orders_on_path`.
+    """
+    open_, high, low, close = (np.asarray(a, dtype=float) for a in (open_, high, low, close))
+    up = close >= open_
+    path = np.stack([open_, np.where(up, low, high), np.where(up, high, low), close], axis=1)
+    half_spread_fraction = spread / 200.0
+    return (path * (1 + half_spread_fraction)).tolist(), (path * (1 - half_spread_fraction)).tolist()
+
+
+def execute_orders_on_path(portfolio, buy_path, sell_path, day_index=None):
+    """Execute pending orders against one bar's spread-adjusted price path.
 
-def execute_orders(current_price, portfolio: Portfolio, day_index):
+    ``day_index`` only labels fills in ``portfolio.ledger``.
+    """
+    executed = []
+
+    for order in portfolio.orders:
+        buying = order.side == 'buy'
+        prices = buy_path if buying else sell_path
+        fill = None
+
+        if order.order_type == 'market':
+            fill = prices[0]
+
+        elif order.order_type in ('limit', 'stop'):
+            level = order.limit_price if order.order_type == 'limit' else order.stop_price
+            # Limit buys and stop sells trigger on the way down, the others on
+            # the way up.
+            below = buying == (order.order_type == 'limit')
+            for k, price in enumerate(prices):
+                if (price <= level) if below else (price >= level):
+                    fill = price if k == 0 else level
+                    break
+
+        elif order.order_type == 'trailing_stop' and not buying:
+            # Common case: the bar's low stays above the highest trigger the
+            # bar can produce, so only the running high moves.
+            highest = order.highest_price
+            if highest is not None:
+                low, high = prices[1], prices[2]
+                if low > high:
+                    low, high = high, low
+                if high > highest:
+                    highest = high
+                if low > highest * (1 - (order.trail_percent or 0) / 100.0):
+                    order.highest_price = highest
+                    continue
+            for k, price in enumerate(prices):
+                if order.highest_price is None or price > order.highest_price:
+                    order.highest_price = price
+                trigger = order.highest_price * (1 - (order.trail_percent or 0) / 100.0)
+                if price <= trigger:
+                    fill = price if k == 0 else trigger
+                    break
+
+        if fill is not None:
+            if buying:
+                _buy(portfolio, order, fill, day_index)
+            else:
+                _sell(portfolio, order, fill, day_index)
+            executed.append(order)
+
+    for e in executed:
+        portfolio.orders.remove(e)
+
+
+def execute_orders(current_price, portfolio: Portfolio, day_index, bar=None):
     """Evaluate and execute any pending orders for the given day.
 
     Parameters
@@ -24,6 +165,10 @@ def execute_orders(current_price, portfolio: Portfolio, day_index):
         Integer index of the current simulation day (used by some strategies for
         timing).  Orders carry their placement day so we can compute how long
         they have been outstanding.
+    bar:
+        Optional ``(open, high, low, close)`` tuple.  When given, orders are
+        executed in OHLC mode (see the module docstring) and ``current_price``
+        is ignored.
 
     The function mutates ``portfolio`` in place by adjusting cash/share balances
     and removing orders that were executed.
@@ -37,6 +182,17 @@ def execute_orders(current_price, portfolio: Portfolio, day_index):
     * Buy orders pay ``current_price * (1 + spread/200)``
     * Sell orders receive ``current_price * (1 - spread/200)``
     """
+    if bar is not None:
+        half_spread_fraction = getattr(portfolio, "spread", 0.0) / 200.0
+        path = bar_path(*bar)
+        execute_orders_on_path(
+            portfolio,
+            [p * (1 + half_spread_fraction) for p in path],
+            [p * (1 - half_spread_fraction) for p in path],
+            day_index,
+        )
+        return
+
     executed = []
     # Retrieve the fixed spread (default 0.0 if not set), interpreted as a
     # percentage.  ``half_spread_fraction`` is the amount added/subtracted from
@@ -55,52 +211,28 @@ def execute_orders(current_price, portfolio: Portfolio, day_index):
         # spread.
         if order.order_type == 'market':
             if order.side == 'buy':
-                to_buy = (portfolio.cash / effective_price if order.quantity is None
-                          else min(order.quantity, portfolio.cash / effective_price))
-                if to_buy > 0:
-                    portfolio.shares += to_buy
-                    portfolio.cash -= to_buy * effective_price
+                _buy(portfolio, order, effective_price, day_index)
             else:  # sell
-                to_sell = (portfolio.shares if order.quantity is None
-                           else min(order.quantity, portfolio.shares))
-                if to_sell > 0:
-                    portfolio.cash += to_sell * effective_price
-                    portfolio.shares -= to_sell
+                _sell(portfolio, order, effective_price, day_index)
             executed.append(order)
 
         # LIMIT orders execute only when the effective price crosses the
         # specified limit.
         elif order.order_type == 'limit':
             if order.side == 'buy' and effective_price <= order.limit_price:
-                to_buy = (portfolio.cash / effective_price if order.quantity is None
-                          else min(order.quantity, portfolio.cash / effective_price))
-                if to_buy > 0:
-                    portfolio.shares += to_buy
-                    portfolio.cash -= to_buy * effective_price
+                _buy(portfolio, order, effective_price, day_index)
                 executed.append(order)
             elif order.side == 'sell' and effective_price >= order.limit_price:
-                to_sell = (portfolio.shares if order.quantity is None
-                           else min(order.quantity, portfolio.shares))
-                if to_sell > 0:
-                    portfolio.cash += to_sell * effective_price
-                    portfolio.shares -= to_sell
+                _sell(portfolio, order, effective_price, day_index)
                 executed.append(order)
 
         # STOP orders trigger when the effective price breaches the stop level.
         elif order.order_type == 'stop':
             if order.side == 'sell' and effective_price <= order.stop_price:
-                to_sell = (portfolio.shares if order.quantity is None
-                           else min(order.quantity, portfolio.shares))
-                if to_sell > 0:
-                    portfolio.cash += to_sell * effective_price
-                    portfolio.shares -= to_sell
+                _sell(portfolio, order, effective_price, day_index)
                 executed.append(order)
             elif order.side == 'buy' and effective_price >= order.stop_price:
-                to_buy = (portfolio.cash / effective_price if order.quantity is None
-                          else min(order.quantity, portfolio.cash / effective_price))
-                if to_buy > 0:
-                    portfolio.shares += to_buy
-                    portfolio.cash -= to_buy * effective_price
+                _buy(portfolio, order, effective_price, day_index)
                 executed.append(order)
 
         # TRAILING STOP orders dynamically adjust their trigger based on the
@@ -115,11 +247,7 @@ def execute_orders(current_price, portfolio: Portfolio, day_index):
 
                 trigger = order.highest_price * (1 - (order.trail_percent or 0) / 100.0)
                 if effective_price <= trigger:
-                    to_sell = (portfolio.shares if order.quantity is None
-                               else min(order.quantity, portfolio.shares))
-                    if to_sell > 0:
-                        portfolio.cash += to_sell * effective_price
-                        portfolio.shares -= to_sell
+                    _sell(portfolio, order, effective_price, day_index)
                     executed.append(order)
 
     # Remove executed orders from the portfolio.
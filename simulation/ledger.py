@@ -0,0 +1,193 @@
+"""Optional trade ledger of a sub-portfolio's fills.
+
+The equity curve shows what a strategy earned, not what it did.  Attaching a
+:class:`TradeLedger` to a :class:`simulation.portfolio.Portfolio`
+(``portfolio.ledger``) makes :mod:`simulation.execution` append every fill:
+bar index, side, order type, quantity, fill price (after spread and
+slippage) and commission.
+
+Fills are stored column-wise in preallocated NumPy arrays that double in size
+when full, so recording costs a handful of array stores and the ledger turns
+into a DataFrame or a Parquet/CSV file without copying row objects.
+Portfolios keep ``ledger=None`` by default; the simulation then pays one
+attribute check per fill and nothing per bar.
+
+``HybridMultiFundPortfolio(..., record_trades=True)`` attaches a ledger to
+every sub-portfolio, and :func:`simulation.simulator.simulate_window` or
+:func:`simulation.simulator.run_sweep_windows` hand them back per window::
+
+    trades = {}
+    history, index = simulate_window(sim_dfs, ticker_info_dict, trades=trades)
+    export_trades(trades, "trades.parquet", index)
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+SIDES = ("buy", "sell")
+ORDER_TYPES = ("market", "limit", "stop", "trailing_stop")
+
+_SIDE_CODES = {name: i for i, name in enumerate(SIDES)}
+_TYPE_CODES = {name: i for i, name in enumerate(ORDER_TYPES)}
+
+
+class TradeLedger:
+    """Column buffers of fills that grow geometrically.
+
+    ``bar`` is the day index within the simulated window (-1 when the caller
+    did not pass one).  Use :meth:`columns` or :meth:`to_frame` to read the
+    recorded fills.
+    """
+
+    def __init__(self, capacity=64):
+        capacity = max(1, int(capacity))
+        self._bar = np.empty(capacity, dtype=np.int64)
+        self._side = np.empty(capacity, dtype=np.int8)
+        self._type = np.empty(capacity, dtype=np.int8)
+        self._quantity = np.empty(capacity)
+        self._price = np.empty(capacity)
+        self._fee = np.empty(capacity)
+        self._n = 0
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def capacity(self):
+        return len(self._bar)
+
+    def _grow(self):
+        size = 2 * len(self._bar)
+        for name in ("_bar", "_side", "_type", "_quantity", "_price", "_fee"):
+            old = getattr(self, name)
+            new = np.empty(size, dtype=old.dtype)
+            new[:self._n] = old[:self._n]
+            setattr(self, name, new)
+
+    def record(self, bar, side, order_type, quantity, price, fee=0.0):
+        """Append one fill."""
+        n = self._n
+        if n == len(self._bar):
+            self._grow()
+        self._bar[n] = -1 if bar is None else bar
+        self._side[n] = _SIDE_CODES[side]
+        self._type[n] = _TYPE_CODES[order_type]
+        self._quantity[n] = quantity
+        self._price[n] = price
+        self._fee[n] = fee
+        self._n = n + 1
+
+    def columns(self):
+        """Return ``{column: array}`` views of the recorded fills.
+
+        ``side`` and ``type`` are integer codes into :data:`SIDES` and
+        :data:`ORDER_TYPES`.
+        """
+        n = self._n
+        return {"bar": self._bar[:n], "side": self._side[:n], "type": self._type[:n],
+                "quantity": self._quantity[:n], "price": self._price[:n], "fee": self._fee[:n]}
+
+    def to_frame(self, index=None):
+        """Return the fills as a DataFrame.
+
+        With the window's ``index`` a ``date`` column is added.  ``notional``
+        is ``quantity * price`` (before the fee).
+        """
+        cols = self.columns()
+        df = pd.DataFrame({
+            "bar": cols["bar"],
+            "side": pd.Categorical.from_codes(cols["side"], SIDES),
+            "type": pd.Categorical.from_codes(cols["type"], ORDER_TYPES),
+            "quantity": cols["quantity"],
+            "price": cols["price"],
+            "fee": cols["fee"],
+        })
+        df["notional"] = df["quantity"] * df["price"]
+        if index is not None:
+            df.insert(1, "date", pd.DatetimeIndex(index)[cols["bar"]])
+        return df
+
+    def metrics(self, values=None):
+        """Trade-count and turnover figures of the recorded fills.
+
+        ``values`` (the sub-portfolio's per-bar value, or the approach's) adds
+        ``turnover``: traded notional divided by the average value, e.g. 2.0
+        for selling and re-buying the whole portfolio once.
+        """
+        cols = self.columns()
+        traded = float(np.dot(cols["quantity"], cols["price"]))
+        buys = int(np.count_nonzero(cols["side"] == _SIDE_CODES["buy"]))
+        out = {
+            "trades": self._n,
+            "buys": buys,
+            "sells": self._n - buys,
+            "traded_value": traded,
+            "fees": float(cols["fee"].sum()),
+        }
+        if values is not None:
+            avg = float(np.mean(values)) if len(values) else 0.0
+            out["turnover"] = traded / avg if avg > 0 else 0.0
+        return out
+
+
+def trades_frame(ledgers, index=None):
+    """One DataFrame of several tickers' ledgers (``{ticker: TradeLedger}``).
+
+    Rows are ordered by bar, then by ticker order.
+    """
+    parts = []
+    for ticker, ledger in ledgers.items():
+        df = ledger.to_frame(index)
+        df.insert(0, "ticker", ticker)
+        parts.append(df)
+    if not parts:
+        df = TradeLedger().to_frame(index)
+        df.insert(0, "ticker", [])
+        return df
+    return pd.concat(parts, ignore_index=True).sort_values("bar", kind="stable", ignore_index=True)
+
+
+def trade_metrics(ledgers, values=None):
+    """Combined :meth:`TradeLedger.metrics` of ``{ticker: TradeLedger}``.
+
+    ``values`` is the total per-bar value of the portfolio for ``turnover``.
+    """
+    totals = {"trades": 0, "buys": 0, "sells": 0, "traded_value": 0.0, "fees": 0.0}
+    for ledger in ledgers.values():
+        for key, val in ledger.metrics().items():
+            totals[key] += val
+    if values is not None:
+        avg = float(np.mean(values)) if len(values) else 0.0
+        totals["turnover"] = totals["traded_value"] / avg if avg > 0 else 0.0
+    return totals
+
+
+def write_trades(df, path):
+    """Write a trades DataFrame to Parquet or CSV, chosen by ``path``'s extension.
+
+    ``.parquet`` needs ``pyarrow``.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        out = df.copy()
+        # Categoricals round-trip as dictionary columns; plain strings are
+        # easier for other tools.
+        out["side"] = out["side"].astype(str)
+        out["type"] = out["type"].astype(str)
+        out.to_parquet(path, index=False)
+    elif ext == ".csv":
+        df.to_csv(path, index=False)
+    else:
+        raise ValueError(f"Unsupported trade export format '{ext}' (use .parquet or .csv).")
+
+
+def export_trades(ledgers, path, index=None):
+    """Write ``{ticker: TradeLedger}`` of one window to Parquet or CSV.
+
+    Returns the written DataFrame (see :func:`trades_frame`).
+    """
+    df = trades_frame(ledgers, index)
+    write_trades(df, path)
+    return df
@@ -0,0 +1,124 @@
+"""Sharing per-ticker sub-simulations ("legs") between approaches.
+
+An approach without ``rebalance=`` is a sum of independent sub-portfolios:
+each ticker trades its own ``initial_cash / len(tickers)`` slice with its own
+strategy, spread, fees and costs (see
+:class:`simulation.simulator.HybridMultiFundPortfolio`).  Configs usually
+repeat the same leg in many approaches – ``^GSPC buy_hold`` next to a
+different second ticker, or in every variant of a parameter range – and each
+approach used to simulate it again for every window.
+
+A leg's per-bar values depend only on its ticker settings, its cash slice and
+the dates of the window, so :class:`LegCache` stores them under exactly that
+key.  :func:`simulation.simulator.run_shared_sweeps` walks the windows of
+several approaches in start-date order, simulates every distinct leg once and
+sums the cached values into each approach's history, giving the same numbers
+as simulating the approaches one by one.
+
+Legs are only shared between approaches that give them the same cash, i.e.
+approaches with the same number of tickers: ``^GSPC buy_hold`` in a
+two-ticker and in a three-ticker approach are two legs.  Rescaling a leg
+simulated with other cash is not exact here.  Strategies compare share counts
+with absolute thresholds, minimum and flat commissions and volume slippage
+do not scale with the position, and even plain float scaling would break the
+bit-for-bit match with separate runs.
+"""
+
+import hashlib
+import types
+
+from stock_market_simulator.simulation.multi_asset import is_rebalancing_approach
+
+
+def freeze(value):
+    """Hashable stand-in for a ticker setting, equal for equal settings."""
+    if (hasattr(value, "__dict__") and type(value).__hash__ is object.__hash__
+            and not isinstance(value, (types.FunctionType, type))):
+        # Plain objects such as cross-sectional strategies compare by state.
+        try:
+            return (type(value).__name__, tuple(sorted(
+                (k, freeze(v)) for k, v in vars(value).items())))
+        except TypeError:
+            return value
+    return value
+
+
+def leg_key(ticker, info, cash):
+    """Key of the sub-portfolio trading ``cash`` of ``ticker`` with ``info``."""
+    return ticker, tuple(sorted((k, freeze(v)) for k, v in info.items())), cash
+
+
+def leg_keys(ticker_info_dict, initial_cash=10000.0):
+    """Leg keys of an approach, in ticker order."""
+    cash = initial_cash / len(ticker_info_dict)
+    return [leg_key(tk, info, cash) for tk, info in ticker_info_dict.items()]
+
+
+def window_key(index, i0, i1):
+    """Fingerprint of the dates ``index[i0:i1]``.
+
+    Windows of different calendars that cover the same dates share legs.
+    """
+    dates = index[i0:i1].asi8
+    return i1 - i0, hashlib.blake2b(dates.tobytes(), digest_size=16).digest()
+
+
+class LegCache:
+    """Per-bar values of simulated legs keyed by ``(leg_key, window_key)``.
+
+    Entries are only useful while other approaches still have to visit the
+    same window, so the sweep driver calls :meth:`clear` whenever it moves on
+    to a later start date; memory stays bounded by one window per leg.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        values = self._values.get(key)
+        if values is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return values
+
+    def put(self, key, values):
+        self._values[key] = values
+
+    def clear(self):
+        self._values.clear()
+
+    def __len__(self):
+        return len(self._values)
+
+
+def group_by_legs(approaches, initial_cash=10000.0):
+    """Split ``(name, ticker_info_dict)`` pairs into groups that share legs.
+
+    Approaches sharing a leg, directly or through other approaches, land in
+    the same group, so each group can run in one process with one
+    :class:`LegCache`.  Rebalancing approaches have no legs and form groups of
+    their own.  Groups keep the order of their first approach.
+    """
+    parent = list(range(len(approaches)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner = {}
+    for i, (_, ticker_info_dict) in enumerate(approaches):
+        if is_rebalancing_approach(ticker_info_dict):
+            continue
+        for key in leg_keys(ticker_info_dict, initial_cash):
+            j = owner.setdefault(key, i)
+            parent[find(i)] = find(j)
+
+    groups = {}
+    for i, approach in enumerate(approaches):
+        groups.setdefault(find(i), []).append(approach)
+    return list(groups.values())
@@ -0,0 +1,252 @@
+"""Monte Carlo robustness runs over synthetic price paths.
+
+A sweep (:func:`simulation.simulator.run_configured_sweep`) only sees the
+handful of overlapping windows history provides, so its spread says little
+about tail risk.  This module runs an approach over thousands of synthetic
+price paths generated from the tickers' historical daily log returns:
+
+* ``"bootstrap"`` – a moving-block bootstrap: blocks of exactly
+  ``block_size`` consecutive days, starting anywhere in the history, are
+  drawn with replacement and concatenated.  Blocks keep short-range
+  autocorrelation and volatility clusters, and drawing the same days for
+  every ticker keeps their cross-correlation.
+* ``"gbm"`` – geometric Brownian motion with the historical mean and
+  covariance of the log returns.
+
+Paths are generated and simulated in fixed-size batches.  Each batch gets its
+own child of one :class:`numpy.random.SeedSequence`, so results for a given
+``seed`` are identical whatever the number of workers.  Workers receive the
+return matrix once through the pool initializer and generate their batches
+themselves; only the per-path metrics travel back.  Path generation and the
+metrics are vectorised over a batch; the approach itself runs through the
+regular simulation code, one path at a time.
+
+Paths only have closing prices, so approaches with volume slippage or
+``execution=ohlc`` are rejected up front rather than run with made-up
+volumes or at close prices.
+
+Results use the sweep format: rows ``(lowest_valley, highest_peak,
+final_result, cagr, path)`` summarised by :func:`simulator.summarize_sweep`,
+with the path number in place of the start date.  The summary additionally
+holds a ``"max_drawdown"`` entry (peak-to-trough loss in percent).  Run::
+
+    python -m stock_market_simulator.simulation.monte_carlo config.txt --paths 10000
+"""
+
+import argparse
+import concurrent.futures
+import os
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from stock_market_simulator.simulation.alignment import align
+from stock_market_simulator.simulation.costs import needs_volume
+from stock_market_simulator.simulation.multi_asset import (
+    fill_prices,
+    is_rebalancing_approach,
+    run_rebalancing_approach,
+)
+from stock_market_simulator.simulation.simulator import (
+    HybridMultiFundPortfolio,
+    run_hybrid_multi_fund,
+    summarize_sweep,
+)
+
+METHODS = ("bootstrap", "gbm")
+TRADING_DAYS_PER_YEAR = 252
+DEFAULT_BLOCK_SIZE = 21
+# Paths per task.  Fixed (not derived from the worker count) so that a seed
+# always produces the same paths.
+DEFAULT_BATCH_SIZE = 250
+
+# Shared data loaded once per worker by the process pool initializer.
+_MODEL = None
+
+
+def log_returns(dfs_dict, tickers):
+    """Return ``(returns, last_close)`` of ``tickers`` on their common dates.
+
+    ``returns`` is a ``(days - 1, tickers)`` array of daily log returns.
+    """
+    calendar = align(dfs_dict)
+    close = np.asarray(calendar.matrix(dfs_dict, list(tickers), "Close"), dtype=float)
+    # Missing closes carry the previous price (a zero return); leading gaps
+    # are dropped.
+    close = fill_prices(close)
+    close = close[(close > 0).all(axis=1).argmax():]
+    if len(close) < 2 or not (close[0] > 0).all():
+        raise ValueError("Need at least two common dates to estimate returns.")
+    return np.diff(np.log(close), axis=0), close[-1]
+
+
+def generate_paths(returns, last_close, n_paths, n_bars, rng, method="bootstrap",
+                   block_size=DEFAULT_BLOCK_SIZE):
+    """Return an ``(n_paths, n_bars, tickers)`` array of synthetic closes.
+
+    Every path starts from ``last_close``; its first bar already carries one
+    day of return.
+    """
+    if method == "bootstrap":
+        block_size = max(1, min(block_size, len(returns)))
+        n_blocks = -(-n_bars // block_size)
+        starts = rng.integers(0, len(returns) - block_size + 1, size=(n_paths, n_blocks))
+        days = (starts[:, :, None] + np.arange(block_size)).reshape(n_paths, -1)[:, :n_bars]
+        sampled = returns[days]
+    elif method == "gbm":
+        mean = returns.mean(axis=0)
+        cov = np.atleast_2d(np.cov(returns, rowvar=False))
+        chol = np.linalg.cholesky(cov + np.eye(len(mean)) * 1e-18)
+        noise = rng.standard_normal((n_paths, n_bars, len(mean)))
+        sampled = mean + noise @ chol.T
+    else:
+        raise ValueError(f"Unknown Monte Carlo method '{method}' (expected one of {', '.join(METHODS)}).")
+    return last_close * np.exp(np.cumsum(sampled, axis=1))
+
+
+def path_metrics(histories, years):
+    """Vectorised per-path metrics of an ``(n_paths, n_bars)`` percent history.
+
+    Returns ``(lowest, highest, final, cagr, max_drawdown)`` arrays.
+    """
+    lowest = histories.min(axis=1)
+    highest = histories.max(axis=1)
+    final = histories[:, -1]
+    if years > 0:
+        cagr = (np.power(1.0 + final / 100.0, 1 / years) - 1) * 100.0
+    else:
+        cagr = np.zeros_like(final)
+    wealth = 1.0 + histories / 100.0
+    peaks = np.maximum.accumulate(np.maximum(wealth, 1.0), axis=1)
+    max_drawdown = ((peaks - wealth) / peaks).max(axis=1) * 100.0
+    return lowest, highest, final, cagr, max_drawdown
+
+
+def simulate_paths(prices, index, ticker_info_dict, initial_cash=10000.0):
+    """Run the approach over every path; returns an ``(n_paths, n_bars)`` history."""
+    tickers = list(ticker_info_dict.keys())
+    out = np.empty(prices.shape[:2])
+    if is_rebalancing_approach(ticker_info_dict):
+        for p in range(len(prices)):
+            out[p] = run_rebalancing_approach(prices[p], index, ticker_info_dict, initial_cash)
+        return out
+    for p in range(len(prices)):
+        dfs = {tk: pd.DataFrame({"Close": prices[p, :, j]}, index=index) for j, tk in enumerate(tickers)}
+        pf = HybridMultiFundPortfolio(ticker_info_dict, initial_cash=initial_cash)
+        out[p] = run_hybrid_multi_fund(dfs, pf)[0]
+    return out
+
+
+def check_close_only(ticker_info_dict):
+    """Raise ``ValueError`` for settings that need more than closing prices."""
+    if needs_volume(ticker_info_dict):
+        raise ValueError("Monte Carlo paths have no Volume; remove the volume slippage "
+                         "(slippage=volume:...) from this approach.")
+    ohlc = [tk for tk, info in ticker_info_dict.items() if info.get("execution", "close") == "ohlc"]
+    if ohlc:
+        raise ValueError(f"Monte Carlo paths have closing prices only; execution=ohlc is not "
+                         f"supported ({', '.join(ohlc)}).")
+
+
+def _init_worker(model):
+    global _MODEL
+    _MODEL = model
+
+
+def _run_batch(first_path, n_paths, seed_seq):
+    """Generate and simulate one batch; returns ``(first_path, metrics)``."""
+    m = _MODEL
+    rng = np.random.default_rng(seed_seq)
+    prices = generate_paths(m["returns"], m["last_close"], n_paths, len(m["index"]), rng,
+                            m["method"], m["block_size"])
+    histories = simulate_paths(prices, m["index"], m["ticker_info_dict"], m["initial_cash"])
+    return first_path, path_metrics(histories, m["years"])
+
+
+def _stat(values, rows):
+    lo, hi = int(np.argmin(values)), int(np.argmax(values))
+    return {"min_val": float(values[lo]), "min_start_date": rows[lo][4],
+            "max_val": float(values[hi]), "max_start_date": rows[hi][4],
+            "avg_val": float(values.mean())}
+
+
+def run_monte_carlo(dfs_dict, approach_name, ticker_info_dict, years, n_paths=1000, method="bootstrap",
+                    seed=None, initial_cash=10000.0, block_size=DEFAULT_BLOCK_SIZE,
+                    batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    """Simulate ``approach_name`` over ``n_paths`` synthetic paths of ``years``.
+
+    Returns ``(summary, results_list, final_map)`` like
+    :func:`simulator.run_configured_sweep` (see the module docstring).
+    ``workers=1`` runs all batches in this process.  Approaches that need
+    Volume or OHLC bars raise ``ValueError`` (see :func:`check_close_only`).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown Monte Carlo method '{method}' (expected one of {', '.join(METHODS)}).")
+    check_close_only(ticker_info_dict)
+    returns, last_close = log_returns(dfs_dict, ticker_info_dict.keys())
+    n_bars = max(1, int(round(years * TRADING_DAYS_PER_YEAR)))
+    # Synthetic paths continue on business days after the last real date.
+    last_date = align(dfs_dict).index[-1]
+    index = pd.bdate_range(last_date + pd.offsets.BDay(), periods=n_bars)
+    model = {
+        "returns": returns, "last_close": last_close, "index": index,
+        "ticker_info_dict": ticker_info_dict, "initial_cash": initial_cash,
+        "years": years, "method": method, "block_size": block_size,
+    }
+
+    firsts = list(range(0, n_paths, batch_size))
+    seeds = np.random.SeedSequence(seed).spawn(len(firsts))
+    tasks = [(first, min(batch_size, n_paths - first), ss) for first, ss in zip(firsts, seeds)]
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        _init_worker(model)
+        batches = [_run_batch(*task) for task in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(model,)) as executor:
+            batches = list(executor.map(_run_batch, *zip(*tasks)))
+
+    batches.sort(key=lambda b: b[0])
+    metrics = [np.concatenate([b[1][i] for b in batches]) for i in range(5)]
+    lowest, highest, final, cagr, max_drawdown = metrics
+    results_list = list(zip(lowest.tolist(), highest.tolist(), final.tolist(), cagr.tolist(), range(n_paths)))
+    summary, results_list, final_map = summarize_sweep(approach_name, results_list, years)
+    summary["max_drawdown"] = _stat(max_drawdown, results_list)
+    return summary, results_list, final_map
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    from stock_market_simulator.data.data_fetcher import load_historical_data
+    from stock_market_simulator.main import print_summary
+    from stock_market_simulator.utils.config_parser import parse_config_file
+
+    parser = argparse.ArgumentParser(description="Monte Carlo robustness run of a config's approaches")
+    parser.add_argument("config", help="Config file")
+    parser.add_argument("--paths", type=int, default=1000, help="Synthetic paths per approach")
+    parser.add_argument("--method", choices=METHODS, default="bootstrap")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE,
+                        help="Days per bootstrap block")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible paths")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    years, _, approaches = parse_config_file(args.config)
+    for aname, ticker_info_dict in approaches:
+        try:
+            check_close_only(ticker_info_dict)
+        except ValueError as exc:
+            print(f"Skipping {aname}: {exc}\n")
+            continue
+        dfs_dict = {tk: load_historical_data(tk) for tk in ticker_info_dict}
+        summary, _, _ = run_monte_carlo(dfs_dict, aname, ticker_info_dict, years, args.paths, args.method,
+                                        args.seed, block_size=args.block_size, workers=args.workers)
+        print_summary(aname, summary)
+        dd = summary["max_drawdown"]
+        print(f"max_drawdown  => min:{dd['min_val']:.2f}% max:{dd['max_val']:.2f}% "
+              f"avg:{dd['avg_val']:.2f}%\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Shared-cash multi-asset portfolios with target-weight rebalancing.
+
+:class:`simulation.simulator.HybridMultiFundPortfolio` gives every ticker its
+own cash and strategy; the sub-portfolios never interact.  Allocation
+approaches such as "60/40, rebalanced monthly" need the opposite: one cash
+balance, positions in many tickers and periodic trades back to target weights.
+
+:class:`MultiAssetPortfolio` holds the positions as a NumPy vector so valuing
+and rebalancing are single array operations regardless of the number of
+tickers.  :func:`run_rebalancing_window` only loops over rebalance dates;
+between two rebalances the holdings are constant, so the equity curve and the
+daily expense-ratio fees of the whole segment are computed with matrix
+products.
+
+Cross-sectional approaches (:mod:`strategies.cross_sectional`) use the same
+engine with a different target-weight row for every rebalance date.  Their
+close matrices may contain NaN before a ticker lists or after it delists; for
+valuation such gaps carry the last known price forward.
+
+Trades happen at the close of the rebalance bar (the first bar of the window
+for the initial allocation) and pay half the ticker's ``spread`` on each side,
+like :func:`simulation.execution.execute_orders`.  Expense ratios are charged
+daily on the market value of each position.  Tickers with a cost model
+(:mod:`simulation.costs`) also pay slippage and commissions, computed with the
+models' batched forms over all fills of a rebalance.
+"""
+
+import numpy as np
+
+from stock_market_simulator.simulation.trading_calendar import schedule_positions
+
+# Values accepted by the ``rebalance=`` approach setting besides the schedules
+# understood by :func:`simulation.trading_calendar.schedule_positions`.
+NO_REBALANCE = "none"
+
+
+class MultiAssetPortfolio:
+    """Cash plus a vector of share holdings over a fixed list of tickers."""
+
+    def __init__(self, tickers, initial_cash=10000.0, spreads=None, expense_ratios=None, costs=None):
+        n = len(tickers)
+        self.tickers = list(tickers)
+        self.initial_cash = initial_cash
+        self.cash = float(initial_cash)
+        self.shares = np.zeros(n)
+        # Percentages as in the config file, converted to fractions here.
+        self.half_spread = np.zeros(n) if spreads is None else np.asarray(spreads, dtype=float) / 200.0
+        er = np.zeros(n) if expense_ratios is None else np.asarray(expense_ratios, dtype=float)
+        self.daily_fee_rate = er / 100.0 / 365.0
+        # Tickers sharing a cost model are priced with one batched call.
+        self.cost_groups = None
+        if costs is not None and any(c is not None for c in costs):
+            groups = {}
+            for j, model in enumerate(costs):
+                if model is not None:
+                    groups.setdefault(model, []).append(j)
+            self.cost_groups = [(model, np.asarray(cols)) for model, cols in groups.items()]
+
+    def total_value(self, prices) -> float:
+        """Return cash plus the market value of all holdings at ``prices``."""
+        return self.cash + float(self.shares @ prices)
+
+    def _fill_costs(self, prices, quantities, volumes, side):
+        """Return ``(fill_prices, fees)`` for ``quantities`` under the cost models."""
+        fill = prices.copy()
+        fees = np.zeros_like(prices)
+        vols = np.full_like(prices, np.nan) if volumes is None else volumes
+        for model, cols in self.cost_groups:
+            slip = model.slippage_batch(prices[cols], quantities[cols], vols[cols])
+            fill[cols] = prices[cols] * (1.0 + side * slip)
+            fees[cols] = model.commission_batch(quantities[cols] * fill[cols], quantities[cols])
+        return fill, fees
+
+    def _rebalance_with_costs(self, prices, delta, volumes):
+        sell = np.clip(-delta, 0.0, None)
+        fill, fees = self._fill_costs(prices * (1.0 - self.half_spread), sell, volumes, -1.0)
+        self.cash += float((sell * fill - fees).sum())
+        self.shares -= sell
+
+        buy = np.clip(delta, 0.0, None)
+        base = prices * (1.0 + self.half_spread)
+        fill, fees = self._fill_costs(base, buy, volumes, 1.0)
+        notional = float((buy * fill).sum())
+        total_cost = notional + float(fees.sum())
+        if total_cost > self.cash:
+            # Scale the buys to what is left after the fees of the full-size
+            # orders; smaller orders pay no more slippage or commission, so
+            # the result fits in the cash.
+            budget = self.cash - float(fees.sum())
+            if budget <= 0.0 or notional <= 0.0:
+                return
+            buy = buy * (budget / notional)
+            fill, fees = self._fill_costs(base, buy, volumes, 1.0)
+            total_cost = float((buy * fill + fees).sum())
+        self.shares += buy
+        self.cash -= total_cost
+
+    def rebalance(self, prices, target_weights, volumes=None):
+        """Trade towards ``target_weights`` (fractions of total value).
+
+        Sells are executed first; buys are scaled down proportionally if the
+        spread would otherwise push cash below zero.  Weights summing to less
+        than one leave the remainder in cash.  ``volumes`` (the bar's volume
+        per ticker) feeds volume-dependent slippage.
+        """
+        value = self.total_value(prices)
+        # Untradeable tickers (no price yet) can only be targeted at zero.
+        target_shares = np.divide(target_weights * value, prices,
+                                  out=np.zeros_like(self.shares), where=prices > 0)
+        delta = target_shares - self.shares
+        if self.cost_groups is not None:
+            self._rebalance_with_costs(prices, delta, volumes)
+            return
+
+        sell = np.clip(-delta, 0.0, None)
+        self.cash += float((sell * prices * (1.0 - self.half_spread)).sum())
+        self.shares -= sell
+
+        buy = np.clip(delta, 0.0, None)
+        cost = buy * prices * (1.0 + self.half_spread)
+        total_cost = float(cost.sum())
+        if total_cost > self.cash:
+            if self.cash <= 0.0:
+                return
+            buy *= self.cash / total_cost
+            total_cost = self.cash
+        self.shares += buy
+        self.cash -= total_cost
+
+
+def rebalance_positions(index, schedule) -> np.ndarray:
+    """Bars of ``index`` on which to rebalance; always includes bar 0."""
+    if schedule is None or str(schedule).lower() == NO_REBALANCE:
+        return np.zeros(1, dtype=np.int64)
+    positions = schedule_positions(index, schedule)
+    if len(positions) == 0 or positions[0] != 0:
+        positions = np.concatenate(([0], positions))
+    return positions
+
+
+def fill_prices(close) -> np.ndarray:
+    """Carry the last valid price forward; bars before the first price are 0."""
+    close = np.asarray(close, dtype=float)
+    missing = np.isnan(close)
+    if not missing.any():
+        return close
+    rows = np.where(missing, 0, np.arange(close.shape[0])[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = np.take_along_axis(close, rows, axis=0)
+    return np.nan_to_num(filled, nan=0.0)
+
+
+def run_rebalancing_window(close, rebalance_at, weights, initial_cash=10000.0,
+                           spreads=None, expense_ratios=None, costs=None, volume=None):
+    """Simulate a rebalanced portfolio over one window.
+
+    Parameters
+    ----------
+    close:
+        ``(bars, tickers)`` array of closing prices.
+    rebalance_at:
+        Sorted bar offsets at which to trade back to ``weights``; must start
+        with 0.
+    weights:
+        Target weights per ticker, or one row of weights per entry of
+        ``rebalance_at``.
+    costs, volume:
+        Optional cost model per ticker and ``(bars, tickers)`` volume array.
+
+    Returns
+    -------
+    numpy.ndarray
+        Percent return relative to ``initial_cash`` for every bar.
+    """
+    close = fill_prices(close)
+    weights = np.asarray(weights, dtype=float)
+    n_bars = close.shape[0]
+    pf = MultiAssetPortfolio(range(close.shape[1]), initial_cash, spreads, expense_ratios, costs)
+    values = np.empty(n_bars)
+
+    bounds = [int(p) for p in rebalance_at if p < n_bars] + [n_bars]
+    per_date = weights.ndim == 2
+    for k, (a, b) in enumerate(zip(bounds[:-1], bounds[1:])):
+        pf.rebalance(close[a], weights[k] if per_date else weights,
+                     None if volume is None else volume[a])
+        segment = close[a:b]
+        # Holdings are fixed until the next rebalance: value and fees for the
+        # whole segment are matrix products.
+        holdings = segment * pf.shares
+        cash_path = pf.cash - np.cumsum(holdings @ pf.daily_fee_rate)
+        values[a:b] = cash_path + holdings.sum(axis=1)
+        pf.cash = float(cash_path[-1])
+
+    return (values - initial_cash) / initial_cash * 100.0
+
+
+def is_rebalancing_approach(ticker_info_dict) -> bool:
+    """True when the approach was configured with ``rebalance=``."""
+    return any("rebalance" in info for info in ticker_info_dict.values())
+
+
+def is_cross_sectional_approach(ticker_info_dict) -> bool:
+    """True when the approach was configured with ``cross_sectional=``."""
+    return any("cross_sectional" in info for info in ticker_info_dict.values())
+
+
+def run_rebalancing_approach(close, index, ticker_info_dict, initial_cash=10000.0,
+                             start=0, end=None, filled=None, volume=None):
+    """Run :func:`run_rebalancing_window` using settings from the config.
+
+    ``close`` columns must follow the order of ``ticker_info_dict``.  The
+    window simulated is ``index[start:end]``; rows before ``start`` are only
+    used as history by cross-sectional strategies.  Sweeps over many windows
+    can pass ``filled=fill_prices(close)`` once instead of refilling per window.
+    ``volume`` (aligned with ``close``) is only needed for volume slippage.
+    """
+    infos = list(ticker_info_dict.values())
+    end = len(index) if end is None else end
+    schedule = infos[0].get("rebalance", NO_REBALANCE)
+    rebalance_at = rebalance_positions(index[start:end], schedule)
+    strategy = infos[0].get("cross_sectional")
+    if strategy is not None:
+        weights = strategy.target_weights(close, rebalance_at + start)
+    else:
+        weights = [info.get("weight", 1.0 / len(infos)) for info in infos]
+    prices = close if filled is None else filled
+    return run_rebalancing_window(
+        prices[start:end],
+        rebalance_at,
+        weights,
+        initial_cash,
+        spreads=[info.get("spread", 0.0) for info in infos],
+        expense_ratios=[info.get("expense_ratio", 0.0) for info in infos],
+        costs=[info.get("costs") for info in infos],
+        volume=None if volume is None else volume[start:end],
+    )
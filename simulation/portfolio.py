@@ -44,6 +44,12 @@ class Portfolio:
         # ``strategy_state`` is a free-form dictionary used by strategies to
         # keep their own state without subclassing Portfolio.
         self.strategy_state = {}
+        # Optional :class:`simulation.costs.CostModel`; ``bar_volume`` is the
+        # current bar's volume for volume-dependent slippage.
+        self.costs = None
+        self.bar_volume = None
+        # Optional :class:`simulation.ledger.TradeLedger` receiving every fill.
+        self.ledger = None
 
     def total_value(self, price: float) -> float:
         """Return the market value of the portfolio at ``price``."""
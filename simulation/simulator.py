@@ -9,14 +9,42 @@ This module contains two layers:
 * High-level functions such as :func:`run_configured_sweep` which orchestrate
   multiple subrange simulations and compute summary statistics.
 
+Approaches configured with ``rebalance=`` share one cash balance across their
+tickers and are simulated by :mod:`simulation.multi_asset` instead of the
+per-ticker sub-portfolios; :func:`simulate_window` dispatches between the two.
+Cross-sectional approaches are rebalancing approaches whose weights come from
+a ranking strategy; their sweeps run on the union of the tickers' dates.
+
 The design aims to stay agnostic of individual strategies; they interact with
 their sub-portfolios via the shared :class:`Portfolio` and :mod:`execution`
 APIs.
 """
 
+import numpy as np
 import pandas as pd
 from stock_market_simulator.simulation.portfolio import Portfolio
-from stock_market_simulator.simulation.execution import execute_orders
+from stock_market_simulator.simulation.execution import (
+    execute_orders,
+    execute_orders_on_path,
+    window_paths,
+)
+from stock_market_simulator.simulation.alignment import align, union_matrix
+from stock_market_simulator.simulation.costs import needs_volume
+from stock_market_simulator.simulation.distributed import DEFAULT_TIMEOUT as SPOOL_TIMEOUT
+from stock_market_simulator.simulation.ledger import TradeLedger
+from stock_market_simulator.simulation.legs import LegCache, leg_keys, window_key
+from stock_market_simulator.simulation.multi_asset import (
+    is_cross_sectional_approach,
+    fill_prices,
+    is_rebalancing_approach,
+    run_rebalancing_approach,
+)
+from stock_market_simulator.simulation.trading_calendar import (
+    period_start_positions,
+    schedule_positions,
+    window_offsets,
+)
+from stock_market_simulator.strategies.base_strategies import STRATEGY_PARAMS
 
 
 class HybridMultiFundPortfolio:
@@ -27,12 +55,17 @@ class HybridMultiFundPortfolio:
     returns which the simulator later returns to callers.
     """
 
-    def __init__(self, ticker_info_dict: dict, initial_cash=10000.0):
+    def __init__(self, ticker_info_dict: dict, initial_cash=10000.0, sub_cash=None, record_trades=False):
         # ``ticker_info_dict`` maps ticker -> {"strategy": func, "spread": pct, ...}
+        # ``sub_cash`` overrides the equal split, e.g. for a subset of an
+        # approach's tickers that keep their slice of the whole approach.
+        # ``record_trades`` attaches a :class:`ledger.TradeLedger` to every
+        # sub-portfolio (see :attr:`ledgers`).
         self.initial_cash = initial_cash
         self.tickers = list(ticker_info_dict.keys())
         self.sub_portfolios = []
-        sub_cash = initial_cash / len(self.tickers)
+        if sub_cash is None:
+            sub_cash = initial_cash / len(self.tickers)
         self.strategies_for_tickers = {}
         for tkSym in self.tickers:
             pf = Portfolio(sub_cash)
@@ -40,20 +73,28 @@ class HybridMultiFundPortfolio:
             pf.spread = ticker_info_dict[tkSym].get("spread", 0.0)
             # Optional yearly expense ratio percentage.
             pf.expense_ratio = ticker_info_dict[tkSym].get("expense_ratio", 0.0)
+            # "close" or "ohlc" order execution (see :mod:`execution`).
+            pf.execution = ticker_info_dict[tkSym].get("execution", "close")
+            # Optional slippage/commission model (see :mod:`costs`).
+            pf.costs = ticker_info_dict[tkSym].get("costs")
+            if record_trades:
+                pf.ledger = TradeLedger()
             # If strategy is advanced_daytrading, attach advanced parameters (if provided) to the portfolio.
             if ticker_info_dict[tkSym]["strategy"].__name__ == "advanced_daytrading":
-                advanced_params = {}
-                if "trailing_stop_pct" in ticker_info_dict[tkSym]:
-                    advanced_params["trailing_stop_pct"] = ticker_info_dict[tkSym]["trailing_stop_pct"]
-                if "limit_buy_discount_pct" in ticker_info_dict[tkSym]:
-                    advanced_params["limit_buy_discount_pct"] = ticker_info_dict[tkSym]["limit_buy_discount_pct"]
-                if "pending_limit_days" in ticker_info_dict[tkSym]:
-                    advanced_params["pending_limit_days"] = ticker_info_dict[tkSym]["pending_limit_days"]
-                pf.advanced_params = advanced_params
+                pf.advanced_params = {
+                    key: ticker_info_dict[tkSym][key]
+                    for key in STRATEGY_PARAMS["advanced_daytrading"]
+                    if key in ticker_info_dict[tkSym]
+                }
             self.sub_portfolios.append((tkSym, pf))
             self.strategies_for_tickers[tkSym] = ticker_info_dict[tkSym]["strategy"]
         self.history = []
 
+    @property
+    def ledgers(self):
+        """``{ticker: TradeLedger}`` of sub-portfolios that record trades."""
+        return {sym: pf.ledger for sym, pf in self.sub_portfolios if pf.ledger is not None}
+
     def total_value(self, day_prices: dict) -> float:
         """Compute total portfolio value given a dict of day prices."""
 
@@ -63,16 +104,61 @@ class HybridMultiFundPortfolio:
             tv += pf.total_value(px)
         return tv
 
-def run_hybrid_multi_fund(dfs_dict, hybrid_pf: HybridMultiFundPortfolio):
+def _window_column(df, index, column='Close'):
+    """Return ``df[column]`` at each date of ``index`` as a float array.
+
+    Duplicate dates resolve to their first row, like ``.loc[dt].iloc[0]``.
+    """
+    values = df[column]
+    if index.is_unique and values.index.equals(index):
+        return values.to_numpy(dtype=float)
+    if values.index.is_unique:
+        positions = values.index.get_indexer(index)
+        if (positions < 0).any():
+            raise KeyError(f"{column} prices missing for some simulation dates")
+    else:
+        positions = values.index.searchsorted(index, side='left')
+    return values.to_numpy(dtype=float)[positions]
+
+def _require_volume(dfs_dict, tickers):
+    for tk in tickers:
+        if 'Volume' not in dfs_dict[tk].columns:
+            raise ValueError(f"Volume slippage needs a Volume column for {tk}.")
+
+def _window_paths(df, index, close, spread):
+    """Return per-bar price paths for OHLC execution (see :func:`window_paths`).
+
+    Missing columns or NaN values fall back to the close, and High/Low are
+    widened to contain Open and Close so every bar is self-consistent.
+    """
+    close = np.asarray(close, dtype=float)
+    cols = []
+    for column in ('Open', 'High', 'Low'):
+        arr = _window_column(df, index, column) if column in df.columns else close
+        cols.append(np.where(np.isnan(arr), close, arr))
+    open_, high, low = cols
+    high = np.maximum(high, np.maximum(open_, close))
+    low = np.minimum(low, np.minimum(open_, close))
+    return window_paths(open_, high, low, close, spread)
+
+def run_hybrid_multi_fund(dfs_dict, hybrid_pf: HybridMultiFundPortfolio, ohlc_paths=None):
     """Run a simulation over the provided historical data.
 
     Parameters
     ----------
     dfs_dict:
-        Mapping ticker -> DataFrame of price data.
+        Mapping ticker -> DataFrame of price data, or an iterable of
+        ``(timestamp, {ticker: (open, high, low, close, volume)})`` rows such as
+        :func:`data.bar_stream.stream_daily_bars`.  Rows are consumed one at a
+        time so memory stays bounded by the strategies' own state.
     hybrid_pf:
         Instance of :class:`HybridMultiFundPortfolio` describing strategies and
         initial allocations.
+    ohlc_paths:
+        Optional precomputed ``{ticker: (buy_paths, sell_paths)}`` for tickers
+        in OHLC execution mode, as built by :func:`_window_paths` for exactly
+        this window.  Sweeps compute them once for the whole calendar and
+        pass slices; missing entries are built here.
 
     Returns
     -------
@@ -82,37 +168,164 @@ def run_hybrid_multi_fund(dfs_dict, hybrid_pf: HybridMultiFundPortfolio):
         :class:`pandas.DatetimeIndex` of the simulation dates.
     """
 
-    tickers = hybrid_pf.tickers
-    main_tk = tickers[0]
-    final_index = dfs_dict[main_tk].index
-    hybrid_pf.history = []
+    if not isinstance(dfs_dict, dict):
+        return _run_bar_stream(dfs_dict, hybrid_pf)
+
+    values, final_index = run_sub_portfolios(dfs_dict, hybrid_pf, ohlc_paths)
+    hybrid_pf.history = combine_values(values, hybrid_pf.initial_cash)
+    return hybrid_pf.history, final_index
 
-    for day_i, dt in enumerate(final_index):
-        day_prices = {}
-        for tkSym in tickers:
-            val = dfs_dict[tkSym].loc[dt, 'Close']
-            if isinstance(val, pd.Series):
-                val = val.iloc[0]
-            cprice = float(val)
-            day_prices[tkSym] = cprice
-
-        # Execute pending orders and run strategy for each sub-portfolio.
-        for (sym, pf) in hybrid_pf.sub_portfolios:
-            cur_price = day_prices[sym]
-            execute_orders(cur_price, pf, day_i)
-            strategy_func = hybrid_pf.strategies_for_tickers[sym]
+def combine_values(values, initial_cash):
+    """Return the percent history of the summed per-bar ``values`` arrays.
+
+    Summed in the given order starting from zero, so the result is identical
+    to valuing all sub-portfolios together bar by bar.
+    """
+    tv = np.zeros(len(values[0]) if values else 0)
+    for v in values:
+        tv += v
+    return (((tv - initial_cash) / initial_cash) * 100).tolist()
+
+def run_sub_portfolios(dfs_dict, hybrid_pf: HybridMultiFundPortfolio, ohlc_paths=None):
+    """Simulate every sub-portfolio of ``hybrid_pf`` over ``dfs_dict``.
+
+    Sub-portfolios never interact, so each one runs through the whole window
+    on its own.  Returns ``(values, final_index)`` where ``values`` holds one
+    array of per-bar market values (after the day's fee) per sub-portfolio,
+    in ``hybrid_pf.sub_portfolios`` order.
+    """
+    tickers = hybrid_pf.tickers
+    final_index = dfs_dict[tickers[0]].index
+    timestamps = None
+
+    values = []
+    for (sym, pf) in hybrid_pf.sub_portfolios:
+        close = _window_column(dfs_dict[sym], final_index)
+
+        # Sub-portfolios in OHLC execution mode get their intrabar paths
+        # prepared for the whole window up front.
+        sym_paths = None
+        if getattr(pf, "execution", "close") == "ohlc":
+            sym_paths = (ohlc_paths or {}).get(sym)
+            if sym_paths is None:
+                sym_paths = _window_paths(dfs_dict[sym], final_index, close, getattr(pf, "spread", 0.0))
+
+        # Bar volumes for cost models that need them.
+        volume = None
+        if pf.costs is not None and pf.costs.needs_volume:
+            _require_volume(dfs_dict, [sym])
+            volume = _window_column(dfs_dict[sym], final_index, 'Volume').tolist()
+
+        # Signal-based strategies (see :mod:`strategies.signals`) evaluate
+        # their conditions for the whole window up front and are only called
+        # on bars that carry a signal.  Only per-bar strategies receive the
+        # date, so Timestamps are built at most once and only for them.
+        strategy = hybrid_pf.strategies_for_tickers[sym]
+        signals = None
+        if hasattr(strategy, "on_window"):
+            signals = strategy.on_window(close).tolist()
+            dates = [None] * len(final_index)
+        else:
+            if timestamps is None:
+                timestamps = list(final_index)
+            dates = timestamps
+
+        values.append(_run_sub_portfolio(pf, strategy, close.tolist(), dates, signals, sym_paths, volume))
+
+    return values, final_index
+
+def _run_sub_portfolio(pf, strategy, closes, dates, signals, paths, volume):
+    """Run one sub-portfolio bar by bar; returns its per-bar values."""
+    values = np.empty(len(closes))
+    expense_frac = pf.expense_ratio / 100.0
+    for day_i, dt in enumerate(dates):
+        cur_price = closes[day_i]
+        # Nothing to execute without pending orders.
+        if pf.orders:
+            if volume is not None:
+                pf.bar_volume = volume[day_i]
+            if paths is None:
+                execute_orders(cur_price, pf, day_i)
+            else:
+                execute_orders_on_path(pf, paths[0][day_i], paths[1][day_i], day_i)
+        if signals is None:
             # Strategy functions are responsible for adding orders to the
             # portfolio; they operate on their own sub-portfolio only.
-            strategy_func(pf, dt, cur_price, day_i)
-            # Deduct daily expense ratio fee to simulate management costs.
-            daily_fee = pf.total_value(cur_price) * (pf.expense_ratio / 100.0) / 365.0
-            pf.cash -= daily_fee
+            strategy(pf, dt, cur_price, day_i)
+        elif signals[day_i]:
+            strategy.on_signal(pf, signals[day_i], cur_price, day_i)
+        # Deduct daily expense ratio fee to simulate management costs.  The
+        # holding is valued once and reused for the fee and the bar's value
+        # (the same arithmetic as two ``total_value`` calls).
+        held = pf.shares * cur_price
+        cash = pf.cash - (pf.cash + held) * expense_frac / 365.0
+        pf.cash = cash
+        values[day_i] = cash + held
+    return values
+
+def _run_bar_stream(rows, hybrid_pf: HybridMultiFundPortfolio):
+    """Streaming form of :func:`run_hybrid_multi_fund`.
+
+    Whole-window signals are not available here, so every strategy runs per
+    bar (signal strategies are callable with the per-bar signature and give
+    identical orders).  OHLC-mode sub-portfolios execute against each row's
+    bar.  Sub-portfolios with volume slippage read the bar's fifth field,
+    the volume.
+    """
+    hybrid_pf.history = []
+    dates = []
+    expense_fracs = [pf.expense_ratio / 100.0 for _, pf in hybrid_pf.sub_portfolios]
+    use_volume = [pf.costs is not None and pf.costs.needs_volume for _, pf in hybrid_pf.sub_portfolios]
+    for day_i, (dt, bars) in enumerate(rows):
+        tv = 0.0
+        for (sym, pf), expense_frac, with_volume in zip(hybrid_pf.sub_portfolios, expense_fracs, use_volume):
+            bar = bars[sym]
+            cur_price = bar[3]
+            if pf.orders:
+                if with_volume:
+                    if len(bar) < 5:
+                        raise ValueError(f"Volume slippage needs a Volume column for {sym}.")
+                    pf.bar_volume = bar[4]
+                if getattr(pf, "execution", "close") == "ohlc":
+                    execute_orders(cur_price, pf, day_i, bar=bar[:4])
+                else:
+                    execute_orders(cur_price, pf, day_i)
+            hybrid_pf.strategies_for_tickers[sym](pf, dt, cur_price, day_i)
+            # One valuation per bar for the fee and the total.
+            held = pf.shares * cur_price
+            pf.cash = pf.cash - (pf.cash + held) * expense_frac / 365.0
+            tv += pf.cash + held
 
-        tv = hybrid_pf.total_value(day_prices)
         pct = ((tv - hybrid_pf.initial_cash) / hybrid_pf.initial_cash) * 100
         hybrid_pf.history.append(pct)
+        dates.append(dt)
 
-    return hybrid_pf.history, final_index
+    return hybrid_pf.history, pd.DatetimeIndex(dates)
+
+def simulate_window(sim_dfs, ticker_info_dict, initial_cash=10000.0, trades=None):
+    """Simulate one aligned window for any approach type.
+
+    ``sim_dfs`` must already be restricted to the common dates of the window.
+    Returns ``(history, index)`` like :func:`run_hybrid_multi_fund`.  A dict
+    passed as ``trades`` receives ``{ticker: TradeLedger}`` of the window's
+    fills (empty for rebalancing approaches, which do not use orders).
+    """
+    if is_rebalancing_approach(ticker_info_dict):
+        tickers = list(ticker_info_dict.keys())
+        index = sim_dfs[tickers[0]].index
+        close = np.column_stack([sim_dfs[tk]['Close'].to_numpy(dtype=float) for tk in tickers])
+        volume = None
+        if needs_volume(ticker_info_dict):
+            _require_volume(sim_dfs, tickers)
+            volume = np.column_stack([sim_dfs[tk]['Volume'].to_numpy(dtype=float) for tk in tickers])
+        history = run_rebalancing_approach(close, index, ticker_info_dict, initial_cash, volume=volume)
+        return history.tolist(), index
+    pf = HybridMultiFundPortfolio(ticker_info_dict, initial_cash=initial_cash,
+                                  record_trades=trades is not None)
+    result = run_hybrid_multi_fund(sim_dfs, pf)
+    if trades is not None:
+        trades.update(pf.ledgers)
+    return result
 
 def intersect_all_indexes(dfs_dict):
     """Intersect indexes among all DataFrames to ensure alignment."""
@@ -128,64 +341,294 @@ def intersect_all_indexes(dfs_dict):
 def find_monthly_starts_first_open(common_idx):
     """For a given DateTimeIndex, find the first open date of each month."""
 
-    by_ym = {}
-    for dt in common_idx:
-        ym = (dt.year, dt.month)
-        if ym not in by_ym:
-            by_ym[ym] = dt
-    keys = sorted(by_ym.keys())
-    monthly_starts = [by_ym[k] for k in keys]
-    return monthly_starts
+    if not common_idx.is_monotonic_increasing:
+        common_idx = common_idx.sort_values()
+    positions = period_start_positions(common_idx, "monthly")
+    return list(common_idx[positions])
 
-def run_configured_sweep(dfs_dict, approach_name, ticker_info_dict, years, stepsize, initial_cash=10000.0):
+def run_configured_sweep(dfs_dict, approach_name, ticker_info_dict, years, stepsize, initial_cash=10000.0,
+                         schedule="monthly", histories=None, trades=None, spool_dir=None,
+                         spool_timeout=SPOOL_TIMEOUT):
     """Run multiple subrange simulations and compute metrics.
 
     The config file defines an "approach" as a combination of strategies and
     tickers.  For robust statistics we simulate multiple overlapping windows of
     length ``years`` starting at monthly intervals (controlled by ``stepsize``).
+    ``schedule`` selects another start calendar (see
+    :mod:`simulation.trading_calendar`), e.g. ``"weekly"`` or ``"bars:21"``.
     ``results_list`` contains tuples ``(lowest_valley, highest_peak, final_return,
     cagr, start_date)`` for each run and is later summarised into a dictionary of
-    metrics.
+    metrics.  Pass a list as ``histories`` to also collect each run's daily
+    percent history, and one as ``trades`` for each run's trade ledgers (see
+    :func:`run_sweep_windows`).  With ``spool_dir`` the windows are simulated
+    by the workers of that spool (see :mod:`simulation.distributed`);
+    ``TimeoutError`` is raised when no worker runs any of them for
+    ``spool_timeout`` seconds (None waits forever).
     """
-
-    common_idx = intersect_all_indexes(dfs_dict)
+    if spool_dir is not None:
+        from stock_market_simulator.simulation.distributed import spool_sweep_windows
+
+        results_list = spool_sweep_windows(spool_dir, dfs_dict, approach_name, ticker_info_dict, years,
+                                           stepsize, initial_cash, schedule, histories, trades,
+                                           timeout=spool_timeout)
+    else:
+        results_list = run_sweep_windows(dfs_dict, approach_name, ticker_info_dict, years, stepsize,
+                                         initial_cash, schedule, histories=histories, trades=trades)
+    return summarize_sweep(approach_name, results_list, years)
+
+def _sweep_calendar(dfs_dict, approach_name, ticker_info_dict):
+    """Return ``(common_idx, close, filled, calendar)`` for a sweep."""
+    close = filled = calendar = None
+    if is_cross_sectional_approach(ticker_info_dict):
+        common_idx, close = union_matrix(dfs_dict, list(ticker_info_dict.keys()), 'Close')
+        filled = fill_prices(close)
+    else:
+        calendar = align(dfs_dict)
+        common_idx = calendar.index
+        if is_rebalancing_approach(ticker_info_dict):
+            close = calendar.matrix(dfs_dict, list(ticker_info_dict.keys()), 'Close')
     if common_idx.empty:
         raise ValueError(f"No intersection for approach {approach_name}.")
+    return common_idx, close, filled, calendar
 
-    all_monthly_starts = find_monthly_starts_first_open(common_idx)
-    selected_starts = all_monthly_starts[::stepsize]
-
-    delta_days = pd.Timedelta(days=years * 365)
-    results_list = []
-    final_map = {}
+class SweepPlan:
+    """Aligned arrays and window offsets of one approach's sweep.
 
-    for start_date in selected_starts:
-        end_date = start_date + delta_days
-        if end_date > common_idx[-1]:
-            continue
+    Everything that does not depend on the window is computed once here:
+    the common calendar, the close matrix of rebalancing approaches and the
+    window offsets.  Window ``k`` covers ``common_idx[starts[k]:ends[k]]``.
+    Intrabar paths for OHLC execution are built on the first
+    :meth:`simulate` that needs them.
+    """
 
-        final_subindex = common_idx[(common_idx >= start_date) & (common_idx < end_date)]
-        if len(final_subindex) == 0:
-            continue
+    def __init__(self, dfs_dict, approach_name, ticker_info_dict, years, stepsize, schedule="monthly"):
+        self.dfs_dict = dfs_dict
+        self.ticker_info_dict = ticker_info_dict
+        self.rebalancing = is_rebalancing_approach(ticker_info_dict)
+        self.common_idx, self.close, self.filled, self.calendar = _sweep_calendar(
+            dfs_dict, approach_name, ticker_info_dict
+        )
+        # Window offsets come straight from the calendar as integer positions.
+        start_positions = schedule_positions(self.common_idx, schedule, stepsize)
+        self.starts, self.ends = window_offsets(self.common_idx, start_positions, years)
+        self._ohlc_full = None
+        # Volume matrix for rebalancing approaches with volume slippage.
+        self.volume = None
+        if self.rebalancing and needs_volume(ticker_info_dict):
+            tickers = list(ticker_info_dict.keys())
+            _require_volume(dfs_dict, tickers)
+            if self.calendar is None:
+                self.volume = union_matrix(dfs_dict, tickers, 'Volume')[1]
+            else:
+                self.volume = self.calendar.matrix(dfs_dict, tickers, 'Volume')
+
+    def __len__(self):
+        return len(self.starts)
+
+    def _ohlc_paths(self):
+        # Intrabar paths depend only on the bar, so they are built once for the
+        # whole calendar and each window gets a slice.
+        if self._ohlc_full is None:
+            self._ohlc_full = {}
+            for tk, info in self.ticker_info_dict.items():
+                if info.get("execution", "close") == "ohlc":
+                    df = self.dfs_dict[tk]
+                    self._ohlc_full[tk] = _window_paths(
+                        df, self.common_idx, _window_column(df, self.common_idx),
+                        info.get("spread", 0.0),
+                    )
+        return self._ohlc_full
+
+    def simulate(self, i0, i1, initial_cash=10000.0, legs=None, trades=None):
+        """Return the percent history (a list) of ``common_idx[i0:i1]``.
+
+        With a :class:`legs.LegCache` the sub-portfolios are looked up there
+        and only the missing ones are simulated (and stored).  A dict passed
+        as ``trades`` receives the window's ``{ticker: TradeLedger}``; legs
+        are then simulated afresh since the cache keeps no fills.
+        """
+        if legs is not None and trades is None and not self.rebalancing:
+            return self._simulate_legs(i0, i1, initial_cash, legs)
+        if self.rebalancing:
+            return run_rebalancing_approach(
+                self.close, self.common_idx, self.ticker_info_dict, initial_cash,
+                start=i0, end=i1, filled=self.filled, volume=self.volume,
+            ).tolist()
+        # Every common date exists in each ticker's frame, so selecting rows
+        # by the precomputed positions replaces masking + ``reindex``.
+        sim_dfs = self.calendar.take(self.dfs_dict, i0, i1)
+        pf = HybridMultiFundPortfolio(self.ticker_info_dict, initial_cash=initial_cash,
+                                      record_trades=trades is not None)
+        ohlc_paths = {tk: (b[i0:i1], s[i0:i1]) for tk, (b, s) in self._ohlc_paths().items()}
+        hist, _ = run_hybrid_multi_fund(sim_dfs, pf, ohlc_paths)
+        if trades is not None:
+            trades.update(pf.ledgers)
+        return hist
+
+    def _simulate_legs(self, i0, i1, initial_cash, legs):
+        window = window_key(self.common_idx, i0, i1)
+        keys = [(key, window) for key in leg_keys(self.ticker_info_dict, initial_cash)]
+        values = [legs.get(key) for key in keys]
+        missing = {tk: info for (tk, info), v in zip(self.ticker_info_dict.items(), values) if v is None}
+        if missing:
+            # One portfolio of the missing legs, each with the slice of cash
+            # it has in the whole approach.
+            sub_cash = initial_cash / len(self.ticker_info_dict)
+            pf = HybridMultiFundPortfolio(missing, initial_cash, sub_cash=sub_cash)
+            sim_dfs = self.calendar.take({tk: self.dfs_dict[tk] for tk in missing}, i0, i1)
+            ohlc_paths = {tk: (b[i0:i1], s[i0:i1]) for tk, (b, s) in self._ohlc_paths().items()
+                          if tk in missing}
+            fresh = iter(run_sub_portfolios(sim_dfs, pf, ohlc_paths)[0])
+            for j, key in enumerate(keys):
+                if values[j] is None:
+                    values[j] = next(fresh)
+                    legs.put(key, values[j])
+        return combine_values(values, initial_cash)
+
+def sweep_window_count(dfs_dict, approach_name, ticker_info_dict, years, stepsize, schedule="monthly"):
+    """Number of windows :func:`run_configured_sweep` would simulate.
+
+    Lets schedulers split one sweep into ``window_slice`` chunks.
+    """
+    return len(SweepPlan(dfs_dict, approach_name, ticker_info_dict, years, stepsize, schedule))
+
+def run_sweep_windows(dfs_dict, approach_name, ticker_info_dict, years, stepsize, initial_cash=10000.0,
+                      schedule="monthly", window_slice=None, histories=None, trades=None):
+    """Simulate the windows of a sweep and return their ``results_list`` rows.
+
+    ``window_slice`` (a :class:`slice` over the sweep's windows) restricts the
+    run to part of the sweep; concatenating the rows of consecutive slices
+    gives the rows of the whole sweep.  When ``histories`` is a list, the
+    percent history of every returned row is appended to it; when ``trades``
+    is a list, the row's ``{ticker: TradeLedger}`` (see
+    :mod:`simulation.ledger`).
+    """
 
-        sim_dfs = {}
-        for tk, df_ticker in dfs_dict.items():
-            subdf = df_ticker.loc[(df_ticker.index >= start_date) & (df_ticker.index < end_date)]
-            subdf = subdf.reindex(final_subindex, method='ffill')
-            sim_dfs[tk] = subdf
+    plan = SweepPlan(dfs_dict, approach_name, ticker_info_dict, years, stepsize, schedule)
+    window_starts, window_ends = plan.starts, plan.ends
+    if window_slice is not None:
+        window_starts, window_ends = window_starts[window_slice], window_ends[window_slice]
 
-        pf = HybridMultiFundPortfolio(ticker_info_dict, initial_cash=initial_cash)
-        hist, _ = run_hybrid_multi_fund(sim_dfs, pf)
+    results_list = []
+    for i0, i1 in zip(window_starts.tolist(), window_ends.tolist()):
+        window_trades = {} if trades is not None else None
+        hist = plan.simulate(i0, i1, initial_cash, trades=window_trades)
         if not hist:
             continue
-
-        lv = min(hist)
-        hv = max(hist)
-        fr = hist[-1]
-        total_growth = 1.0 + (fr / 100.0)
-        cagr = (total_growth ** (1 / years) - 1) * 100.0 if years > 0 else 0.0
-        results_list.append((lv, hv, fr, cagr, start_date))
-        final_map[start_date] = fr
+        results_list.append(_result_row(hist, years, plan.common_idx[i0]))
+        if histories is not None:
+            histories.append(hist)
+        if trades is not None:
+            trades.append(window_trades)
+
+    return results_list
+
+def _result_row(hist, years, start_date):
+    """``(lowest_valley, highest_peak, final_return, cagr, start_date)`` of a window."""
+    lv = min(hist)
+    hv = max(hist)
+    fr = hist[-1]
+    total_growth = 1.0 + (fr / 100.0)
+    cagr = (total_growth ** (1 / years) - 1) * 100.0 if years > 0 else 0.0
+    return (lv, hv, fr, cagr, start_date)
+
+def run_shared_windows(dfs_dict, approaches, years, stepsize, initial_cash=10000.0, schedule="monthly",
+                       histories=None, legs=None, part=None):
+    """Simulate the windows of several approaches, simulating shared legs once.
+
+    ``approaches`` is a list of ``(name, ticker_info_dict)`` and ``dfs_dict``
+    holds every ticker they use; each approach still gets the calendar of
+    its own tickers.  Windows of all approaches are visited in start-date
+    order, and sub-portfolios with equal settings, cash and window dates are
+    taken from a :class:`legs.LegCache` (see :mod:`simulation.legs`).
+    Rebalancing approaches run as usual.
+
+    ``part=(i, n)`` restricts the run to the ``i``-th of ``n`` consecutive
+    runs of the group's distinct start dates, so a group can be spread over
+    several processes; concatenating the rows of parts ``0..n-1`` gives the
+    rows of the whole sweep.
+
+    Returns ``{name: results_list}`` with :func:`run_sweep_windows` rows; an
+    approach that fails gets its exception as the value instead, so the
+    others still complete.  A dict passed as ``histories`` receives each
+    approach's list of window histories.
+    """
+    legs = LegCache() if legs is None else legs
+    plans = {}
+    outcome = {}
+    for name, ticker_info_dict in approaches:
+        try:
+            plans[name] = SweepPlan({tk: dfs_dict[tk] for tk in ticker_info_dict}, name,
+                                    ticker_info_dict, years, stepsize, schedule)
+        except Exception as e:
+            outcome[name] = e
+
+    # Window-major order: all approaches starting on a date run back to back
+    # while their legs are cached; later dates never need the entries again.
+    visits = sorted(
+        ((plan.common_idx[i0], name, i0, i1)
+         for name, plan in plans.items()
+         for i0, i1 in zip(plan.starts.tolist(), plan.ends.tolist())),
+        key=lambda v: v[0],
+    )
+    if part is not None:
+        i, n = part
+        dates = sorted({v[0] for v in visits})
+        size = -(-len(dates) // n)
+        keep = set(dates[i * size:(i + 1) * size])
+        visits = [v for v in visits if v[0] in keep]
+    rows = {name: [] for name in plans}
+    hists = {name: [] for name in plans} if histories is not None else None
+    current = None
+    for start_date, name, i0, i1 in visits:
+        if start_date != current:
+            legs.clear()
+            current = start_date
+        if name in outcome:
+            continue
+        try:
+            hist = plans[name].simulate(i0, i1, initial_cash, legs)
+        except Exception as e:
+            outcome[name] = e
+            continue
+        if hist:
+            rows[name].append(_result_row(hist, years, start_date))
+            if hists is not None:
+                hists[name].append(hist)
+    legs.clear()
+
+    for name in plans:
+        if name in outcome:
+            continue
+        outcome[name] = rows[name]
+        if histories is not None:
+            histories[name] = hists[name]
+    return {name: outcome[name] for name, _ in approaches}
+
+def run_shared_sweeps(dfs_dict, approaches, years, stepsize, initial_cash=10000.0, schedule="monthly",
+                      histories=None, legs=None):
+    """Run the sweeps of several approaches, simulating shared legs once.
+
+    See :func:`run_shared_windows`.  Returns ``{name: (summary, results_list,
+    final_map)}`` like :func:`run_configured_sweep`, or the exception an
+    approach raised.
+    """
+    outcome = run_shared_windows(dfs_dict, approaches, years, stepsize, initial_cash, schedule,
+                                 histories, legs)
+    for name, rows in outcome.items():
+        if isinstance(rows, Exception):
+            continue
+        try:
+            outcome[name] = summarize_sweep(name, rows, years)
+        except Exception as e:
+            outcome[name] = e
+            if histories is not None:
+                histories.pop(name, None)
+    return outcome
+
+def summarize_sweep(approach_name, results_list, years):
+    """Return ``(summary, results_list, final_map)`` for a sweep's rows."""
+    final_map = {row[4]: row[2] for row in results_list}
 
     if not results_list:
         raise ValueError(f"No valid runs for approach '{approach_name}' (years={years}).")
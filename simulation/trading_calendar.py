@@ -0,0 +1,107 @@
+"""Vectorized schedules over a trading calendar.
+
+Sweeps start a simulation window at regular points of the common trading
+calendar – historically the first open day of every month, thinned by
+``stepsize``.  The helpers here compute such schedules directly on the
+``datetime64`` values of a sorted :class:`pandas.DatetimeIndex` and return
+*integer positions* into it, so the sweep driver can go from calendar to window
+offsets without iterating over Timestamps.
+
+Supported schedules:
+
+* ``"monthly"``, ``"weekly"`` (weeks start on Monday), ``"quarterly"`` and
+  ``"yearly"`` – the first trading day of each period;
+* ``"bars:N"`` – every ``N``-th trading day;
+* ``"daily"`` – every trading day (same as ``"bars:1"``).
+
+``step`` keeps every ``step``-th start of the schedule, mirroring the config
+file's ``stepsize``.
+"""
+
+import numpy as np
+import pandas as pd
+
+SCHEDULES = ("daily", "weekly", "monthly", "quarterly", "yearly")
+
+
+def _period_codes(values, freq):
+    """Return an integer period id for each ``datetime64[ns]`` value."""
+    if freq == "monthly":
+        return values.astype("datetime64[M]").astype(np.int64)
+    if freq == "quarterly":
+        return values.astype("datetime64[M]").astype(np.int64) // 3
+    if freq == "yearly":
+        return values.astype("datetime64[Y]").astype(np.int64)
+    if freq == "weekly":
+        # 1970-01-01 was a Thursday; shifting by 3 days starts weeks on Monday.
+        return (values.astype("datetime64[D]").astype(np.int64) + 3) // 7
+    raise ValueError(f"Unknown period frequency '{freq}'")
+
+
+def period_start_positions(index, freq="monthly") -> np.ndarray:
+    """Positions of the first trading day of each period in sorted ``index``."""
+    values = np.asarray(index.values)
+    if len(values) == 0:
+        return np.empty(0, dtype=np.int64)
+    codes = _period_codes(values, freq)
+    is_start = np.empty(len(codes), dtype=bool)
+    is_start[0] = True
+    np.not_equal(codes[1:], codes[:-1], out=is_start[1:])
+    return np.flatnonzero(is_start)
+
+
+def parse_schedule(schedule):
+    """Validate ``schedule`` and return ``(kind, n_bars)``.
+
+    ``kind`` is one of :data:`SCHEDULES` or ``"bars"``; ``n_bars`` is only set
+    for bar schedules.
+    """
+    if isinstance(schedule, int):
+        schedule = f"bars:{schedule}"
+    text = str(schedule).strip().lower()
+    if text.startswith("bars:"):
+        try:
+            n_bars = int(text[len("bars:"):])
+        except ValueError:
+            raise ValueError(f"Invalid bar schedule '{schedule}'") from None
+        if n_bars < 1:
+            raise ValueError(f"Bar schedule must be >= 1, got '{schedule}'")
+        return "bars", n_bars
+    if text not in SCHEDULES:
+        raise ValueError(
+            f"Unknown schedule '{schedule}'; expected one of {', '.join(SCHEDULES)} or bars:N"
+        )
+    return text, None
+
+
+def schedule_positions(index, schedule="monthly", step=1) -> np.ndarray:
+    """Positions in ``index`` where windows of the given schedule start."""
+    kind, n_bars = parse_schedule(schedule)
+    if kind == "bars":
+        positions = np.arange(0, len(index), n_bars, dtype=np.int64)
+    elif kind == "daily":
+        positions = np.arange(len(index), dtype=np.int64)
+    else:
+        positions = period_start_positions(index, kind)
+    return positions[::max(1, int(step))]
+
+
+def window_offsets(index, start_positions, years):
+    """Return ``(starts, ends)`` position arrays for full ``years``-long windows.
+
+    A window starting at ``index[s]`` covers the trading days in
+    ``[index[s], index[s] + years * 365 days)``, i.e. ``index[s:e]``.  Windows
+    whose calendar end falls after the last available date are dropped, as in
+    the original sweep.
+    """
+    values = np.asarray(index.values)
+    starts = np.asarray(start_positions, dtype=np.int64)
+    if len(values) == 0 or len(starts) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    end_dates = values[starts] + np.timedelta64(pd.Timedelta(days=years * 365))
+    keep = end_dates <= values[-1]
+    starts = starts[keep]
+    ends = values.searchsorted(end_dates[keep], side="left").astype(np.int64)
+    nonempty = ends > starts
+    return starts[nonempty], ends[nonempty]
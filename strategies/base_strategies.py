@@ -13,12 +13,22 @@ to be used by the simulation engine. The strategies included are:
   - rsi: A strategy based on the Relative Strength Index (RSI).
 
 Obsolete strategies (advanced_daytrading10 and advanced_daytrading20) have been removed.
+
+sma_trading, momentum_breakout and rsi are registered as signal-based strategy
+objects (see :mod:`strategies.signals`): the engine precomputes their signals
+once per window.  They remain callable with the per-bar signature.
 """
 
 from stock_market_simulator.simulation.portfolio import Order, Portfolio
-from stock_market_simulator.strategies.sma_trading_strategy import sma_trading_strategy as imported_sma_trading_strategy
-from stock_market_simulator.strategies.momentum_breakout_strategy import momentum_breakout_strategy
-from stock_market_simulator.strategies.rsi_strategy import rsi_strategy
+from stock_market_simulator.strategies.sma_trading_strategy import (
+    SMATradingStrategy,
+    sma_trading_strategy as imported_sma_trading_strategy,
+)
+from stock_market_simulator.strategies.momentum_breakout_strategy import (
+    MomentumBreakoutStrategy,
+    momentum_breakout_strategy,
+)
+from stock_market_simulator.strategies.rsi_strategy import RSIStrategy, rsi_strategy
 
 
 def buy_hold_strategy(portfolio: Portfolio, date, price, day_index):
@@ -132,7 +142,13 @@ def rsi_strategy_wrapper(portfolio: Portfolio, date, price, day_index):
 STRATEGY_MAP = {
     "buy_hold": buy_hold_strategy,
     "advanced_daytrading": advanced_daytrading,
-    "sma_trading": sma_trading_strategy,
-    "momentum_breakout": momentum_breakout_strategy_wrapper,
-    "rsi": rsi_strategy_wrapper
+    "sma_trading": SMATradingStrategy(),
+    "momentum_breakout": MomentumBreakoutStrategy(),
+    "rsi": RSIStrategy(),
+}
+
+# Per-ticker parameters a strategy reads from its ticker settings.  Config
+# files may set (or range over) these keys on the strategy's ticker lines.
+STRATEGY_PARAMS = {
+    "advanced_daytrading": ("trailing_stop_pct", "limit_buy_discount_pct", "pending_limit_days"),
 }
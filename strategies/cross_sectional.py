@@ -0,0 +1,171 @@
+# stock_market_simulator/strategies/cross_sectional.py
+
+"""
+Cross-sectional strategies.
+
+The strategies in :mod:`strategies.base_strategies` see one ticker's price per
+call and place orders on that ticker's sub-portfolio.  Strategies that *rank*
+a universe – "hold the 10 best performers of the last year" – need every
+ticker's price at once, and calling a Python function per ticker per bar does
+not scale to universes of 1000+ tickers over decades.
+
+A cross-sectional strategy instead maps rows of the ``(bars, tickers)`` close
+matrix to target weights.  The simple API is :meth:`CrossSectionalStrategy.weights`,
+called with the current price row and the price history up to that row.  The
+engine (:mod:`simulation.multi_asset`) calls
+:meth:`CrossSectionalStrategy.target_weights` once per window with *all*
+rebalance rows; the built-in strategies override it so the signal for every
+rebalance date and ticker is one array expression and ranking is a single
+``argpartition`` over the whole block.
+
+Prices may be NaN before a ticker lists or after it delists; such tickers are
+never selected on that bar.
+
+Strategies are looked up by name through ``CROSS_SECTIONAL_MAP`` and
+configured with keyword parameters (see :mod:`utils.config_parser`).
+"""
+
+import numpy as np
+
+
+class CrossSectionalStrategy:
+    """Base class: return target weights over the universe on rebalance bars."""
+
+    def weights(self, row, history):
+        """Target weights for one bar.
+
+        ``row`` is the current price vector, ``history`` the ``(t + 1, tickers)``
+        prices up to and including it.  Weights are fractions of portfolio
+        value; any remainder stays in cash.
+        """
+        raise NotImplementedError
+
+    def target_weights(self, close, rows):
+        """Return a ``(len(rows), tickers)`` weight matrix for bars ``rows``.
+
+        The default calls :meth:`weights` per rebalance bar; subclasses may
+        vectorize across all rows.
+        """
+        out = np.zeros((len(rows), close.shape[1]))
+        for k, t in enumerate(rows):
+            out[k] = self.weights(close[t], close[:t + 1])
+        return out
+
+
+def top_n_weights(scores, top_n):
+    """Equal weights on the ``top_n`` highest scores of every row.
+
+    NaN scores are never selected; rows with fewer valid scores spread the
+    weight over those available, rows without any stay in cash.
+    """
+    scores = np.atleast_2d(np.asarray(scores, dtype=float))
+    n_rows, n_cols = scores.shape
+    out = np.zeros((n_rows, n_cols))
+    k = min(int(top_n), n_cols)
+    if k < 1 or n_rows == 0:
+        return out
+    ranked = np.where(np.isnan(scores), -np.inf, scores)
+    top = np.argpartition(-ranked, k - 1, axis=1)[:, :k]
+    chosen = np.take_along_axis(ranked, top, axis=1) > -np.inf
+    counts = chosen.sum(axis=1, keepdims=True)
+    np.put_along_axis(out, top, np.where(chosen, 1.0 / np.maximum(counts, 1), 0.0), axis=1)
+    return out
+
+
+def _lagged(close, rows, lag):
+    """``close[rows - lag]`` with NaN where the lag reaches before bar 0."""
+    past = rows - lag
+    out = np.full((len(rows), close.shape[1]), np.nan)
+    ok = past >= 0
+    out[ok] = close[past[ok]]
+    return out
+
+
+class MomentumTopN(CrossSectionalStrategy):
+    """Hold the ``top_n`` tickers with the highest trailing return.
+
+    The return is measured over ``lookback`` bars, ending ``skip`` bars before
+    the rebalance bar (``skip=21`` gives the classic 12-1 month momentum).
+    """
+
+    def __init__(self, top_n=10, lookback=252, skip=0):
+        if top_n < 1 or lookback < 1 or skip < 0:
+            raise ValueError("momentum needs top_n >= 1, lookback >= 1 and skip >= 0")
+        self.top_n = int(top_n)
+        self.lookback = int(lookback)
+        self.skip = int(skip)
+
+    def target_weights(self, close, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            momentum = _lagged(close, rows, self.skip) / _lagged(close, rows, self.skip + self.lookback) - 1.0
+        return top_n_weights(momentum, self.top_n)
+
+    def weights(self, row, history):
+        return self.target_weights(history, [len(history) - 1])[0]
+
+
+class InverseVolatility(CrossSectionalStrategy):
+    """Weight tickers by the inverse of their daily return volatility.
+
+    Volatility is the standard deviation of the last ``lookback`` simple
+    returns; tickers without a full lookback are left out.  Running sums of
+    returns and squared returns give every rebalance row in O(tickers).
+    """
+
+    def __init__(self, lookback=63):
+        if lookback < 2:
+            raise ValueError("inverse_volatility needs lookback >= 2")
+        self.lookback = int(lookback)
+
+    def target_weights(self, close, rows):
+        rows = np.asarray(rows, dtype=np.int64)
+        n = self.lookback
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rets = close[1:] / close[:-1] - 1.0
+        # Prefix sums with a leading zero row: sum(rets[a:b]) = c[b] - c[a].
+        valid = np.isfinite(rets)
+        clean = np.where(valid, rets, 0.0)
+        zero = np.zeros((1, close.shape[1]))
+        c1 = np.concatenate((zero, np.cumsum(clean, axis=0)))
+        c2 = np.concatenate((zero, np.cumsum(clean * clean, axis=0)))
+        cn = np.concatenate((zero, np.cumsum(valid, axis=0)))
+
+        # Returns ending at bar t are rets[t - n:t].
+        out = np.zeros((len(rows), close.shape[1]))
+        ok = rows >= n
+        b = rows[ok]
+        a = b - n
+        s1 = c1[b] - c1[a]
+        s2 = c2[b] - c2[a]
+        full = (cn[b] - cn[a]) == n
+        var = np.maximum(s2 - s1 * s1 / n, 0.0) / (n - 1)
+        with np.errstate(divide="ignore"):
+            inv = np.where(full & (var > 0), 1.0 / np.sqrt(var), 0.0)
+        total = inv.sum(axis=1, keepdims=True)
+        out[ok] = np.divide(inv, total, out=np.zeros_like(inv), where=total > 0)
+        return out
+
+    def weights(self, row, history):
+        return self.target_weights(history, [len(history) - 1])[0]
+
+
+# Name -> strategy class; config parameters are passed as keyword arguments.
+CROSS_SECTIONAL_MAP = {
+    "momentum": MomentumTopN,
+    "inverse_volatility": InverseVolatility,
+}
+
+
+def make_cross_sectional(name, **params):
+    """Instantiate the strategy registered as ``name`` with ``params``."""
+    try:
+        cls = CROSS_SECTIONAL_MAP[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown cross-sectional strategy '{name}'; expected one of {', '.join(CROSS_SECTIONAL_MAP)}"
+        ) from None
+    try:
+        return cls(**params)
+    except TypeError as e:
+        raise ValueError(f"Invalid parameters for '{name}': {e}") from None
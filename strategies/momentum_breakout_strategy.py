@@ -12,9 +12,18 @@ This strategy monitors the most recent 10-day price window to detect breakout ev
   then sell 50% of current holdings.
 
 The strategy maintains its state (price history, last order days, and in_position flag) in portfolio.strategy_state.
+:class:`MomentumBreakoutStrategy` is the equivalent signal-based form used by the engine.
 """
 
+import numpy as np
+
 from stock_market_simulator.simulation.portfolio import Order, Portfolio
+from stock_market_simulator.strategies.signals import (
+    BUY,
+    SELL,
+    SignalStrategy,
+    place_market_order,
+)
 
 def momentum_breakout_strategy(portfolio: Portfolio, date, price, day_index):
     state = portfolio.strategy_state
@@ -65,3 +74,44 @@ def momentum_breakout_strategy(portfolio: Portfolio, date, price, day_index):
 
     # Append the current price after evaluation so future windows include it
     history.append(price)
+
+
+class MomentumBreakoutStrategy(SignalStrategy):
+    """Signal-based form of :func:`momentum_breakout_strategy`.
+
+    Breakout and breakdown levels of every bar come from one sliding-window
+    max/min over the window's prices.
+    """
+
+    def __init__(self, window=10):
+        super().__init__(momentum_breakout_strategy)
+        self.window = window
+
+    def on_window(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        n = len(prices)
+        buy = np.zeros(n, dtype=bool)
+        sell = np.zeros(n, dtype=bool)
+        if n > self.window:
+            # Levels for bar t use the previous ``window`` prices only.
+            windows = np.lib.stride_tricks.sliding_window_view(prices[:-1], self.window)
+            buy[self.window:] = prices[self.window:] > windows.max(axis=1)
+            sell[self.window:] = prices[self.window:] < windows.min(axis=1)
+        return self.flags(buy, sell)
+
+    def on_signal(self, portfolio, signal, price, day_index):
+        state = portfolio.strategy_state
+        in_position = state.get("in_position", False)
+        if signal & BUY and not in_position:
+            qty = (portfolio.cash * 0.30) / price
+            if qty > 0:
+                place_market_order(portfolio, "buy", qty, day_index)
+                state["last_buy_day"] = day_index
+                state["in_position"] = True
+        elif signal & SELL and in_position:
+            qty = portfolio.shares * 0.50
+            if qty > 0:
+                place_market_order(portfolio, "sell", qty, day_index)
+                state["last_sell_day"] = day_index
+                if portfolio.shares - qty < 1e-6:
+                    state["in_position"] = False
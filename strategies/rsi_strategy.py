@@ -10,9 +10,19 @@ This strategy uses the 14-day Relative Strength Index (RSI) to generate trading
   then sell 50% of current holdings.
 
 The strategy maintains its own price history and order timing in portfolio.strategy_state.
+:class:`RSIStrategy` is the equivalent signal-based form used by the engine.
 """
 
+import numpy as np
+
 from stock_market_simulator.simulation.portfolio import Order, Portfolio
+from stock_market_simulator.strategies.signals import (
+    BUY,
+    SELL,
+    SignalStrategy,
+    place_market_order,
+    rolling_sum,
+)
 
 def compute_rsi(prices, period=14):
     """
@@ -86,3 +96,63 @@ def rsi_strategy(portfolio: Portfolio, date, price, day_index):
             state["last_sell_day"] = day_index
             if portfolio.shares - qty < 1e-6:
                 state["in_position"] = False
+
+
+def rsi_series(prices, period=14):
+    """RSI for every bar, identical to :func:`compute_rsi` on each prefix.
+
+    NaN where fewer than ``period + 1`` prices are available.
+    """
+    prices = np.asarray(prices, dtype=float)
+    n = len(prices)
+    out = np.full(n, np.nan)
+    if n < period + 1:
+        return out
+    change = prices[1:] - prices[:-1]
+    gains = np.where(change > 0, change, 0.0)
+    losses = np.where(change > 0, 0.0, np.abs(change))
+    # compute_rsi sums the most recent change first: sum reversed windows.
+    sum_gain = rolling_sum(gains[::-1], period)[::-1][:n - period]
+    sum_loss = rolling_sum(losses[::-1], period)[::-1][:n - period]
+    avg_gain = sum_gain / period
+    avg_loss = sum_loss / period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+    out[period:] = np.where(avg_loss == 0, 100.0, rsi)
+    return out
+
+
+class RSIStrategy(SignalStrategy):
+    """Signal-based form of :func:`rsi_strategy`.
+
+    The RSI of every bar is computed once per window; the position flag that
+    gates buys and sells is kept in ``portfolio.strategy_state`` as before.
+    """
+
+    def __init__(self, period=14):
+        super().__init__(rsi_strategy)
+        self.period = period
+
+    def on_window(self, prices):
+        rsi = rsi_series(prices, self.period)
+        with np.errstate(invalid="ignore"):
+            return self.flags(rsi < 30, rsi > 70)
+
+    def on_signal(self, portfolio, signal, price, day_index):
+        state = portfolio.strategy_state
+        in_position = state.get("in_position", False)
+        # A bar is either oversold or overbought, and at most one order of each
+        # side is placed per bar, so the one-day cooldowns always hold.
+        if signal & BUY and not in_position:
+            qty = (portfolio.cash * 0.25) / price
+            if qty > 0:
+                place_market_order(portfolio, "buy", qty, day_index)
+                state["last_buy_day"] = day_index
+                state["in_position"] = True
+        elif signal & SELL and in_position:
+            qty = portfolio.shares * 0.50
+            if qty > 0:
+                place_market_order(portfolio, "sell", qty, day_index)
+                state["last_sell_day"] = day_index
+                if portfolio.shares - qty < 1e-6:
+                    state["in_position"] = False
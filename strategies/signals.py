@@ -0,0 +1,110 @@
+# stock_market_simulator/strategies/signals.py
+
+"""
+Signal-based strategy protocol.
+
+Per-bar strategies are plain functions ``strategy(portfolio, date, price,
+day_index)`` called once per ticker per bar.  Most of their work – keeping a
+price history and recomputing moving averages or RSI on it – depends only on
+prices, not on the portfolio, and is repeated from scratch on every bar.
+
+A :class:`SignalStrategy` splits that work in two:
+
+* :meth:`SignalStrategy.on_window` receives the closing prices of the whole
+  simulation window as a NumPy array and returns one ``uint8`` flag word per
+  bar (:data:`BUY`, :data:`SELL`).  It runs once per window.
+* :meth:`SignalStrategy.on_signal` is only called on bars whose flags are
+  non-zero and places orders, applying any rules that depend on portfolio
+  state (cash, holdings, cooldowns).
+
+:func:`simulation.simulator.run_hybrid_multi_fund` uses that path for any
+strategy with an ``on_window`` method.  Instances stay callable with the
+per-bar signature, delegating to the original function, so code that calls
+strategies directly (and custom strategy functions) keeps working.
+
+The port of a per-bar strategy must produce exactly the same orders.  Rolling
+sums are therefore computed with :func:`rolling_sum`, which reproduces
+Python's ``sum`` over a list bit for bit – plain left-to-right addition, or
+the Neumaier-compensated summation ``sum`` uses for floats since Python 3.12.
+"""
+
+import sys
+
+import numpy as np
+
+from stock_market_simulator.simulation.portfolio import Order
+
+BUY = 1
+SELL = 2
+
+_COMPENSATED_SUM = sys.version_info >= (3, 12)
+
+
+def rolling_sum(values, window):
+    """Sum of ``values[t - window + 1:t + 1]`` for every ``t >= window - 1``.
+
+    Returns an array of ``len(values)`` with NaN before the first full window.
+    Every window is reduced with the same operations, in the same order, as
+    ``sum(values[t - window + 1:t + 1])`` so results are identical, while the
+    work is ``window`` vector operations.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    out = np.full(n, np.nan)
+    if n < window:
+        return out
+    m = n - window + 1
+    acc = values[:m].copy()
+    if not _COMPENSATED_SUM:
+        for k in range(1, window):
+            acc += values[k:m + k]
+        out[window - 1:] = acc
+        return out
+    comp = np.zeros(m)
+    for k in range(1, window):
+        x = values[k:m + k]
+        t = acc + x
+        comp += np.where(np.abs(acc) >= np.abs(x), (acc - t) + x, (x - t) + acc)
+        acc = t
+    out[window - 1:] = np.where((comp != 0) & np.isfinite(comp), acc + comp, acc)
+    return out
+
+
+def place_market_order(portfolio, side, quantity, day_index):
+    """Append a market order the way the per-bar strategies do."""
+    order = Order(side=side, order_type="market", quantity=quantity)
+    order.placement_day = day_index
+    portfolio.orders.append(order)
+
+
+class SignalStrategy:
+    """Base class for strategies that precompute their signals per window.
+
+    Subclasses implement :meth:`on_window` and :meth:`on_signal` and pass the
+    equivalent per-bar function to ``__init__`` as the fallback.
+    """
+
+    def __init__(self, per_bar):
+        self.per_bar = per_bar
+
+    @property
+    def __name__(self):
+        # Callers identify strategies by function name (see
+        # :class:`simulation.simulator.HybridMultiFundPortfolio`).
+        return self.per_bar.__name__
+
+    def __call__(self, portfolio, date, price, day_index):
+        self.per_bar(portfolio, date, price, day_index)
+
+    def on_window(self, prices) -> np.ndarray:
+        """Return ``uint8`` :data:`BUY` / :data:`SELL` flags for every bar."""
+        raise NotImplementedError
+
+    def on_signal(self, portfolio, signal, price, day_index):
+        """Place orders for a bar whose flags are ``signal`` (non-zero)."""
+        raise NotImplementedError
+
+    @staticmethod
+    def flags(buy, sell) -> np.ndarray:
+        """Combine boolean ``buy`` and ``sell`` arrays into flag words."""
+        return (np.asarray(buy, dtype=np.uint8) * BUY) | (np.asarray(sell, dtype=np.uint8) * SELL)
@@ -10,9 +10,19 @@ This strategy uses two Simple Moving Averages (SMAs) calculated over 20-day and
   sell 50% of current holdings.
 
 The strategy stores its price history and last order days in portfolio.strategy_state.
+:class:`SMATradingStrategy` is the equivalent signal-based form used by the engine.
 """
 
+import numpy as np
+
 from stock_market_simulator.simulation.portfolio import Order, Portfolio
+from stock_market_simulator.strategies.signals import (
+    BUY,
+    SELL,
+    SignalStrategy,
+    place_market_order,
+    rolling_sum,
+)
 
 def sma_trading_strategy(portfolio: Portfolio, date, price, day_index):
     state = portfolio.strategy_state
@@ -57,3 +67,39 @@ def sma_trading_strategy(portfolio: Portfolio, date, price, day_index):
             order.placement_day = day_index
             portfolio.orders.append(order)
             state["last_sell_day"] = day_index
+
+
+class SMATradingStrategy(SignalStrategy):
+    """Signal-based form of :func:`sma_trading_strategy`.
+
+    Both moving averages and the crossover/run-up conditions are computed for
+    the whole window in :meth:`on_window`; only the cash-dependent order sizes
+    and the sell cooldown are evaluated per signal bar.
+    """
+
+    def __init__(self):
+        super().__init__(sma_trading_strategy)
+
+    def on_window(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        sma_20 = rolling_sum(prices, 20) / 20.0
+        sma_50 = rolling_sum(prices, 50) / 50.0
+        # NaN before bar 49 compares False, matching the 50-point warm-up.
+        with np.errstate(invalid="ignore"):
+            buy = (sma_20 > sma_50) & ~np.isnan(sma_50)
+            sell = (prices > 1.1 * sma_20) & ~np.isnan(sma_50)
+        return self.flags(buy, sell)
+
+    def on_signal(self, portfolio, signal, price, day_index):
+        state = portfolio.strategy_state
+        # The one-day buy cooldown always holds: at most one buy per bar.
+        if signal & BUY:
+            quantity_to_buy = (portfolio.cash * 0.20) / price
+            if quantity_to_buy > 0:
+                place_market_order(portfolio, 'buy', quantity_to_buy, day_index)
+                state["last_buy_day"] = day_index
+        if signal & SELL and day_index - state.get("last_sell_day", -100) >= 3:
+            quantity_to_sell = portfolio.shares * 0.50
+            if quantity_to_sell > 0:
+                place_market_order(portfolio, 'sell', quantity_to_sell, day_index)
+                state["last_sell_day"] = day_index
@@ -0,0 +1,70 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.simulation.alignment import align, clear_calendar_cache
+from stock_market_simulator.simulation.simulator import intersect_all_indexes
+
+
+def _df(dates, base):
+    idx = pd.to_datetime(dates)
+    idx.name = "Date"
+    return pd.DataFrame({"Close": [base + i for i in range(len(idx))]}, index=idx)
+
+
+def _dfs():
+    return {
+        "A": _df(["2020-01-01", "2020-01-02", "2020-01-03", "2020-01-06", "2020-01-07"], 10),
+        "B": _df(["2020-01-02", "2020-01-03", "2020-01-06", "2020-01-08"], 100),
+    }
+
+
+def test_calendar_matches_intersection_and_positions():
+    clear_calendar_cache()
+    dfs = _dfs()
+
+    cal = align(dfs)
+
+    assert list(cal.index) == list(intersect_all_indexes(dfs))
+    for tk, df in dfs.items():
+        assert list(df.index[cal.positions[tk]]) == list(cal.index)
+
+
+def test_calendar_is_memoized_per_data_version():
+    clear_calendar_cache()
+    dfs = _dfs()
+
+    first = align(dfs)
+    assert align(dict(reversed(list(dfs.items())))) is first
+
+    # A reloaded frame is a new data version and gets a fresh calendar
+    dfs["B"] = _df(["2020-01-03", "2020-01-06"], 100)
+    second = align(dfs)
+    assert second is not first
+    assert list(second.index) == list(pd.to_datetime(["2020-01-03", "2020-01-06"]))
+
+
+def test_window_take_matches_mask_and_reindex():
+    clear_calendar_cache()
+    dfs = _dfs()
+    cal = align(dfs)
+    start, end = pd.Timestamp("2020-01-03"), pd.Timestamp("2020-01-07")
+
+    i0, i1 = cal.window(start, end)
+    taken = cal.take(dfs, i0, i1)
+
+    sub_idx = cal.index[(cal.index >= start) & (cal.index < end)]
+    for tk, df in dfs.items():
+        expected = df.loc[(df.index >= start) & (df.index < end)].reindex(sub_idx, method="ffill")
+        pd.testing.assert_frame_equal(taken[tk], expected, check_freq=False)
@@ -0,0 +1,123 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.data.bar_stream import (
+    daily_frame,
+    iter_chunks,
+    minute_path,
+    stream_daily_bars,
+    write_minute_parquet,
+)
+from stock_market_simulator.simulation.alignment import align
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+from stock_market_simulator.simulation.simulator import (
+    HybridMultiFundPortfolio,
+    run_hybrid_multi_fund,
+)
+
+
+def _minutes(days=40, seed=0, skip_day=None):
+    rng = np.random.default_rng(seed)
+    sessions = pd.bdate_range("2021-03-01", periods=days)
+    if skip_day is not None:
+        sessions = sessions.delete(skip_day)
+    index = pd.DatetimeIndex(
+        [s + pd.Timedelta(hours=9, minutes=30 + m) for s in sessions for m in range(0, 390, 13)]
+    )
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, len(index))))
+    open_ = np.r_[close[0], close[:-1]]
+    noise = np.abs(rng.normal(0, 0.001, len(index)))
+    return pd.DataFrame({
+        "Open": open_,
+        "High": np.maximum(open_, close) * (1 + noise),
+        "Low": np.minimum(open_, close) * (1 - noise),
+        "Close": close,
+        "Volume": rng.integers(100, 1000, len(index)).astype(float),
+    }, index=index)
+
+
+def _expected_daily(df):
+    out = df.resample("D").agg({"Open": "first", "High": "max", "Low": "min",
+                                "Close": "last", "Volume": "sum"}).dropna()
+    out.index.name = "Date"
+    return out
+
+
+def _write_csv(df, path):
+    df.rename_axis("Datetime").reset_index().to_csv(path, index=False)
+
+
+@pytest.mark.parametrize("chunksize", [7, 30, 1000, 100_000])
+def test_resampling_across_chunk_boundaries(tmp_path, chunksize):
+    df = _minutes()
+    path = str(tmp_path / "T.csv")
+    _write_csv(df, path)
+    pd.testing.assert_frame_equal(
+        daily_frame(path, chunksize=chunksize), _expected_daily(df), check_freq=False
+    )
+
+
+def test_parquet_range_scan(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = _minutes()
+    write_minute_parquet(df, str(tmp_path / "_T.parquet"), row_group_size=500)
+    path = minute_path(str(tmp_path), "^T")
+    chunks = list(iter_chunks(path, "2021-03-10", "2021-03-20", chunksize=64))
+    assert max(len(c) for c in chunks) <= 64
+    got = daily_frame(path, "2021-03-10", "2021-03-20", chunksize=64)
+    expected = _expected_daily(df.loc["2021-03-10":"2021-03-19"])
+    pd.testing.assert_frame_equal(got, expected, check_freq=False)
+
+
+@pytest.mark.parametrize("execution", ["close", "ohlc"])
+def test_stream_matches_dataframe_path(tmp_path, execution):
+    paths = {}
+    for i, tk in enumerate(["A", "B"]):
+        paths[tk] = str(tmp_path / f"{tk}.csv")
+        _write_csv(_minutes(days=120, seed=i, skip_day=5 if tk == "B" else None), paths[tk])
+
+    info = {tk: {"strategy": STRATEGY_MAP[name], "spread": 0.2, "expense_ratio": 0.5,
+                 "execution": execution}
+            for tk, name in (("A", "sma_trading"), ("B", "advanced_daytrading"))}
+
+    daily = {tk: daily_frame(p) for tk, p in paths.items()}
+    frames = align(daily).take(daily)
+    hist_df, index_df = run_hybrid_multi_fund(frames, HybridMultiFundPortfolio(info, 1000.0))
+    hist_st, index_st = run_hybrid_multi_fund(
+        stream_daily_bars(paths, chunksize=50), HybridMultiFundPortfolio(info, 1000.0)
+    )
+    assert hist_st == hist_df
+    assert index_st.equals(pd.DatetimeIndex(index_df))
+    assert len(set(hist_df)) > 1
+
+
+def test_stream_charges_volume_slippage(tmp_path):
+    from stock_market_simulator.simulation.costs import VolumeSlippage
+
+    path = str(tmp_path / "A.csv")
+    _write_csv(_minutes(days=120), path)
+    info = {"A": {"strategy": STRATEGY_MAP["sma_trading"], "spread": 0.2, "costs": VolumeSlippage(50.0)}}
+    daily = daily_frame(path)
+    hist_df, _ = run_hybrid_multi_fund({"A": daily}, HybridMultiFundPortfolio(info, 1e6))
+    hist_st, _ = run_hybrid_multi_fund(stream_daily_bars({"A": path}), HybridMultiFundPortfolio(info, 1e6))
+    assert hist_st == hist_df
+    plain = {"A": dict(info["A"], costs=None)}
+    assert hist_df != run_hybrid_multi_fund({"A": daily}, HybridMultiFundPortfolio(plain, 1e6))[0]
+
+    # Rows without a volume cannot be charged volume slippage.
+    rows = ((dt, {"A": bar[:4]}) for dt, bar in ((dt, bars["A"]) for dt, bars in stream_daily_bars({"A": path})))
+    with pytest.raises(ValueError, match="Volume"):
+        run_hybrid_multi_fund(rows, HybridMultiFundPortfolio(info, 1e6))
@@ -0,0 +1,111 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+pytest.importorskip("matplotlib")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+from stock_market_simulator.batch_runner import run_batch
+from stock_market_simulator.data.data_fetcher import load_historical_data
+from stock_market_simulator.data.sources import SyntheticGBMSource
+from stock_market_simulator.simulation.simulator import (
+    run_configured_sweep,
+    run_sweep_windows,
+    sweep_window_count,
+)
+from stock_market_simulator.utils.config_parser import parse_config_file
+from stock_market_simulator.utils.results_io import load_results
+
+CONFIG_A = """years=2
+stepsize=2
+
+approach=AAA_sma
+    ticker=AAA, strategy=sma_trading, spread=0.1, expense_ratio=0.2
+
+approach=pair
+    ticker=AAA, strategy=buy_hold
+    ticker=BBB, strategy=rsi
+"""
+
+CONFIG_B = """years=3
+stepsize=1
+
+approach=BBB_adv
+    ticker=BBB, strategy=advanced_daytrading, spread=0.05
+
+approach=missing_dates
+    ticker=AAA, strategy=buy_hold
+    ticker=CCC, strategy=buy_hold
+"""
+
+
+@pytest.fixture
+def batch_dir(tmp_path):
+    (tmp_path / "a.txt").write_text(CONFIG_A)
+    (tmp_path / "b.txt").write_text(CONFIG_B)
+    source = SyntheticGBMSource(origin="2010-01-01", end="2016-12-31")
+    return tmp_path, source
+
+
+def _expected(path, dfs):
+    years, stepsize, approaches, options = parse_config_file(str(path), return_options=True)
+    out = {}
+    for aname, tdict in approaches:
+        try:
+            out[aname] = run_configured_sweep({tk: dfs[tk] for tk in tdict}, aname, tdict,
+                                              years, stepsize, schedule=options["schedule"])
+        except ValueError:
+            pass
+    return out
+
+
+def test_window_slices_concatenate_to_full_sweep(batch_dir):
+    tmp_path, source = batch_dir
+    dfs = {tk: load_historical_data(tk, local_data_dir=str(tmp_path / "csv"), source=source)
+           for tk in ("AAA", "BBB")}
+    years, stepsize, approaches, _ = parse_config_file(str(tmp_path / "a.txt"), return_options=True)
+    aname, tdict = approaches[1]
+    n = sweep_window_count(dfs, aname, tdict, years, stepsize)
+    full = run_sweep_windows(dfs, aname, tdict, years, stepsize)
+    assert len(full) == n
+    parts = [run_sweep_windows(dfs, aname, tdict, years, stepsize, window_slice=slice(i, i + 5))
+             for i in range(0, n, 5)]
+    assert [r for p in parts for r in p] == full
+
+
+def test_batch_matches_per_config_sweeps(batch_dir):
+    tmp_path, source = batch_dir
+    csv_dir = str(tmp_path / "csv")
+    # CCC only starts in 2016, leaving no full window for ``missing_dates``.
+    source_ccc = SyntheticGBMSource(origin="2016-01-01", end="2016-12-31")
+    load_historical_data("CCC", local_data_dir=csv_dir, source=source_ccc)
+
+    runs = [(str(tmp_path / "a.txt"), "outA"), (str(tmp_path / "b.txt"), "outB")]
+    results = run_batch(runs, 2, base_dir=str(tmp_path / "reports"),
+                        source=source, local_data_dir=csv_dir)
+
+    dfs = {tk: load_historical_data(tk, local_data_dir=csv_dir, source=source)
+           for tk in ("AAA", "BBB", "CCC")}
+    assert results["outA"] == _expected(tmp_path / "a.txt", dfs)
+    assert results["outB"] == _expected(tmp_path / "b.txt", dfs)
+    assert set(results["outB"]) == {"BBB_adv"}
+
+    report = (tmp_path / "reports" / "outB" / "report.txt").read_text()
+    assert "Approach missing_dates => ERROR" in report
+    assert "=== Approach: BBB_adv ===" in report
+    assert (tmp_path / "reports" / "outA" / "histogram.png").exists()
+    assert load_results(str(tmp_path / "reports" / "outA")) == results["outA"]
@@ -0,0 +1,140 @@
+import os
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.data import bulk_fetcher, data_fetcher
+from stock_market_simulator.data.sources import DataSource, EXPECTED_COLUMNS
+
+
+def _frame(start, periods, base=1.0):
+    dates = pd.date_range(start, periods=periods, freq="D")
+    vals = [base + i for i in range(periods)]
+    df = pd.DataFrame(
+        {"Open": vals, "High": vals, "Low": vals, "Close": vals, "Volume": [100] * periods},
+        index=dates,
+    )
+    df.index.name = "Date"
+    return df
+
+
+class FakeSource(DataSource):
+    """Local stand-in that records calls and tracks concurrency."""
+
+    def __init__(self, end="2020-01-10", batch=True):
+        self.supports_batch = batch
+        self.end = pd.Timestamp(end)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def _make(self, start):
+        start = pd.Timestamp(start)
+        periods = (self.end - start).days + 1
+        return _frame(start, max(periods, 0))
+
+    def fetch(self, ticker, start):
+        return self.fetch_many([ticker], start)[ticker]
+
+    def fetch_many(self, tickers, start):
+        with self._lock:
+            self.calls.append((tuple(tickers), start))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        return {tk: self._make(start) for tk in tickers}
+
+
+def test_prefetch_batches_and_writes_cache(tmp_path):
+    source = FakeSource()
+    tickers = [f"T{i}" for i in range(7)]
+
+    results = bulk_fetcher.prefetch(
+        tickers, start_date="2020-01-01", local_data_dir=str(tmp_path),
+        source=source, max_workers=2, batch_size=3,
+    )
+
+    assert results == {tk: 10 for tk in tickers}
+    # 7 tickers in batches of at most 3 -> 3 requests, never more than 2 in flight
+    assert sorted(len(c[0]) for c in source.calls) == [1, 3, 3]
+    assert source.max_active <= 2
+    for tk in tickers:
+        path = tmp_path / f"{tk}.csv"
+        assert list(pd.read_csv(path, nrows=0).columns) == EXPECTED_COLUMNS
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
+
+
+def test_prefetch_updates_only_missing_rows(tmp_path, monkeypatch):
+    data_fetcher.write_csv_atomic(_frame("2020-01-01", 5), str(tmp_path / "OLD.csv"))
+
+    class DummyDateTime:
+        @staticmethod
+        def today():
+            return pd.Timestamp("2020-01-11").to_pydatetime()
+
+    monkeypatch.setattr(bulk_fetcher, "datetime", DummyDateTime)
+    source = FakeSource(batch=False)
+
+    results = bulk_fetcher.prefetch(
+        ["OLD", "NEW"], start_date="2020-01-01", local_data_dir=str(tmp_path), source=source,
+    )
+
+    assert results == {"OLD": 5, "NEW": 10}
+    assert (("OLD",), "2020-01-06") in source.calls
+    assert (("NEW",), "2020-01-01") in source.calls
+    old = data_fetcher.read_cached_csv(str(tmp_path / "OLD.csv"))
+    assert len(old) == 10
+    assert old.index.is_unique
+
+
+def test_planning_reads_only_the_end_of_the_cache(tmp_path, monkeypatch):
+    path = str(tmp_path / "T.csv")
+    df = _frame("2000-01-01", 3000)
+    # Older runs could leave rows without a Close at the end.
+    df.loc[df.index[-2:], "Close"] = float("nan")
+    df.to_csv(path)
+    expected = df.index[-3]
+    assert data_fetcher.last_cached_date(path) == expected
+    # A tiny chunk still finds the last complete row.
+    assert data_fetcher._last_row_date(path, chunk_size=7) == expected
+
+    monkeypatch.setattr(data_fetcher, "read_cached_csv", None)
+    next_day = (expected + pd.Timedelta(days=1)).strftime("%Y-%m-%d")
+    assert bulk_fetcher._plan_start("T", "1990-01-01", str(tmp_path), "2030-01-01") == next_day
+    monkeypatch.undo()
+
+    # Rows in the append segment count, as they do for read_cached_csv.
+    merged = data_fetcher.merge_new_rows(data_fetcher.read_cached_csv(path), _frame("2010-01-01", 2), path)
+    assert data_fetcher.last_cached_date(path) == merged.index[-1] == pd.Timestamp("2010-01-02")
+    assert data_fetcher.last_cached_date(str(tmp_path / "missing.csv")) is None
+    with open(path, "w") as f:
+        f.write("Date,Close\n2020-01-01,1\n")
+    assert data_fetcher.last_cached_date(path) is None
+
+
+def test_load_historical_data_uses_custom_source(tmp_path):
+    data_fetcher._data_cache.clear()
+    source = FakeSource(end="2020-01-03")
+
+    df = data_fetcher.load_historical_data(
+        "SRC", start_date="2020-01-01", local_data_dir=str(tmp_path), source=source,
+    )
+
+    assert len(df) == 3
+    assert source.calls == [(("SRC",), "2020-01-01")]
+    data_fetcher._data_cache.clear()
@@ -10,7 +10,7 @@ if 'stock_market_simulator' not in sys.modules:
     pkg.__path__ = [ROOT_DIR]
     sys.modules['stock_market_simulator'] = pkg
 
-from stock_market_simulator.utils.config_parser import parse_config_file
+from stock_market_simulator.utils.config_parser import ApproachList, parse_config_file, parse_range
 from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
 
 
@@ -60,3 +60,178 @@ def test_missing_years_or_stepsize(tmp_path):
     )
     with pytest.raises(ValueError):
         parse_config_file(str(cfg2))
+
+
+def test_schedule_option(tmp_path):
+    cfg = tmp_path / "cfg.txt"
+    cfg.write_text(
+        """\
+        years=1
+        stepsize=2
+        schedule=Weekly
+        approach=demo
+            ticker=TEST, strategy=buy_hold
+        """
+    )
+    years, stepsize, approaches, options = parse_config_file(str(cfg), return_options=True)
+    assert options["schedule"] == "weekly"
+    assert len(parse_config_file(str(cfg))) == 3
+
+    cfg.write_text(cfg.read_text().replace("Weekly", "sometimes"))
+    with pytest.raises(ValueError):
+        parse_config_file(str(cfg))
+
+
+def test_execution_mode(tmp_path):
+    cfg = tmp_path / "cfg.txt"
+    cfg.write_text(
+        """\
+        years=1
+        stepsize=1
+        approach=demo
+            ticker=A, strategy=advanced_daytrading, execution=OHLC
+            ticker=B, strategy=buy_hold
+        """
+    )
+    _, _, approaches = parse_config_file(str(cfg))
+    mapping = approaches[0][1]
+    assert mapping["A"]["execution"] == "ohlc"
+    assert "execution" not in mapping["B"]
+
+    cfg.write_text(cfg.read_text().replace("OHLC", "intraday"))
+    with pytest.raises(ValueError):
+        parse_config_file(str(cfg))
+
+
+def test_parse_range():
+    assert parse_range("7:12:0.5")[:3] == [7.0, 7.5, 8.0]
+    assert parse_range("7:12:0.5")[-1] == 12.0
+    assert parse_range("0.1:0.3:0.1") == [0.1, 0.2, 0.3]
+    assert parse_range("10:40:10") == [10, 20, 30, 40]
+    assert parse_range("1:3") == [1, 2, 3]
+    for bad in ("5:1:1", "1:5:0", "a:b:1", "1:2:3:4"):
+        with pytest.raises(ValueError):
+            parse_range(bad)
+
+
+def test_ranges_expand_and_dedupe(tmp_path, capsys):
+    cfg = tmp_path / "cfg.txt"
+    cfg.write_text(
+        """\
+        years=1
+        stepsize=1
+        approach=adt_{trailing_stop_pct}
+            ticker=A, strategy=advanced_daytrading, trailing_stop_pct=7:8:0.5, pending_limit_days=20:30:10
+            ticker=B, strategy=buy_hold, spread=0:0.2:0.1
+        approach=literal
+            ticker=A, strategy=advanced_daytrading, trailing_stop_pct=7.5, pending_limit_days=20
+            ticker=B, strategy=buy_hold, spread=0.1
+        approach=fixed
+            ticker=A, strategy=advanced_daytrading, limit_buy_discount_pct=2
+        """
+    )
+    _, _, approaches = parse_config_file(str(cfg))
+    assert isinstance(approaches, ApproachList)
+    # 3 * 2 * 3 variants; the one "literal" spells out is dropped, "literal"
+    # itself is kept.
+    assert len(approaches) == 19
+    assert approaches.duplicates == {"adt_7.5[pending_limit_days=20,spread=0.1]": "literal"}
+    assert "1 range variant(s) repeat" in capsys.readouterr().out
+    assert [n for n, _ in approaches][-2:] == ["literal", "fixed"]
+
+    name, mapping = approaches[0]
+    assert name == "adt_7[pending_limit_days=20,spread=0]"
+    assert mapping["A"]["trailing_stop_pct"] == 7.0 and mapping["A"]["pending_limit_days"] == 20
+    assert mapping["B"]["spread"] == 0.0
+    assert approaches[-3][1]["A"]["trailing_stop_pct"] == 8.0
+    assert approaches[-1] == ("fixed", {"A": {"strategy": STRATEGY_MAP["advanced_daytrading"], "spread": 0.0,
+                                              "expense_ratio": 0.0, "limit_buy_discount_pct": 2}})
+    names = [n for n, _ in approaches]
+    assert len(set(names)) == len(names)
+
+    # Variants are built on access and do not share settings.
+    approaches[0][1]["A"]["trailing_stop_pct"] = 99
+    assert approaches[0][1]["A"]["trailing_stop_pct"] == 7.0
+    # Nor do approaches without ranges.
+    approaches[-1][1]["A"]["spread"] = 5.0
+    assert approaches[-1][1]["A"]["spread"] == 0.0
+
+
+def test_variant_names_are_distinct(tmp_path):
+    cfg = tmp_path / "cfg.txt"
+    cfg.write_text(
+        """\
+        years=1
+        stepsize=1
+        approach=A
+            ticker=A, strategy=advanced_daytrading, trailing_stop_pct=1000000:1000003:0.5
+        """
+    )
+    _, _, approaches = parse_config_file(str(cfg))
+    names = [n for n, _ in approaches]
+    assert len(set(names)) == len(names) == 7
+    assert names[1] == "A[trailing_stop_pct=1000000.5]"
+
+    # A name used twice would let one result overwrite the other.
+    cfg.write_text(cfg.read_text().replace("trailing_stop_pct=1000000:1000003:0.5",
+                                           "trailing_stop_pct=7\n    approach=A\n"
+                                           "    ticker=B, strategy=buy_hold"))
+    with pytest.raises(ValueError, match="Two approaches are named 'A'"):
+        parse_config_file(str(cfg))
+
+
+def test_strategy_parameters_reach_the_portfolio(tmp_path):
+    from stock_market_simulator.simulation.simulator import HybridMultiFundPortfolio
+
+    cfg = tmp_path / "cfg.txt"
+    cfg.write_text(
+        """\
+        years=1
+        stepsize=1
+        approach=adt
+            ticker=A, strategy=advanced_daytrading, trailing_stop_pct=6, pending_limit_days=12
+        """
+    )
+    _, _, approaches = parse_config_file(str(cfg))
+    pf = HybridMultiFundPortfolio(approaches[0][1]).sub_portfolios[0][1]
+    assert pf.advanced_params == {"trailing_stop_pct": 6, "pending_limit_days": 12}
+
+    for bad in ("trailing_stop_pct=abc", "trailing_stop_pct=9:1:1"):
+        cfg.write_text(cfg.read_text().replace("trailing_stop_pct=6", bad))
+        with pytest.raises(ValueError):
+            parse_config_file(str(cfg))
+        cfg.write_text(cfg.read_text().replace(bad, "trailing_stop_pct=6"))
+
+    cfg.write_text(cfg.read_text().replace("approach=adt", "approach=adt_{spread}"))
+    with pytest.raises(ValueError, match="unknown range"):
+        parse_config_file(str(cfg))
+
+    cfg.write_text(cfg.read_text().replace("advanced_daytrading", "buy_hold"))
+    with pytest.raises(ValueError, match="takes no parameter"):
+        parse_config_file(str(cfg))
+
+
+@pytest.mark.parametrize("setting, error", [
+    ("trailing_stp_pct=7", "Unknown ticker parameter 'trailing_stp_pct'"),
+    ("spread=wide", "Invalid spread value"),
+    ("expense_ratio=", "Invalid expense_ratio value"),
+    ("weight=sixty", "Invalid weight value"),
+    ("execution=intraday", "Unknown execution mode"),
+    ("ohlc", "Expected key=value"),
+])
+def test_bad_ticker_settings_raise(tmp_path, setting, error):
+    cfg = tmp_path / "cfg.txt"
+    cfg.write_text(
+        f"""\
+        years=1
+        stepsize=1
+        approach=demo
+            ticker=QQQ, strategy=advanced_daytrading, {setting}
+        """
+    )
+    with pytest.raises(ValueError, match=error):
+        parse_config_file(str(cfg))
+
+    cfg.write_text(cfg.read_text().replace("advanced_daytrading", "no_such_strategy"))
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        parse_config_file(str(cfg))
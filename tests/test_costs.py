@@ -0,0 +1,132 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.simulation import costs
+from stock_market_simulator.simulation.execution import execute_orders
+from stock_market_simulator.simulation.multi_asset import run_rebalancing_window
+from stock_market_simulator.simulation.portfolio import Order, Portfolio
+from stock_market_simulator.simulation.simulator import run_configured_sweep
+from stock_market_simulator.utils.config_parser import parse_config_file
+
+MODELS = [
+    costs.VolumeSlippage(0.2),
+    costs.VolumeSlippage(1.0, exponent=1.0),
+    costs.PercentCommission(0.1, minimum=2.0),
+    costs.PerShareCommission(0.01, minimum=1.0, max_pct=0.5),
+    costs.FlatCommission(4.95),
+    costs.CombinedCosts(costs.VolumeSlippage(0.1), costs.PerShareCommission(0.005, 1.0)),
+]
+
+
+@pytest.mark.parametrize("model", MODELS, ids=repr)
+def test_batched_form_matches_scalar_form(model):
+    rng = np.random.default_rng(0)
+    prices = rng.uniform(5, 500, 200)
+    quantities = rng.uniform(0, 5000, 200)
+    quantities[:5] = 0.0
+    volumes = rng.uniform(1e3, 1e6, 200)
+    volumes[5:10] = np.nan
+    volumes[10:15] = 0.0
+    notionals = prices * quantities
+
+    slip = [model.slippage(p, q, None if np.isnan(v) else v) for p, q, v in zip(prices, quantities, volumes)]
+    fees = [model.commission(n, q) for n, q in zip(notionals, quantities)]
+    np.testing.assert_allclose(model.slippage_batch(prices, quantities, volumes), slip, rtol=1e-12)
+    np.testing.assert_allclose(model.commission_batch(notionals, quantities), fees, rtol=1e-12)
+
+
+def test_buy_fill_stays_within_cash():
+    for model in MODELS[2:]:
+        for cash in (50.0, 1000.0, 1e6):
+            shares, spent = costs.buy_fill(model, cash, 20.0, None, 1e5)
+            assert spent <= cash
+            assert shares == 0 or cash - spent < max(0.01 * cash, 1e-9) + 5.0
+    assert costs.buy_fill(costs.FlatCommission(10.0), 5.0, 20.0, None, None) == (0.0, 0.0)
+
+
+def test_execute_orders_charges_slippage_and_commission():
+    pf = Portfolio(initial_cash=1000.0)
+    pf.spread = 1.0
+    pf.costs = costs.CombinedCosts(costs.VolumeSlippage(1.0, exponent=1.0), costs.FlatCommission(5.0))
+    pf.bar_volume = 100.0
+    pf.orders.append(Order("buy", "market"))
+    execute_orders(10.0, pf, 0)
+
+    # 1000 / 10.05 ~ 99.5 shares intended -> ~99.5% participation -> ~1% impact.
+    fill = 10.05 * (1 + 0.01 * (1000.0 / 10.05) / 100.0)
+    assert pf.shares == pytest.approx((1000.0 - 5.0) / fill)
+    assert pf.cash == pytest.approx(0.0, abs=1e-9)
+
+    shares = pf.shares
+    pf.orders.append(Order("sell", "market"))
+    execute_orders(10.0, pf, 1)
+    assert pf.shares == 0
+    assert pf.cash == pytest.approx(shares * 9.95 * (1 - 0.01 * shares / 100.0) - 5.0)
+
+
+def test_rebalancing_uses_batched_costs():
+    close = np.array([[10.0, 20.0], [11.0, 19.0], [12.0, 18.0]])
+    plain = run_rebalancing_window(close, [0, 2], [0.5, 0.5], 1000.0)
+    flat = run_rebalancing_window(close, [0, 2], [0.5, 0.5], 1000.0,
+                                  costs=[costs.FlatCommission(1.0)] * 2)
+    # Two fills at the start, two at the rebalance (the first fees also
+    # shrink the positions that earn the return in between).
+    assert flat[0] == pytest.approx(plain[0] - 0.2)
+    assert plain[2] - 0.45 < flat[2] < plain[2] - 0.4
+
+    volume = np.full_like(close, 1000.0)
+    slipped = run_rebalancing_window(close, [0], [0.5, 0.5], 1000.0,
+                                     costs=[costs.VolumeSlippage(1.0), None], volume=volume)
+    assert slipped[-1] < plain[-1] and slipped[0] < 0
+
+
+def _frames(volume=True):
+    index = pd.bdate_range("2000-01-03", periods=700)
+    rng = np.random.default_rng(2)
+    close = 50 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+    df = pd.DataFrame({"Close": close}, index=index)
+    if volume:
+        df["Volume"] = 2000.0
+    return {"A": df}
+
+
+def test_sweep_costs_and_config(tmp_path):
+    cfg = tmp_path / "c.txt"
+    cfg.write_text(
+        "years=1\nstepsize=3\n"
+        "approach=plain\n  ticker=A, strategy=sma_trading, spread=0.1\n"
+        "approach=costly\n  ticker=A, strategy=sma_trading, spread=0.1, slippage=volume:0.5,"
+        " commission=per_share:0.01:1\n"
+        "approach=mix\n  rebalance=monthly\n  ticker=A, commission=percent:0.1\n"
+    )
+    _, _, approaches = parse_config_file(str(cfg))
+    info = dict(approaches)
+    assert info["costly"]["A"]["costs"] == costs.CombinedCosts(
+        costs.VolumeSlippage(0.5), costs.PerShareCommission(0.01, 1.0))
+    assert "costs" not in info["plain"]["A"]
+
+    dfs = _frames()
+    plain = run_configured_sweep(dfs, "plain", info["plain"], 1, 3)[1]
+    costly = run_configured_sweep(dfs, "costly", info["costly"], 1, 3)[1]
+    assert all(c[2] < p[2] for p, c in zip(plain, costly))
+    run_configured_sweep(dfs, "mix", info["mix"], 1, 3)
+
+    with pytest.raises(ValueError, match="Volume"):
+        run_configured_sweep(_frames(volume=False), "costly", info["costly"], 1, 3)
+
+    cfg.write_text("years=1\nstepsize=1\napproach=x\n  ticker=A, strategy=buy_hold, commission=tiered:1\n")
+    with pytest.raises(ValueError, match="commission"):
+        parse_config_file(str(cfg))
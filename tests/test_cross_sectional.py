@@ -0,0 +1,118 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.strategies.cross_sectional import (
+    CrossSectionalStrategy,
+    InverseVolatility,
+    MomentumTopN,
+    top_n_weights,
+)
+from stock_market_simulator.simulation.alignment import union_matrix
+from stock_market_simulator.simulation.multi_asset import fill_prices
+from stock_market_simulator.simulation.simulator import run_configured_sweep
+from stock_market_simulator.utils.config_parser import parse_config_file
+
+
+def _prices(n_bars=400, n_tickers=6, seed=1):
+    rng = np.random.default_rng(seed)
+    drift = np.linspace(-0.001, 0.001, n_tickers)
+    return 100 * np.exp(np.cumsum(rng.normal(drift, 0.01, (n_bars, n_tickers)), axis=0))
+
+
+def test_top_n_weights_skips_nan():
+    scores = np.array([
+        [0.1, 0.5, np.nan, 0.3],
+        [np.nan, np.nan, 0.2, np.nan],
+        [np.nan, np.nan, np.nan, np.nan],
+    ])
+    w = top_n_weights(scores, 2)
+    np.testing.assert_allclose(w[0], [0.0, 0.5, 0.0, 0.5])
+    np.testing.assert_allclose(w[1], [0.0, 0.0, 1.0, 0.0])
+    np.testing.assert_allclose(w[2], 0.0)
+
+
+def test_momentum_matches_per_row_reference():
+    close = _prices()
+    rows = np.arange(0, len(close), 21)
+    strat = MomentumTopN(top_n=2, lookback=60, skip=5)
+    w = strat.target_weights(close, rows)
+    for k, t in enumerate(rows):
+        if t < 65:
+            assert w[k].sum() == 0.0
+            continue
+        mom = close[t - 5] / close[t - 65] - 1
+        best = set(np.argsort(mom)[-2:])
+        assert set(np.flatnonzero(w[k])) == best
+        np.testing.assert_allclose(w[k], strat.weights(close[t], close[:t + 1]))
+
+
+def test_inverse_volatility_matches_numpy_std():
+    close = _prices()
+    rows = np.array([10, 100, 399])
+    w = InverseVolatility(lookback=20).target_weights(close, rows)
+    assert w[0].sum() == 0.0
+    for k, t in enumerate(rows[1:], start=1):
+        rets = close[t - 20 + 1:t + 1] / close[t - 20:t] - 1
+        inv = 1 / rets.std(axis=0, ddof=1)
+        np.testing.assert_allclose(w[k], inv / inv.sum())
+
+
+def test_default_target_weights_calls_weights():
+    class First(CrossSectionalStrategy):
+        def weights(self, row, history):
+            out = np.zeros(len(row))
+            out[0] = len(history)
+            return out
+
+    w = First().target_weights(np.ones((5, 3)), [0, 4])
+    np.testing.assert_allclose(w[:, 0], [1, 5])
+
+
+def test_union_matrix_and_fill_prices():
+    a = pd.DataFrame({"Close": [1.0, 2.0, 3.0]}, index=pd.to_datetime(["2020-01-01", "2020-01-02", "2020-01-03"]))
+    b = pd.DataFrame({"Close": [5.0]}, index=pd.to_datetime(["2020-01-02"]))
+    index, mat = union_matrix({"A": a, "B": b}, ["A", "B"])
+    assert len(index) == 3
+    assert np.isnan(mat[0, 1]) and np.isnan(mat[2, 1])
+    np.testing.assert_allclose(fill_prices(mat), [[1, 0], [2, 5], [3, 5]])
+
+
+def test_config_sweep_with_late_listing(tmp_path):
+    index = pd.bdate_range("2015-01-01", "2019-12-31")
+    close = _prices(len(index), 5)
+    dfs = {f"T{j}": pd.DataFrame({"Close": close[:, j]}, index=index) for j in range(5)}
+    # T4 lists two years late; the sweep must still start in 2015.
+    dfs["T4"] = dfs["T4"].loc["2017-01-01":]
+    (tmp_path / "universe.txt").write_text("\n".join(dfs) + "\n")
+    cfg = tmp_path / "cfg.txt"
+    cfg.write_text(
+        """\
+        years=2
+        stepsize=3
+        approach=mom
+            cross_sectional=momentum, top_n=2, lookback=63
+            universe=universe.txt
+        """
+    )
+    _, _, approaches = parse_config_file(str(cfg))
+    name, info = approaches[0]
+    assert list(info) == list(dfs)
+    assert isinstance(info["T0"]["cross_sectional"], MomentumTopN)
+    assert info["T0"]["rebalance"] == "monthly"
+
+    summary, runs, _ = run_configured_sweep(dfs, name, info, 2, 3)
+    assert runs[0][4] == index[0]
+    assert all(np.isfinite(r[2]) for r in runs)
@@ -1,5 +1,6 @@
 import os
 import sys
+import types
 from datetime import datetime as dt
 
 import pytest
@@ -7,7 +8,13 @@ import pytest
 pd = pytest.importorskip("pandas")
 
 
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+# Alias package name used by the absolute imports inside data_fetcher
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
 
 from data import data_fetcher
 
@@ -134,8 +141,44 @@ def test_update_ignores_empty_rows(tmp_path, monkeypatch):
     )
     assert list(result.index) == list(expected_dates)
 
-    # The CSV on disk should not contain any NaN rows
+    # The cache on disk (base CSV plus append segment) should not contain any
+    # NaN rows
+    csv_path = tmp_path / "TEST.csv"
+    segment_df = pd.read_csv(str(csv_path) + data_fetcher.SEGMENT_SUFFIX)
+    assert segment_df["Close"].isna().sum() == 0
+    assert len(pd.read_csv(csv_path)) + len(segment_df) == 4
+    assert len(data_fetcher.read_cached_csv(str(csv_path))) == 4
+
+
+def test_update_appends_segment_and_compacts(tmp_path, monkeypatch):
+    data_fetcher._data_cache.clear()
+    monkeypatch.setattr(data_fetcher, "SEGMENT_COMPACT_ROWS", 3)
     csv_path = tmp_path / "TEST.csv"
-    csv_df = pd.read_csv(csv_path)
-    assert csv_df["Close"].isna().sum() == 0
-    assert len(csv_df) == 4
+    segment_path = str(csv_path) + data_fetcher.SEGMENT_SUFFIX
+    data_fetcher.write_csv_atomic(_make_df(), str(csv_path))
+    base_bytes = csv_path.read_bytes()
+
+    df = data_fetcher.read_cached_csv(str(csv_path))
+    for day in (4, 5):
+        new_df = _make_df().iloc[:1]
+        new_df.index = pd.to_datetime([f"2020-01-0{day}"])
+        df = data_fetcher.merge_new_rows(df, new_df, str(csv_path))
+
+    # Updates below the threshold leave the base file untouched
+    assert csv_path.read_bytes() == base_bytes
+    assert len(pd.read_csv(segment_path)) == 2
+
+    # A torn trailing row (crash mid-append) is ignored by readers
+    with open(segment_path, "a") as f:
+        f.write("2020-01-06,1,1")
+    assert len(data_fetcher.read_cached_csv(str(csv_path))) == 5
+
+    new_df = _make_df().iloc[:1]
+    new_df.index = pd.to_datetime(["2020-01-06"])
+    df = data_fetcher.merge_new_rows(df, new_df, str(csv_path))
+
+    # Third segment row reaches the threshold and triggers compaction
+    assert not os.path.exists(segment_path)
+    on_disk = pd.read_csv(csv_path)
+    assert len(on_disk) == 6
+    assert list(pd.to_datetime(on_disk["Date"])) == list(df.index)
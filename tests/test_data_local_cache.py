@@ -0,0 +1,75 @@
+import os
+import sys
+import types
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.data.data_local_cache import LRUCache, estimate_nbytes
+
+
+def _arr(n_bytes):
+    return np.zeros(n_bytes // 8)
+
+
+def test_lru_eviction_respects_budget_and_recency():
+    cache = LRUCache(max_bytes=3000)
+    cache.put("a", _arr(1000))
+    cache.put("b", _arr(1000))
+    cache.put("c", _arr(1000))
+    assert cache.get("a") is not None  # "a" becomes most recently used
+
+    cache.put("d", _arr(1000))
+
+    assert "b" not in cache
+    assert all(k in cache for k in ("a", "c", "d"))
+    stats = cache.stats()
+    assert stats["bytes"] == 3000
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 1
+    assert cache.get("b") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_shrinking_budget_and_oversized_items():
+    cache = LRUCache(max_bytes=4000)
+    for k in "abcd":
+        cache.put(k, _arr(1000))
+
+    cache.max_bytes = 2000
+    assert len(cache) == 2
+    assert cache.current_bytes == 2000
+
+    cache.put("huge", _arr(8000))
+    assert "huge" not in cache
+    assert len(cache) == 2
+
+
+def test_weak_mode_revives_entries_still_referenced():
+    cache = LRUCache(max_bytes=1000, weak=True)
+    held = _arr(1000)
+    cache.put("held", held)
+    cache.put("other", _arr(1000))  # evicts "held" to the weak map
+
+    assert cache.current_bytes == 1000
+    assert cache.get("held") is held
+    assert cache.stats()["hits"] == 1
+
+    cache.put("other", _arr(1000))
+    del held
+    cache.put("third", _arr(1000))  # evicts "other", nobody holds it
+    assert cache.get("other") is None
+
+
+def test_estimate_nbytes_dataframe():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"Close": np.zeros(100)}, index=pd.RangeIndex(100))
+    assert estimate_nbytes(df) == df.memory_usage(index=True).sum()
@@ -0,0 +1,78 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.data.sources import (
+    DirectorySource,
+    SQLiteSource,
+    SyntheticGBMSource,
+    EXPECTED_COLUMNS,
+)
+
+
+def _synth():
+    return SyntheticGBMSource(origin="2020-01-01", end="2020-03-31", seed=7)
+
+
+def test_synthetic_source_is_deterministic_and_consistent():
+    src = _synth()
+    full = src.fetch("^GSPC", "2020-01-01")
+    again = _synth().fetch("^GSPC", "2020-01-01")
+    tail = src.fetch("^GSPC", "2020-02-01")
+
+    pd.testing.assert_frame_equal(full, again)
+    pd.testing.assert_frame_equal(tail, full.loc["2020-02-01":])
+    assert list(full.columns) == EXPECTED_COLUMNS[1:]
+    assert (full.index.dayofweek < 5).all()
+    assert (full["High"] >= full[["Open", "Close"]].max(axis=1)).all()
+    assert (full["Low"] <= full[["Open", "Close"]].min(axis=1)).all()
+    assert not full["Close"].equals(src.fetch("^IXIC", "2020-01-01")["Close"])
+
+
+def test_sqlite_source_roundtrip(tmp_path):
+    src = _synth()
+    db = SQLiteSource(str(tmp_path / "prices.sqlite"))
+    for tk in ("AAA", "BBB"):
+        db.store(tk, src.generate(tk))
+    # Re-storing overlapping rows must not duplicate the (ticker, date) key
+    db.store("AAA", src.generate("AAA").iloc[-5:])
+
+    assert db.tickers() == ["AAA", "BBB"]
+    frames = db.fetch_many(["AAA", "BBB", "MISSING"], "2020-02-01")
+    expected = src.fetch("AAA", "2020-02-01")
+    pd.testing.assert_frame_equal(frames["AAA"], expected, check_freq=False, check_names=False)
+    assert frames["MISSING"].empty
+
+
+def test_directory_source_reads_csv(tmp_path):
+    src = _synth()
+    df = src.generate("^GSPC")
+    df.reset_index().to_csv(tmp_path / "_GSPC.csv", index=False)
+
+    loaded = DirectorySource(str(tmp_path)).fetch("^GSPC", "2020-03-01")
+
+    assert len(loaded) == len(df.loc["2020-03-01":])
+    assert loaded["Close"].iloc[0] == pytest.approx(df.loc["2020-03-01":, "Close"].iloc[0])
+    assert DirectorySource(str(tmp_path)).fetch("NOPE", "2020-01-01").empty
+
+
+def test_directory_source_reads_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = _synth().generate("QQQ")
+    df.reset_index().to_parquet(tmp_path / "QQQ.parquet", index=False)
+
+    loaded = DirectorySource(str(tmp_path)).fetch("QQQ", "2020-01-01")
+
+    assert list(loaded.columns) == EXPECTED_COLUMNS[1:]
+    assert len(loaded) == len(df)
@@ -0,0 +1,157 @@
+import os
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.data.sources import SyntheticGBMSource
+from stock_market_simulator.optimization.parameter_sweeper import (
+    full_parameter_sweep_advanced_daytrading,
+    metric_cagr,
+)
+from stock_market_simulator.simulation import distributed
+from stock_market_simulator.simulation.distributed import Spool, SpoolWorker, run_tasks
+from stock_market_simulator.simulation.simulator import run_configured_sweep
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+
+def _dfs():
+    synth = SyntheticGBMSource(origin="2005-01-01", end="2010-12-31")
+    return {tk: synth.generate(tk) for tk in ("AAA", "BBB")}
+
+
+def _last_close(dfs, scale):
+    return {tk: float(df["Close"].iloc[-1]) * scale for tk, df in dfs.items()}
+
+
+def _fail(dfs):
+    raise ValueError("bad task")
+
+
+def _slow(dfs, secs):
+    time.sleep(secs)
+    return secs
+
+
+def _worker_thread(spool_dir, **kwargs):
+    worker = SpoolWorker(spool_dir, poll=0.01, **kwargs)
+    thread = threading.Thread(target=worker.run, kwargs={"idle_exit": 1.0})
+    thread.start()
+    return worker, thread
+
+
+def test_sweep_on_local_worker_processes_matches_local_run(tmp_path):
+    dfs = _dfs()
+    info = {"AAA": {"strategy": STRATEGY_MAP["sma_trading"], "spread": 0.05},
+            "BBB": {"strategy": STRATEGY_MAP["buy_hold"], "expense_ratio": 0.1}}
+    spool_dir = str(tmp_path / "spool")
+    procs = distributed.start_local_workers(spool_dir, 3)
+    try:
+        hists, remote_hists = [], []
+        local = run_configured_sweep(dfs, "pair", info, 2, 1, histories=hists)
+        remote = run_configured_sweep(dfs, "pair", info, 2, 1, histories=remote_hists, spool_dir=spool_dir)
+    finally:
+        Spool(spool_dir).stop()
+        for p in procs:
+            p.join(10)
+    assert remote == local
+    assert remote_hists == hists
+    assert all(p.exitcode == 0 for p in procs)
+    # Nothing of the job is left behind but the shared blobs.
+    assert not any(os.listdir(os.path.join(spool_dir, sub)) for sub in ("jobs", "tasks", "claimed", "results"))
+
+
+def test_parameter_sweep_on_spool_matches_process_pool(tmp_path):
+    dfs = {"AAA": _dfs()["AAA"]}
+    info = {"AAA": {"strategy": STRATEGY_MAP["advanced_daytrading"], "spread": 0.05}}
+    grid = ([4], 10000.0, [7.0, 9.0], [4.0], [30, 50])
+    pooled = full_parameter_sweep_advanced_daytrading(info, dfs, *grid, metric_selector=metric_cagr,
+                                                      max_workers=1)
+    spool_dir = str(tmp_path / "spool")
+    procs = distributed.start_local_workers(spool_dir, 2)
+    try:
+        spooled = full_parameter_sweep_advanced_daytrading(info, dfs, *grid, metric_selector=metric_cagr,
+                                                           spool_dir=spool_dir)
+    finally:
+        Spool(spool_dir).stop()
+        for p in procs:
+            p.join(10)
+    assert spooled == pooled
+
+
+def test_worker_fetches_each_frame_once(tmp_path):
+    dfs = _dfs()
+    calls = [(_last_close, ["AAA", "BBB"], (i,)) for i in range(5)] + [(_last_close, ["AAA"], (1,))]
+    worker, thread = _worker_thread(str(tmp_path))
+    results = dict(run_tasks(str(tmp_path), dfs, calls, timeout=10))
+    thread.join()
+    assert results[3] == _last_close(dfs, 3)
+    assert results[5] == _last_close({"AAA": dfs["AAA"]}, 1)
+    assert worker.fetches == 2
+    assert len(os.listdir(tmp_path / "blobs")) == 2
+
+
+def test_task_errors_timeouts_and_lost_workers(tmp_path):
+    dfs = _dfs()
+    spool_dir = str(tmp_path)
+    with pytest.raises(TimeoutError):
+        list(run_tasks(spool_dir, dfs, [(_last_close, ["AAA"], (1,))], timeout=0.2))
+    # The abandoned task was withdrawn, so a worker finds nothing to do.
+    assert os.listdir(tmp_path / "tasks") == []
+
+    worker, thread = _worker_thread(spool_dir)
+    with pytest.raises(ValueError, match="bad task"):
+        list(run_tasks(spool_dir, dfs, [(_fail, ["AAA"], ())], timeout=10))
+    thread.join()
+
+    # A worker that claims a task and dies: the claim is never touched again
+    # and the task goes back to the queue after the lease.
+    spool = Spool(spool_dir)
+    gen = run_tasks(spool_dir, dfs, [(_last_close, ["BBB"], (2,))], timeout=10, lease=0.2)
+    threads = []
+
+    def claim_and_die():
+        while spool.claim("dead-host") is None:
+            threading.Event().wait(0.01)
+        threads.append(_worker_thread(spool_dir)[1])
+
+    killer = threading.Thread(target=claim_and_die)
+    killer.start()
+    assert list(gen) == [(0, _last_close({"BBB": dfs["BBB"]}, 2))]
+    killer.join()
+    threads[0].join()
+
+
+def test_idle_timeout_and_cleanup(tmp_path):
+    dfs = _dfs()
+    info = {"AAA": {"strategy": STRATEGY_MAP["buy_hold"]}}
+    spool_dir = str(tmp_path)
+    # Nobody is serving the spool: the sweep gives up instead of hanging.
+    with pytest.raises(TimeoutError, match="start workers"):
+        run_configured_sweep(dfs, "hold", info, 2, 1, spool_dir=spool_dir, spool_timeout=0.3)
+
+    # A task that runs longer than the timeout is fine while its worker is
+    # alive and touching the claim.
+    worker, thread = _worker_thread(spool_dir, heartbeat=0.05)
+    assert list(run_tasks(spool_dir, dfs, [(_slow, ["AAA"], (1.0,))], timeout=0.4)) == [(0, 1.0)]
+    thread.join()
+
+    spool = Spool(spool_dir)
+    assert os.listdir(tmp_path / "blobs")
+    job = spool.open_job()
+    assert spool.clean() is None
+    spool.close_job(job)
+    assert spool.clean() >= 1
+    assert not os.listdir(tmp_path / "blobs")
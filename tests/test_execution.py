@@ -70,3 +70,111 @@ def test_execute_orders_market_limit_trailing():
     assert pf.cash == pytest.approx(1600.0)
     assert pf.orders == []
 
+
+
+def _bar_pf(cash=1000.0, shares=0.0):
+    pf = Portfolio(initial_cash=cash)
+    pf.shares = shares
+    return pf
+
+
+def test_ohlc_market_order_fills_at_open():
+    pf = _bar_pf()
+    pf.orders.append(Order(side="buy", order_type="market"))
+    execute_orders(12.0, pf, 0, bar=(10.0, 13.0, 9.0, 12.0))
+    assert pf.shares == pytest.approx(100.0)
+
+
+def test_ohlc_limit_buy_fills_intraday_at_limit():
+    pf = _bar_pf()
+    pf.orders.append(Order(side="buy", order_type="limit", limit_price=9.5))
+    # Close-only execution would not fill: the close is above the limit.
+    execute_orders(10.5, pf, 0, bar=(10.0, 11.0, 9.0, 10.5))
+    assert pf.orders == []
+    assert pf.shares == pytest.approx(1000.0 / 9.5)
+
+
+def test_ohlc_stop_sell_gap_fills_at_open():
+    pf = _bar_pf(cash=0.0, shares=10.0)
+    pf.orders.append(Order(side="sell", order_type="stop", stop_price=9.0))
+    execute_orders(8.5, pf, 0, bar=(8.0, 9.5, 7.5, 8.5))
+    assert pf.cash == pytest.approx(80.0)
+
+
+def test_ohlc_trailing_stop_triggers_on_low():
+    pf = _bar_pf(cash=0.0, shares=10.0)
+    ts = Order(side="sell", order_type="trailing_stop", trail_percent=10.0)
+    ts.highest_price = 20.0
+    pf.orders.append(ts)
+    # High does not raise the trigger (19.5 < 20); the low breaches 18.
+    execute_orders(19.0, pf, 0, bar=(19.0, 19.5, 17.0, 19.0))
+    assert pf.orders == []
+    assert pf.cash == pytest.approx(180.0)
+
+    pf = _bar_pf(cash=0.0, shares=10.0)
+    ts = Order(side="sell", order_type="trailing_stop", trail_percent=10.0)
+    ts.highest_price = 20.0
+    pf.orders.append(ts)
+    execute_orders(21.0, pf, 1, bar=(20.0, 22.0, 19.9, 21.0))
+    assert ts in pf.orders
+    assert ts.highest_price == pytest.approx(22.0)
+
+
+def test_window_paths_match_bar_path():
+    from simulation.execution import bar_path, window_paths
+
+    bars = [(10.0, 12.0, 9.0, 11.0), (11.0, 11.5, 8.0, 9.0)]
+    buy, sell = window_paths(*zip(*bars), spread=1.0)
+    for bar, b, s in zip(bars, buy, sell):
+        path = bar_path(*bar)
+        assert b == pytest.approx([p * 1.005 for p in path])
+        assert s == pytest.approx([p * 0.995 for p in path])
+
+
+def test_ohlc_mode_on_flat_bars_matches_close_mode():
+    # Without intraday range, OHLC execution must reproduce close-only fills.
+    pd = pytest.importorskip("pandas")
+    np = pytest.importorskip("numpy")
+    from stock_market_simulator.simulation.simulator import run_configured_sweep
+    from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+    index = pd.bdate_range("2010-01-01", periods=900)
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"Close": 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))}, index=index)
+    results = []
+    for mode in ("close", "ohlc"):
+        info = {"T": {"strategy": STRATEGY_MAP["advanced_daytrading"], "spread": 0.1, "execution": mode}}
+        results.append(run_configured_sweep({"T": df}, mode, info, 1, 2)[1])
+    assert results[0] == results[1]
+
+
+def test_sub_portfolio_values_match_reference_loop():
+    # The reference is the original per-bar loop: execute, strategy, then a
+    # full valuation for the expense fee and another for the bar's total.
+    pd = pytest.importorskip("pandas")
+    np = pytest.importorskip("numpy")
+    from stock_market_simulator.simulation.simulator import HybridMultiFundPortfolio, run_hybrid_multi_fund
+    from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+    rng = np.random.default_rng(4)
+    index = pd.bdate_range("2000-01-03", periods=400)
+    dfs = {}
+    for tk in ("A", "B"):
+        close = 40 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, len(index))))
+        dfs[tk] = pd.DataFrame({"Open": close * 0.999, "High": close * 1.01, "Low": close * 0.99,
+                                "Close": close}, index=index)
+    info = {"A": {"strategy": STRATEGY_MAP["advanced_daytrading"], "spread": 0.05, "expense_ratio": 0.75},
+            "B": {"strategy": STRATEGY_MAP["buy_hold"], "spread": 0.05, "expense_ratio": 0.2}}
+    ref = HybridMultiFundPortfolio(info, initial_cash=5000.0)
+    expected = []
+    for day_i, dt in enumerate(index):
+        prices = {tk: float(df["Close"].iloc[day_i]) for tk, df in dfs.items()}
+        for sym, pf in ref.sub_portfolios:
+            if pf.orders:
+                execute_orders(prices[sym], pf, day_i)
+            ref.strategies_for_tickers[sym](pf, dt, prices[sym], day_i)
+            pf.cash -= pf.total_value(prices[sym]) * (pf.expense_ratio / 100.0) / 365.0
+        expected.append((ref.total_value(prices) - 5000.0) / 5000.0 * 100)
+
+    hist, _ = run_hybrid_multi_fund(dfs, HybridMultiFundPortfolio(info, initial_cash=5000.0))
+    assert hist == expected
@@ -0,0 +1,39 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Same aliasing as the other tests, but in a fresh interpreter so modules
+# imported by earlier tests do not leak into the check.
+PROBE = """
+import sys, types
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [{root!r}]
+sys.modules["stock_market_simulator"] = pkg
+import stock_market_simulator.{module}
+print(",".join(m for m in ("matplotlib", "fpdf", "yfinance", "tkinter", "tqdm") if m in sys.modules))
+"""
+
+
+@pytest.mark.parametrize("module", [
+    "simulation.simulator",
+    "strategies.base_strategies",
+    "utils.config_parser",
+    "data.data_fetcher",
+    "main",
+    "batch_runner",
+    "optimization.parameter_sweeper",
+    "simulation.distributed",
+])
+def test_module_imports_without_plotting_or_network_stack(module):
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(root=ROOT_DIR, module=module)],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+    assert out == ""
@@ -0,0 +1,98 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.simulation.costs import FlatCommission
+from stock_market_simulator.simulation.ledger import TradeLedger, export_trades, trade_metrics
+from stock_market_simulator.simulation.simulator import (
+    HybridMultiFundPortfolio,
+    run_hybrid_multi_fund,
+    run_sweep_windows,
+)
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+
+def _frames(n=500):
+    index = pd.bdate_range("2001-01-01", periods=n)
+    rng = np.random.default_rng(11)
+    close = 30 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return {"X": pd.DataFrame({"Open": close, "High": close * 1.02, "Low": close * 0.98, "Close": close},
+                              index=index)}
+
+
+def test_buffers_grow_geometrically():
+    ledger = TradeLedger(capacity=2)
+    for i in range(5):
+        ledger.record(i, "buy" if i % 2 == 0 else "sell", "limit", 1.0 + i, 10.0 * i, 0.5)
+    assert len(ledger) == 5 and ledger.capacity == 8
+    cols = ledger.columns()
+    assert cols["bar"].tolist() == [0, 1, 2, 3, 4]
+    assert cols["quantity"].tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+    df = ledger.to_frame()
+    assert df["side"].tolist() == ["buy", "sell", "buy", "sell", "buy"]
+    assert set(df["type"]) == {"limit"}
+    assert ledger.metrics([100.0, 100.0]) == {
+        "trades": 5, "buys": 3, "sells": 2, "traded_value": 400.0, "fees": 2.5, "turnover": 4.0}
+
+
+@pytest.mark.parametrize("execution", ["close", "ohlc"])
+def test_ledger_replays_the_portfolio(execution):
+    dfs = _frames()
+    info = {"X": {"strategy": STRATEGY_MAP["advanced_daytrading"], "spread": 0.2, "expense_ratio": 0.0,
+                  "execution": execution, "costs": FlatCommission(1.0)}}
+    plain, _ = run_hybrid_multi_fund(dfs, HybridMultiFundPortfolio(info, 1000.0))
+    pf = HybridMultiFundPortfolio(info, 1000.0, record_trades=True)
+    hist, index = run_hybrid_multi_fund(dfs, pf)
+    # Recording does not change the simulation.
+    assert hist == plain
+
+    ledger = pf.ledgers["X"]
+    df = ledger.to_frame(index)
+    assert len(df) > 4 and set(df["side"]) == {"buy", "sell"}
+    assert (np.diff(df["bar"]) >= 0).all()
+    assert (df["date"] == index[df["bar"]]).all()
+    assert (df["fee"] == 1.0).all()
+
+    # Replaying the fills reproduces the final shares and cash.
+    sign = np.where(df["side"] == "buy", 1.0, -1.0)
+    sub = pf.sub_portfolios[0][1]
+    assert (sign * df["quantity"]).sum() == pytest.approx(sub.shares, abs=1e-9)
+    cash = 1000.0 - (sign * df["notional"]).sum() - df["fee"].sum()
+    assert cash == pytest.approx(sub.cash)
+
+
+def test_sweep_trades_and_export(tmp_path):
+    dfs = _frames()
+    info = {"X": {"strategy": STRATEGY_MAP["sma_trading"], "spread": 0.1}}
+    trades, histories = [], []
+    rows = run_sweep_windows(dfs, "sma", info, 1, 3, trades=trades, histories=histories)
+    assert len(trades) == len(rows) == len(histories)
+    assert all(set(t) == {"X"} for t in trades)
+
+    values = [10000.0 * (1 + pct / 100.0) for pct in histories[0]]
+    stats = trade_metrics(trades[0], values)
+    assert stats["trades"] == len(trades[0]["X"]) > 0
+    assert stats["turnover"] > 0
+
+    df = export_trades(trades[0], str(tmp_path / "w.csv"))
+    back = pd.read_csv(tmp_path / "w.csv", float_precision="round_trip")
+    assert back.columns.tolist() == ["ticker", "bar", "side", "type", "quantity", "price", "fee", "notional"]
+    np.testing.assert_array_equal(back["price"].to_numpy(), df["price"].to_numpy())
+    with pytest.raises(ValueError):
+        export_trades(trades[0], str(tmp_path / "w.xlsx"))
+
+    pytest.importorskip("pyarrow")
+    export_trades(trades[0], str(tmp_path / "w.parquet"))
+    assert pd.read_parquet(tmp_path / "w.parquet")["side"].tolist() == df["side"].astype(str).tolist()
@@ -0,0 +1,128 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.simulation.costs import PercentCommission
+from stock_market_simulator.simulation.legs import LegCache, group_by_legs, leg_keys
+from stock_market_simulator.simulation.simulator import (
+    run_configured_sweep,
+    run_shared_sweeps,
+    run_shared_windows,
+)
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+
+def _frames():
+    rng = np.random.default_rng(4)
+    frames = {}
+    for tk, start, n in (("A", "2000-01-03", 900), ("B", "2000-01-03", 900), ("C", "2000-06-01", 700)):
+        index = pd.bdate_range(start, periods=n)
+        close = 40 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, n)))
+        frames[tk] = pd.DataFrame({"Open": close * 0.999, "High": close * 1.01, "Low": close * 0.99,
+                                   "Close": close}, index=index)
+    return frames
+
+
+def _info(strategy, **extra):
+    return dict({"strategy": STRATEGY_MAP[strategy], "spread": 0.05, "expense_ratio": 0.2}, **extra)
+
+
+APPROACHES = [
+    ("hold_sma", {"A": _info("buy_hold"), "B": _info("sma_trading")}),
+    ("hold_rsi", {"A": _info("buy_hold"), "B": _info("rsi")}),
+    ("hold_adt", {"A": _info("buy_hold"), "C": _info("advanced_daytrading", execution="ohlc",
+                                                     costs=PercentCommission(0.1, 1.0))}),
+    ("adt_alone", {"C": _info("advanced_daytrading", execution="ohlc", costs=PercentCommission(0.1, 1.0)),
+                   "B": _info("momentum_breakout")}),
+    ("mix", {"A": {"strategy": STRATEGY_MAP["buy_hold"], "weight": 0.5, "rebalance": "monthly"},
+             "B": {"strategy": STRATEGY_MAP["buy_hold"], "weight": 0.5, "rebalance": "monthly"}}),
+]
+
+
+def test_shared_sweeps_match_separate_sweeps():
+    dfs = _frames()
+    legs = LegCache()
+    histories = {}
+    shared = run_shared_sweeps(dfs, APPROACHES, 1, 2, histories=histories, legs=legs)
+    assert list(shared) == [name for name, _ in APPROACHES]
+    for name, info in APPROACHES:
+        separate = []
+        expected = run_configured_sweep({tk: dfs[tk] for tk in info}, name, info, 1, 2, histories=separate)
+        assert shared[name] == expected
+        assert histories[name] == separate
+    # "A buy_hold" is simulated once for both A+B approaches; the C leg of
+    # "hold_adt" and "adt_alone" is shared where their windows coincide.
+    assert legs.hits >= len(shared["hold_rsi"][1]) + 1
+    assert len(legs) == 0
+
+
+def test_failing_approach_does_not_stop_the_others():
+    dfs = _frames()
+    dfs["D"] = pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.bdate_range("1990-01-01", periods=2))
+    approaches = APPROACHES[:2] + [("late", {"A": _info("buy_hold"), "D": _info("buy_hold")})]
+    shared = run_shared_sweeps(dfs, approaches, 1, 2)
+    assert isinstance(shared["late"], ValueError)
+    ref = {tk: dfs[tk] for tk in APPROACHES[0][1]}
+    assert shared["hold_sma"][1] == run_configured_sweep(ref, "hold_sma", APPROACHES[0][1], 1, 2)[1]
+
+
+def test_parts_of_a_group_stitch_into_the_whole_sweep():
+    dfs = _frames()
+    whole_hists, part_hists = {}, {}
+    whole = run_shared_windows(dfs, APPROACHES, 1, 1, histories=whole_hists)
+    stitched = {name: [] for name, _ in APPROACHES}
+    for i in range(3):
+        hists = {}
+        for name, rows in run_shared_windows(dfs, APPROACHES, 1, 1, histories=hists, part=(i, 3)).items():
+            stitched[name] += rows
+            part_hists.setdefault(name, []).extend(hists[name])
+    assert stitched == whole
+    assert part_hists == whole_hists
+
+
+def test_main_groups_use_the_pool_and_isolate_load_errors(monkeypatch):
+    import stock_market_simulator.main as main
+
+    dfs = _frames()
+
+    def load(tk):
+        if tk == "C":
+            raise OSError("no data for C")
+        return dfs[tk]
+
+    monkeypatch.setattr(main, "load_historical_data", load)
+    groups = group_by_legs(APPROACHES)
+    assert main.group_parts(groups, 1) == [1, 1]
+    assert main.group_parts(groups, 2) == [6, 2]
+
+    results = main.run_groups(groups, 1, 2, keep_histories=True, workers=2)
+    assert isinstance(results["hold_adt"], OSError) and isinstance(results["adt_alone"], OSError)
+    for name, info in APPROACHES:
+        if name in ("hold_adt", "adt_alone"):
+            continue
+        separate = []
+        expected = run_configured_sweep({tk: dfs[tk] for tk in info}, name, info, 1, 2, histories=separate)
+        assert results[name] == expected + (separate,)
+
+
+def test_group_by_legs():
+    groups = group_by_legs(APPROACHES)
+    assert [[name for name, _ in g] for g in groups] == [
+        ["hold_sma", "hold_rsi", "hold_adt", "adt_alone"], ["mix"]]
+    # The same settings with another share of the cash are a different leg.
+    solo = ("solo", {"A": _info("buy_hold")})
+    assert len(group_by_legs([APPROACHES[0], solo])) == 2
+    assert leg_keys(solo[1])[0] != leg_keys(APPROACHES[0][1])[0]
+
@@ -0,0 +1,95 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.simulation import monte_carlo
+from stock_market_simulator.simulation.costs import VolumeSlippage
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+
+def _dfs(n=600):
+    index = pd.bdate_range("2005-01-03", periods=n)
+    rng = np.random.default_rng(7)
+    a = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.01, n)))
+    b = 50 * np.exp(np.cumsum(rng.normal(0.0001, 0.02, n)))
+    b[10] = np.nan
+    return {"A": pd.DataFrame({"Close": a}, index=index), "B": pd.DataFrame({"Close": b}, index=index)}
+
+
+def test_bootstrap_paths_reuse_joint_historical_blocks():
+    returns, last_close = monte_carlo.log_returns(_dfs(), ["A", "B"])
+    assert not np.isnan(returns).any()
+    paths = monte_carlo.generate_paths(returns, last_close, 3, 50, np.random.default_rng(0), block_size=10)
+    assert paths.shape == (3, 50, 2)
+
+    sampled = np.diff(np.log(np.concatenate([np.broadcast_to(last_close, (3, 1, 2)), paths], axis=1)), axis=1)
+    for block in sampled[:, :10].reshape(-1, 10, 2)[:, 0]:
+        # Both tickers take the return of the same historical day.
+        day = np.flatnonzero(np.isclose(returns[:, 0], block[0]))
+        assert any(np.isclose(returns[d, 1], block[1]) for d in day)
+
+
+def test_gbm_matches_historical_moments():
+    returns, last_close = monte_carlo.log_returns(_dfs(), ["A", "B"])
+    paths = monte_carlo.generate_paths(returns, last_close, 400, 250, np.random.default_rng(1), method="gbm")
+    sampled = np.diff(np.log(paths), axis=1).reshape(-1, 2)
+    np.testing.assert_allclose(sampled.std(axis=0), returns.std(axis=0), rtol=0.02)
+    with pytest.raises(ValueError):
+        monte_carlo.generate_paths(returns, last_close, 1, 5, np.random.default_rng(1), method="nope")
+
+
+def test_results_match_direct_simulation_and_are_reproducible():
+    dfs = _dfs()
+    info = {"A": {"strategy": STRATEGY_MAP["sma_trading"], "spread": 0.1},
+            "B": {"strategy": STRATEGY_MAP["buy_hold"], "expense_ratio": 0.5}}
+    summary, rows, final_map = monte_carlo.run_monte_carlo(dfs, "mc", info, 1, n_paths=7, seed=3,
+                                                           batch_size=3, workers=1)
+    pooled = monte_carlo.run_monte_carlo(dfs, "mc", info, 1, n_paths=7, seed=3, batch_size=3, workers=2)
+    assert pooled[1] == rows and pooled[0] == summary
+
+    # Re-create the second batch by hand and simulate it path by path.
+    returns, last_close = monte_carlo.log_returns(dfs, ["A", "B"])
+    rng = np.random.default_rng(np.random.SeedSequence(3).spawn(3)[1])
+    prices = monte_carlo.generate_paths(returns, last_close, 3, 252, rng)
+    index = pd.bdate_range(dfs["A"].index[-1] + pd.offsets.BDay(), periods=252)
+    hist = monte_carlo.simulate_paths(prices, index, info)
+    assert [r[2] for r in rows[3:6]] == hist[:, -1].tolist()
+    assert [r[4] for r in rows] == list(range(7))
+    assert final_map == {r[4]: r[2] for r in rows}
+
+    dd = summary["max_drawdown"]
+    assert 0 <= dd["min_val"] <= dd["avg_val"] <= dd["max_val"]
+
+
+@pytest.mark.parametrize("setting, error", [
+    ({"costs": VolumeSlippage(0.1)}, "no Volume"),
+    ({"execution": "ohlc"}, "execution=ohlc is not supported"),
+])
+def test_settings_needing_more_than_closes_are_rejected(monkeypatch, setting, error):
+    dfs = _dfs()
+    dfs["A"]["Volume"] = 1e6
+    info = {"A": dict({"strategy": STRATEGY_MAP["advanced_daytrading"]}, **setting)}
+    # Rejected before any path is generated or a worker starts.
+    monkeypatch.setattr(monte_carlo, "generate_paths", None)
+    with pytest.raises(ValueError, match=error):
+        monte_carlo.run_monte_carlo(dfs, "mc", info, 1, n_paths=2, seed=0, workers=2)
+
+
+def test_path_metrics():
+    hist = np.array([[10.0, -12.0, 5.0, 21.0]])
+    lowest, highest, final, cagr, mdd = monte_carlo.path_metrics(hist, 2)
+    assert (lowest[0], highest[0], final[0]) == (-12.0, 21.0, 21.0)
+    assert cagr[0] == pytest.approx(10.0)
+    assert mdd[0] == pytest.approx((1.1 - 0.88) / 1.1 * 100)
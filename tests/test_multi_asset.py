@@ -0,0 +1,103 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.simulation.multi_asset import (
+    MultiAssetPortfolio,
+    rebalance_positions,
+    run_rebalancing_window,
+)
+from stock_market_simulator.simulation.simulator import run_configured_sweep, simulate_window
+from stock_market_simulator.utils.config_parser import parse_config_file
+
+
+def _frame(index, prices):
+    return pd.DataFrame({"Close": prices}, index=index)
+
+
+def test_single_asset_tracks_price():
+    close = np.array([[100.0], [110.0], [99.0], [120.0]])
+    pct = run_rebalancing_window(close, [0], [1.0], 1000.0)
+    np.testing.assert_allclose(pct, [0.0, 10.0, -1.0, 20.0])
+
+
+def test_rebalance_restores_target_weights():
+    pf = MultiAssetPortfolio(["A", "B"], initial_cash=1000.0)
+    pf.rebalance(np.array([10.0, 10.0]), np.array([0.6, 0.4]))
+    prices = np.array([20.0, 10.0])
+    # A doubled: weights drifted to 75/25.
+    assert pf.shares[0] * prices[0] / pf.total_value(prices) == pytest.approx(0.75)
+    pf.rebalance(prices, np.array([0.6, 0.4]))
+    value = pf.total_value(prices)
+    np.testing.assert_allclose(pf.shares * prices / value, [0.6, 0.4])
+    assert value == pytest.approx(1600.0)
+    assert pf.cash == pytest.approx(0.0)
+
+
+def test_spread_keeps_cash_non_negative():
+    pf = MultiAssetPortfolio(["A", "B"], initial_cash=1000.0, spreads=[2.0, 2.0])
+    pf.rebalance(np.array([10.0, 5.0]), np.array([0.5, 0.5]))
+    assert pf.cash >= 0.0
+    assert pf.total_value(np.array([10.0, 5.0])) == pytest.approx(1000.0 / 1.01)
+
+
+def test_rebalance_positions_always_start_at_zero():
+    index = pd.bdate_range("2021-01-15", "2021-04-30")
+    pos = rebalance_positions(index, "monthly")
+    assert pos[0] == 0
+    assert list(index[pos[1:]].month) == [2, 3, 4]
+    assert list(rebalance_positions(index, "none")) == [0]
+
+
+def test_config_and_sweep(tmp_path):
+    cfg = tmp_path / "cfg.txt"
+    cfg.write_text(
+        """\
+        years=1
+        stepsize=1
+        approach=sixty_forty
+            rebalance=monthly
+            ticker=A, weight=60
+            ticker=B, weight=40, expense_ratio=0.1
+        approach=equal
+            rebalance=none
+            ticker=A
+            ticker=B
+        """
+    )
+    _, _, approaches = parse_config_file(str(cfg))
+    (_, weighted), (_, equal) = approaches
+    assert weighted["A"]["weight"] == pytest.approx(0.6)
+    assert weighted["B"]["rebalance"] == "monthly"
+    assert weighted["B"]["expense_ratio"] == 0.1
+    assert equal["A"]["weight"] == equal["B"]["weight"] == 0.5
+
+    index = pd.bdate_range("2020-01-01", "2021-12-31")
+    rng = np.random.default_rng(0)
+    dfs = {
+        "A": _frame(index, 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))),
+        "B": _frame(index, 50 * np.exp(np.cumsum(rng.normal(0, 0.005, len(index))))),
+    }
+    summary, runs, final_map = run_configured_sweep(dfs, "sixty_forty", weighted, 1, 1, 10000.0)
+    assert len(runs) == len(final_map) == 12
+
+    # The sweep slices a shared price matrix; a single window must agree with
+    # simulating that window from DataFrames.
+    lv, hv, fr, _, start = runs[3]
+    window = index[(index >= start) & (index < start + pd.Timedelta(days=365))]
+    hist, hist_index = simulate_window({tk: df.loc[window] for tk, df in dfs.items()}, weighted, 10000.0)
+    assert hist_index.equals(window)
+    assert hist[-1] == pytest.approx(fr)
+    assert min(hist) == pytest.approx(lv)
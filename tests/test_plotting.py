@@ -0,0 +1,72 @@
+import os
+import sys
+import types
+from collections import defaultdict
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+pytest.importorskip("matplotlib")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.utils import plotting
+
+
+def _approach_data(n_approaches=4, n_starts=30, seed=0):
+    rng = np.random.default_rng(seed)
+    starts = pd.date_range("2000-01-01", periods=n_starts, freq="MS")
+    data = {}
+    for a in range(n_approaches):
+        # Rounded values produce ties between approaches.
+        runs = [tuple(np.round(rng.normal(size=4), 1)) + (sd,) for sd in starts[a % 2:]]
+        data[f"A{a}"] = (None, runs, {r[4]: r[2] for r in runs})
+    return data
+
+
+def test_rank_counts_match_sorting_each_start():
+    data = _approach_data()
+    inputs = plotting.plot_inputs(data)
+
+    common = set.intersection(*(set(d[2]) for d in data.values()))
+    expected = {a: defaultdict(int) for a in data}
+    for sd in common:
+        results = sorted(((a, d[2][sd]) for a, d in data.items()), key=lambda x: x[1], reverse=True)
+        for i, (a, _) in enumerate(results):
+            expected[a][i + 1] += 1
+    names = inputs["approaches"]
+    assert inputs["rank_counts"] == [[expected[a][r] for a in names] for r in range(1, len(names) + 1)]
+    assert inputs["metrics"]["highest_peak"][1] == [r[1] for r in data["A1"][1]]
+
+
+def test_no_common_starts_skips_histogram(tmp_path):
+    data = _approach_data()
+    data["late"] = (None, [(1.0, 2.0, 3.0, 4.0, pd.Timestamp("2030-01-01"))],
+                    {pd.Timestamp("2030-01-01"): 3.0})
+    inputs = plotting.plot_inputs(data)
+    assert inputs["rank_counts"] is None
+    messages = []
+    paths = plotting.render_plots(inputs, str(tmp_path), "x", workers=1, myprint=messages.append)
+    assert "No common starts => skipping rank histogram." in messages
+    assert len(paths) == 4
+
+
+def test_render_later_from_exported_results(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    from stock_market_simulator.utils.results_io import write_results
+
+    write_results(_approach_data(), str(tmp_path))
+    assert not list(tmp_path.glob("*.png"))
+
+    paths = plotting.render_saved(str(tmp_path), workers=2, pdf=False)
+    assert sorted(os.path.basename(p) for p in paths) == sorted(
+        ["histogram.png"] + [f"{m}_boxplot_{tmp_path.name}.png" for m in plotting.METRICS]
+    )
+    # Opaque images embed into the PDF without per-pixel alpha splitting.
+    assert all(Image.open(p).mode == "RGB" for p in paths)
@@ -0,0 +1,68 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.simulation.simulator import run_configured_sweep
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+from stock_market_simulator.utils.results_io import (
+    load_histories,
+    load_results,
+    write_results,
+)
+
+def _sweeps():
+    rng = np.random.default_rng(1)
+    index = pd.bdate_range("2005-01-01", "2011-12-31")
+    df = pd.DataFrame({"Close": 100 * np.exp(np.cumsum(rng.normal(0, 0.012, len(index))))},
+                      index=index)
+    approach_data, histories = {}, {}
+    for name in ("sma_trading", "buy_hold", "rsi"):
+        hists = []
+        info = {"T": {"strategy": STRATEGY_MAP[name], "spread": 0.1}}
+        approach_data[name] = run_configured_sweep({"T": df}, name, info, 2, 3, histories=hists)
+        histories[name] = hists
+    return approach_data, histories
+
+
+@pytest.mark.parametrize("fmt", ["json", "parquet"])
+def test_round_trip_rebuilds_approach_data(tmp_path, fmt):
+    if fmt == "parquet":
+        pytest.importorskip("pyarrow")
+    approach_data, histories = _sweeps()
+    paths = write_results(approach_data, str(tmp_path), histories, fmt=fmt)
+    assert [os.path.basename(p) for p in paths] == [f"results.{fmt}", f"histories.{fmt}"]
+
+    loaded = load_results(str(tmp_path))
+    assert list(loaded) == list(approach_data)
+    assert loaded == approach_data
+
+    hist_loaded = load_histories(str(tmp_path))
+    for name, hists in histories.items():
+        starts = [run[4] for run in approach_data[name][1]]
+        assert len(hist_loaded[name]) == len(hists)
+        for start, hist in zip(starts, hists):
+            assert hist_loaded[name][start].tolist() == hist
+
+
+def test_histories_align_with_runs():
+    approach_data, histories = _sweeps()
+    for name, (_, runs, _) in approach_data.items():
+        assert [h[-1] for h in histories[name]] == [run[2] for run in runs]
+
+
+def test_unknown_format_raises(tmp_path):
+    approach_data, _ = _sweeps()
+    with pytest.raises(ValueError):
+        write_results(approach_data, str(tmp_path), fmt="xlsx")
@@ -0,0 +1,101 @@
+import concurrent.futures
+import os
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.gui.sim_worker import SimulationWorker
+from stock_market_simulator.gui.simulation_runner import run_simulation
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+
+def _poll_until(worker, n, timeout=5.0):
+    finished = []
+    deadline = time.monotonic() + timeout
+    while len(finished) < n and time.monotonic() < deadline:
+        finished.extend(worker.poll())
+        time.sleep(0.005)
+    return finished
+
+
+def _gated_job(gates):
+    def job(info, start, years, cash):
+        gates[info["name"]].wait(5)
+        if info.get("fail"):
+            raise ValueError("boom")
+        return [cash, cash * 2], info["name"]
+    return job
+
+
+def test_results_arrive_as_each_job_finishes():
+    gates = {n: threading.Event() for n in "abc"}
+    with concurrent.futures.ThreadPoolExecutor(3) as ex:
+        worker = SimulationWorker(executor=ex, job=_gated_job(gates))
+        worker.submit([(n, {"name": n, "fail": n == "c"}) for n in "abc"], "2010-01-01", 1, 5.0)
+        assert worker.poll() == [] and worker.busy
+
+        gates["b"].set()
+        assert _poll_until(worker, 1) == [("b", [5.0, 10.0], "b", None)]
+        assert worker.busy
+
+        gates["c"].set()
+        gates["a"].set()
+        rest = _poll_until(worker, 2)
+        assert sorted(r[0] for r in rest) == ["a", "c"]
+        failed = next(r for r in rest if r[0] == "c")
+        assert failed[1] is None and isinstance(failed[3], ValueError)
+        assert not worker.busy
+
+
+def test_cancel_drops_running_and_queued_jobs():
+    gates = {n: threading.Event() for n in "abcd"}
+    with concurrent.futures.ThreadPoolExecutor(1) as ex:
+        worker = SimulationWorker(executor=ex, job=_gated_job(gates))
+        worker.submit([(n, {"name": n}) for n in "abc"], "2010-01-01", 1, 1.0)
+        time.sleep(0.05)
+        # "a" is running, "b" and "c" are still queued.
+        assert worker.cancel() == 2
+        assert not worker.busy
+
+        worker.submit([("d", {"name": "d"})], "2010-01-01", 1, 1.0)
+        gates["a"].set()
+        gates["d"].set()
+        # Only the new batch is reported; the stale "a" result is discarded.
+        assert _poll_until(worker, 1) == [("d", [1.0, 2.0], "d", None)]
+        time.sleep(0.05)
+        assert worker.poll() == []
+
+
+def _real_job(info, start, years, cash):
+    index = pd.bdate_range("2010-01-01", periods=600)
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"Close": 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))},
+                      index=index)
+    return run_simulation(info, {"T": df}, start, years, cash)
+
+
+def test_process_pool_runs_simulations():
+    info = {"T": {"strategy": STRATEGY_MAP["sma_trading"], "spread": 0.1}}
+    worker = SimulationWorker(max_workers=1, job=_real_job)
+    try:
+        worker.submit([("sma", info)], "2010-06-01", 1, 1000.0)
+        (name, history, index, error), = _poll_until(worker, 1, timeout=60)
+    finally:
+        worker.shutdown()
+    expected_history, expected_index = _real_job(info, "2010-06-01", 1, 1000.0)
+    assert error is None
+    assert history == expected_history
+    assert index.equals(expected_index)
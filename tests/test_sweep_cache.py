@@ -0,0 +1,111 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.data.data_local_cache import LRUCache
+from stock_market_simulator.gui.sweep_cache import SweepHistories
+from stock_market_simulator.simulation.simulator import run_configured_sweep
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+
+def _frame(seed, start="2000-01-03", periods=900):
+    index = pd.bdate_range(start, periods=periods)
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+    return pd.DataFrame({"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close},
+                        index=index)
+
+
+def _approaches():
+    return [
+        ("sma", {"A": {"strategy": STRATEGY_MAP["sma_trading"], "spread": 0.1}}),
+        ("mix", {"A": {"strategy": STRATEGY_MAP["buy_hold"], "weight": 0.6, "rebalance": "monthly"},
+                 "B": {"strategy": STRATEGY_MAP["buy_hold"], "weight": 0.4, "rebalance": "monthly"}}),
+    ]
+
+
+def test_windows_match_sweep_histories():
+    # B starts later, so the two approaches have different start dates.
+    dfs = {"A": _frame(0), "B": _frame(1, start="2000-06-01")}
+    histories = SweepHistories(_approaches(), dfs, years=1)
+
+    for name, info in _approaches():
+        expected = []
+        summary, runs, _ = run_configured_sweep({tk: dfs[tk] for tk in info}, name, info, 1, 1,
+                                                histories=expected)
+        got = {}
+        for pos, start in enumerate(histories.start_dates):
+            window = histories.at(pos)[name]
+            if window is not None:
+                index, hist = window
+                assert index[0] == start
+                got[start] = hist.tolist()
+        assert got == {run[4]: hist for run, hist in zip(runs, expected)}
+
+    assert histories.start_dates.is_monotonic_increasing
+    assert histories.at(0)["mix"] is None
+    assert histories.position("2000-05-15") == histories.start_dates.searchsorted(pd.Timestamp("2000-06-01"))
+
+
+def test_histories_are_computed_once_within_budget():
+    dfs = {"A": _frame(0), "B": _frame(1)}
+    one_window = 8 * 260
+    cache = LRUCache(max_bytes=3 * one_window)
+    histories = SweepHistories(_approaches()[:1], dfs, years=1, cache=cache)
+
+    first = histories.at(2)["sma"][1]
+    assert histories.at(2)["sma"][1] is first
+    assert cache.stats()["hits"] == 1
+
+    for pos in range(len(histories)):
+        histories.at(pos)
+    assert cache.current_bytes <= cache.max_bytes
+    assert cache.stats()["evictions"] > 0
+
+
+def test_scrub_plot_updates_lines_in_place():
+    pytest.importorskip("tkinter")
+    pytest.importorskip("matplotlib")
+    from matplotlib.figure import Figure
+    from stock_market_simulator.gui.sweep_explorer import ScrubPlot
+
+    dfs = {"A": _frame(0), "B": _frame(1, start="2000-06-01")}
+    histories = SweepHistories(_approaches(), dfs, years=1)
+    fig = Figure()
+    plot = ScrubPlot(fig.add_subplot(), histories.names)
+    lines = list(plot.ax.get_lines())
+
+    for pos in (0, len(histories) - 1):
+        plot.show(histories.at(pos), histories.start_dates[pos])
+        fig.canvas.draw()
+    assert list(plot.ax.get_lines()) == lines
+    np.testing.assert_array_equal(plot.lines["mix"].get_ydata(), histories.at(pos)["mix"][1])
+
+
+def test_shared_cache_keeps_different_sweeps_apart():
+    dfs = {"A": _frame(0), "B": _frame(1)}
+    cache = LRUCache(max_bytes=1 << 20)
+    one = SweepHistories(_approaches()[:1], dfs, years=1, cache=cache)
+    two = SweepHistories(_approaches()[:1], dfs, years=2, cache=cache)
+    rich = SweepHistories(_approaches()[:1], dfs, years=1, initial_cash=1e9, cache=cache)
+    wide = SweepHistories([("sma", {"A": dict(_approaches()[0][1]["A"], spread=2.0)})], dfs, years=1,
+                          cache=cache)
+    first = one.at(0)["sma"]
+    assert len(two.at(0)["sma"][1]) > len(first[1])
+    assert rich.at(0)["sma"][1].tolist() != first[1].tolist()
+    assert wide.at(0)["sma"][1].tolist() != first[1].tolist()
+    # The same sweep in another instance reuses the cached history.
+    again = SweepHistories(_approaches()[:1], dfs, years=1, cache=cache)
+    assert again.at(0)["sma"][1] is first[1]
@@ -0,0 +1,71 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.simulation.trading_calendar import (
+    period_start_positions,
+    schedule_positions,
+    window_offsets,
+    parse_schedule,
+)
+
+
+def _calendar():
+    return pd.bdate_range("2019-12-20", "2021-02-10")
+
+
+def _first_per(index, key):
+    seen = {}
+    for i, dt in enumerate(index):
+        seen.setdefault(key(dt), i)
+    return sorted(seen.values())
+
+
+def test_period_starts_match_reference_loops():
+    idx = _calendar()
+    assert list(period_start_positions(idx, "monthly")) == _first_per(idx, lambda d: (d.year, d.month))
+    assert list(period_start_positions(idx, "quarterly")) == _first_per(idx, lambda d: (d.year, d.quarter))
+    assert list(period_start_positions(idx, "yearly")) == _first_per(idx, lambda d: d.year)
+    weekly = period_start_positions(idx, "weekly")
+    assert list(weekly) == _first_per(idx, lambda d: d.to_period("W-SUN"))
+    assert (idx[weekly[1:]].dayofweek == 0).all()
+
+
+def test_schedule_positions_bars_and_step():
+    idx = _calendar()
+    assert list(schedule_positions(idx, "bars:100")) == [0, 100, 200]
+    assert list(schedule_positions(idx, 100)) == [0, 100, 200]
+    monthly = period_start_positions(idx, "monthly")
+    assert list(schedule_positions(idx, "monthly", step=3)) == list(monthly[::3])
+    with pytest.raises(ValueError):
+        parse_schedule("fortnightly")
+    with pytest.raises(ValueError):
+        parse_schedule("bars:0")
+
+
+def test_window_offsets_match_timestamp_windows():
+    idx = _calendar()
+    starts = period_start_positions(idx, "monthly")
+
+    got_starts, got_ends = window_offsets(idx, starts, 1)
+
+    expected = []
+    for s in starts:
+        end_date = idx[s] + pd.Timedelta(days=365)
+        if end_date > idx[-1]:
+            continue
+        e = int(((idx >= idx[s]) & (idx < end_date)).sum()) + s
+        expected.append((s, e))
+    assert list(zip(got_starts.tolist(), got_ends.tolist())) == expected
@@ -0,0 +1,93 @@
+import os
+import sys
+import types
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT_DIR)
+
+pkg = types.ModuleType("stock_market_simulator")
+pkg.__path__ = [ROOT_DIR]
+sys.modules.setdefault("stock_market_simulator", pkg)
+
+from stock_market_simulator.optimization.parameter_sweeper import metric_cagr
+from stock_market_simulator.optimization.walk_forward import (
+    segment_bounds,
+    simulate_segment,
+    walk_forward_advanced_daytrading,
+)
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+
+GRID = ([6.0, 9.5], [3.5, 5.0], [20, 50])
+
+
+def _setup(periods=1300):
+    index = pd.bdate_range("2001-01-01", periods=periods)
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, len(index))))
+    dfs = {"T": pd.DataFrame({"Close": close}, index=index)}
+    info = {"T": {"strategy": STRATEGY_MAP["advanced_daytrading"], "spread": 0.05}}
+    return info, dfs
+
+
+def test_segments_are_anchored_and_complete():
+    index = pd.bdate_range("2001-01-01", periods=1300)
+    bounds = segment_bounds(index, 1)
+    assert bounds[0][0] == 0
+    assert all(a[1] == b[0] for a, b in zip(bounds, bounds[1:]))
+    assert index[bounds[2][0]] == index[index.searchsorted(index[0] + pd.Timedelta(days=730))]
+    assert index[0] + pd.Timedelta(days=365 * len(bounds)) <= index[-1]
+    assert index[0] + pd.Timedelta(days=365 * (len(bounds) + 1)) > index[-1]
+
+
+def test_walk_forward_matches_brute_force():
+    info, dfs = _setup()
+    result = walk_forward_advanced_daytrading(info, dfs, 2, 1, 10000.0, *GRID,
+                                              metric_selector=metric_cagr, max_workers=1)
+    index = dfs["T"].index
+    segments = segment_bounds(index, 1)
+    grid = [(a, b, c) for a in GRID[0] for b in GRID[1] for c in GRID[2]]
+
+    assert len(result["folds"]) == len(segments) - 2
+    growth = 1.0
+    expected_equity = []
+    for f, fold in enumerate(result["folds"]):
+        # Re-score every candidate on the fold's own in-sample segments.
+        scores = {
+            params: np.mean([metric_cagr(simulate_segment(info, dfs, params, *segments[k]), 1)
+                             for k in (f, f + 1)])
+            for params in grid
+        }
+        best = max(scores.items(), key=lambda x: x[1])
+        assert fold["params"] == best[0]
+        assert fold["in_sample_metric"] == pytest.approx(best[1])
+
+        history = simulate_segment(info, dfs, best[0], *segments[f + 2])
+        assert fold["out_of_sample"][0] == index[segments[f + 2][0]]
+        assert fold["out_of_sample_return"] == history[-1]
+        factors = growth * (1 + np.asarray(history) / 100)
+        growth = factors[-1]
+        expected_equity.extend((factors - 1) * 100)
+
+    np.testing.assert_allclose(result["equity"], expected_equity)
+    assert result["index"].equals(index[segments[2][0]:segments[-1][1]])
+    # Overlapping in-sample spans share their segment simulations.
+    assert result["simulations"] == (len(segments) - 1) * len(grid) + len(result["folds"])
+
+
+def test_process_pool_gives_same_result():
+    info, dfs = _setup(periods=800)
+    inline = walk_forward_advanced_daytrading(info, dfs, 1, 1, 10000.0, *GRID, max_workers=1)
+    pooled = walk_forward_advanced_daytrading(info, dfs, 1, 1, 10000.0, *GRID, max_workers=2)
+    assert inline["folds"] == pooled["folds"]
+    assert inline["equity"] == pooled["equity"]
+
+
+def test_in_sample_must_be_multiple_of_out_of_sample():
+    info, dfs = _setup(periods=300)
+    with pytest.raises(ValueError):
+        walk_forward_advanced_daytrading(info, dfs, 1.5, 1, 10000.0, *GRID, max_workers=1)
@@ -6,20 +6,221 @@ Configuration files define high-level "approaches" consisting of one or more
 tickers and their associated strategies.  This parser keeps the format simple so
 files are easy to edit by hand while still providing enough flexibility for the
 simulator.  The resulting data structure is consumed by :mod:`main` and the GUI.
+
+Generated configs often describe thousands of variants of a few approaches.
+Numeric ticker settings (``spread``, ``expense_ratio`` and the strategy
+parameters in :data:`strategies.base_strategies.STRATEGY_PARAMS`) therefore
+accept an inclusive range ``start:stop:step``; an approach block with ranges
+stands for every combination of their values.  The block is kept as a
+template and :class:`ApproachList` builds each variant's ticker settings only
+when it is accessed.  Variants whose settings repeat an approach written out
+in the config, or an earlier variant, are dropped so every distinct
+simulation runs once; approaches without ranges are never dropped.
 """
 
+import argparse
+import collections
+import collections.abc
+import itertools
+import math
 import os
-from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP
+import re
+from typing import Iterable
+
+from stock_market_simulator.strategies.base_strategies import STRATEGY_MAP, STRATEGY_PARAMS
+from stock_market_simulator.simulation.trading_calendar import parse_schedule
+from stock_market_simulator.simulation.multi_asset import NO_REBALANCE
+from stock_market_simulator.simulation.execution import EXECUTION_MODES
+from stock_market_simulator.simulation.costs import combine_costs, parse_cost_spec
+from stock_market_simulator.simulation.legs import freeze
+from stock_market_simulator.strategies.cross_sectional import make_cross_sectional
+
+
+# Optional top-level settings returned by ``parse_config_file(...,
+# return_options=True)`` alongside years/stepsize.
+RUN_OPTION_DEFAULTS = {
+    "schedule": "monthly",
+}
+
+
+def _parse_number(text):
+    """Return ``text`` as int or float when possible, else unchanged."""
+    for conv in (int, float):
+        try:
+            return conv(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _parse_float(key, part, line):
+    """Return the float value of a ``key=value`` ticker setting."""
+    try:
+        return float(part.split('=', 1)[1].strip())
+    except ValueError:
+        raise ValueError(f"Invalid {key} value in line => {line}") from None
+
+
+# Ticker settings that accept ``start:stop:step`` ranges besides the strategy
+# parameters.
+RANGE_KEYS = ("spread", "expense_ratio")
+
+_PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+
+
+def parse_range(text):
+    """Return the values of ``start:stop[:step]`` (``stop`` inclusive, step 1).
+
+    Integer bounds and step give ints; float values are rounded to 10 decimals
+    so ``7:12:0.5`` yields exactly 7.0, 7.5, ..., 12.0.
+    """
+    parts = [_parse_number(p.strip()) for p in text.split(':')]
+    if len(parts) == 2:
+        parts.append(1)
+    if len(parts) != 3 or not all(isinstance(p, (int, float)) for p in parts):
+        raise ValueError(f"Invalid range '{text}'; expected start:stop[:step]")
+    start, stop, step = parts
+    if step <= 0 or stop < start:
+        raise ValueError(f"Invalid range '{text}'; need start <= stop and step > 0")
+    count = int(math.floor((stop - start) / step + 1e-9)) + 1
+    if all(isinstance(p, int) for p in parts):
+        return [start + i * step for i in range(count)]
+    return [round(start + i * step, 10) for i in range(count)]
 
 
-def parse_config_file(config_path):
+def _format_value(value):
+    # 10 significant digits tell apart the values ``parse_range`` produces.
+    return str(value) if isinstance(value, int) else f"{value:.10g}"
+
+
+class ApproachList(collections.abc.Sequence):
+    """The parsed approaches as a lazy sequence of ``(name, ticker_dict)``.
+
+    Each block is ``(name_template, ticker_dict, axes)`` where ``axes`` lists
+    ``(label, ticker, key, values)`` ranges.  Variant ``i`` of a block takes
+    one value per axis in row-major order (last axis fastest).  ``{label}``
+    placeholders in the name are filled with the variant's values; axes the
+    name does not mention are appended as ``[label=value,...]``.
+
+    ``duplicates`` maps the name of every dropped variant to the approach
+    with the same settings that is kept.  Only range variants are dropped:
+    an approach written without ranges is always kept under its own name,
+    and a variant repeating it is the one that goes.  Results are keyed by
+    name, so two kept approaches with the same name raise ``ValueError``.
+
+    Finding duplicates takes one pass over the full grid when the list is
+    built, holding a settings key and name per kept variant during that
+    pass; only the variants' ticker dicts are built lazily, on access.
+    """
+
+    def __init__(self, blocks):
+        self._blocks = blocks
+        self._entries = []
+        self.duplicates = {}
+        # Approaches written out by hand claim their settings first.
+        seen = {}
+        for name, ticker_dict, axes in blocks:
+            if not axes:
+                seen.setdefault(self._settings_key(ticker_dict, (), ()), name)
+        names = set()
+        for b, (name, ticker_dict, axes) in enumerate(blocks):
+            if not axes:
+                self._keep(names, b, ())
+                continue
+            for values in itertools.product(*(axis[3] for axis in axes)):
+                key = self._settings_key(ticker_dict, axes, values)
+                if key in seen:
+                    self.duplicates[self._name(b, values)] = seen[key]
+                    continue
+                seen[key] = self._keep(names, b, values)
+
+    def _keep(self, names, b, values):
+        name = self._name(b, values)
+        if name in names:
+            raise ValueError(f"Two approaches are named '{name}'; results are stored by name.")
+        names.add(name)
+        self._entries.append((b, values))
+        return name
+
+    @staticmethod
+    def _settings_key(ticker_dict, axes, values):
+        settings = {(tk, k): freeze(v) for tk, info in ticker_dict.items() for k, v in info.items()}
+        for (_, tk, key, _), v in zip(axes, values):
+            settings[(tk, key)] = v
+        return frozenset(settings.items())
+
+    def _name(self, b, values):
+        template, _, axes = self._blocks[b]
+        if not axes:
+            return template
+        labels = {axis[0]: _format_value(v) for axis, v in zip(axes, values)}
+        name = _PLACEHOLDER.sub(lambda m: labels[m.group(1)], template)
+        rest = [f"{label}={val}" for label, val in labels.items() if "{" + label + "}" not in template]
+        return f"{name}[{','.join(rest)}]" if rest else name
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        b, values = self._entries[i]
+        _, ticker_dict, axes = self._blocks[b]
+        # Always a fresh copy, so callers cannot alter the parsed config.
+        variant = {tk: dict(info) for tk, info in ticker_dict.items()}
+        for (_, tk, key, _), v in zip(axes, values):
+            variant[tk][key] = v
+        return self._name(b, values), variant
+
+    def __repr__(self):
+        return f"ApproachList({len(self)} approaches, {len(self._blocks)} blocks)"
+
+
+def _label_axes(approach_name, axes):
+    """Name ``(ticker, key, values)`` ranges for placeholders and check the name."""
+    counts = collections.Counter(key for _, key, _ in axes)
+    labelled = [(key if counts[key] == 1 else f"{tk}.{key}", tk, key, values)
+                for tk, key, values in axes]
+    labels = {axis[0] for axis in labelled}
+    for placeholder in _PLACEHOLDER.findall(approach_name):
+        if placeholder not in labels:
+            raise ValueError(f"Approach '{approach_name}' references unknown range '{{{placeholder}}}'.")
+    return labelled
+
+
+def _apply_weights(approach_name, ticker_dict, weights, rebalance):
+    """Store normalised target weights and the schedule on each ticker entry."""
+    if not weights:
+        weights = {tk: 1.0 for tk in ticker_dict}
+    # Tickers without an explicit weight in a weighted approach get none.
+    raw = [weights.get(tk, 0.0) for tk in ticker_dict]
+    if any(w < 0 for w in raw):
+        raise ValueError(f"Negative weight in approach '{approach_name}'.")
+    total = sum(raw)
+    if total <= 0:
+        raise ValueError(f"Weights of approach '{approach_name}' sum to zero.")
+    for tk, w in zip(ticker_dict, raw):
+        ticker_dict[tk]["weight"] = w / total
+        ticker_dict[tk]["rebalance"] = rebalance
+
+
+def parse_config_file(config_path, return_options=False):
     """
     Parses a config file of the form:
       years=5
       stepsize=1
+      schedule=monthly        (optional: weekly, quarterly, yearly, daily, bars:N)
       approach=SomeName
           ticker=^GSPC, strategy=buy_hold, spread=1
-          ticker=^IXIC, strategy=advanced_daytrading
+          ticker=^IXIC, strategy=advanced_daytrading, execution=ohlc
+      approach=SixtyForty
+          rebalance=monthly       (none, or any schedule accepted above)
+          ticker=SPY, weight=60
+          ticker=AGG, weight=40, expense_ratio=0.03
+      approach=Momentum
+          cross_sectional=momentum, top_n=10, lookback=252
+          rebalance=monthly       (default for cross-sectional approaches)
+          universe=universe.txt   (one ticker per line, relative to this file)
       ...
     Returns: (years, stepsize, approaches)
       where approaches = [(approach_name, {ticker: {
@@ -32,20 +233,72 @@ def parse_config_file(config_path):
           For example, spread=1 means a 1% bid/ask spread.  Another optional
           parameter is 'expense_ratio', representing an annual management fee
           percentage that will be deducted daily from the portfolio.
+          'execution=ohlc' evaluates limit, stop and trailing orders against
+          each bar's High/Low instead of the close (see
+          :mod:`simulation.execution`); the entry then has an "execution" key.
+          'slippage=volume:0.1' and 'commission=percent:0.05:1' (also
+          per_share:<rate>[:<min>[:<max pct>]] and flat:<fee>) add the cost
+          models of :mod:`simulation.costs`, stored under "costs".
+          Strategy parameters such as 'trailing_stop_pct=8' for
+          advanced_daytrading are stored under their own key.  Any other
+          key, or a value that does not parse, raises ``ValueError``.
+
+    ``spread``, ``expense_ratio`` and strategy parameters also accept a range
+    ``start:stop:step`` (e.g. ``trailing_stop_pct=7:12:0.5``); the approach
+    then expands to every combination of its ranges.  Its name may reference
+    the values as ``{trailing_stop_pct}`` (``{TICKER.key}`` when several
+    tickers range over the same key).  ``approaches`` is an
+    :class:`ApproachList` whose range variants do not repeat settings.
+
+    An approach containing a ``rebalance=`` line is a shared-cash portfolio
+    (see :mod:`simulation.multi_asset`): its ticker lines may omit
+    ``strategy=`` and take an optional ``weight=``.  Weights are normalised to
+    fractions (equal weights when none are given) and every ticker entry gets
+    ``"weight"`` and ``"rebalance"`` keys.
+
+    A ``cross_sectional=<name>, key=value, ...`` line makes the weights come
+    from a ranking strategy in :mod:`strategies.cross_sectional` instead; the
+    instance is stored under ``"cross_sectional"`` on every ticker entry.
+    ``universe=`` adds every ticker listed in a file with default settings.
+
+    With ``return_options=True`` a fourth element is returned: a dict of the
+    run-level settings in ``RUN_OPTION_DEFAULTS`` (e.g. ``schedule``).
     """
     years = None
     stepsize = None
-    approaches = []
+    blocks = []
+    options = dict(RUN_OPTION_DEFAULTS)
 
     current_approach_name = None
     current_ticker_dict = {}
+    current_rebalance = None
+    current_weights = {}
+    current_cross = None
+    current_axes = []
 
     def flush_approach():
-        nonlocal current_approach_name, current_ticker_dict, approaches
+        nonlocal current_approach_name, current_ticker_dict, blocks
+        nonlocal current_rebalance, current_weights, current_cross, current_axes
         if current_approach_name is not None and current_ticker_dict:
-            approaches.append((current_approach_name, current_ticker_dict))
+            if current_cross is not None and current_rebalance is None:
+                current_rebalance = "monthly"
+            if current_rebalance is not None:
+                _apply_weights(current_approach_name, current_ticker_dict,
+                               current_weights, current_rebalance)
+            if current_cross is not None:
+                for info in current_ticker_dict.values():
+                    info["cross_sectional"] = current_cross
+            blocks.append((current_approach_name, current_ticker_dict,
+                           _label_axes(current_approach_name, current_axes)))
         current_approach_name = None
         current_ticker_dict = {}
+        current_rebalance = None
+        current_weights = {}
+        current_cross = None
+        current_axes = []
+
+    def weighted():
+        return current_rebalance is not None or current_cross is not None
 
     with open(config_path, 'r') as f:
         for line in f:
@@ -59,6 +312,48 @@ def parse_config_file(config_path):
                 approach_name = line_strip[len("approach="):].strip()
                 current_approach_name = approach_name
 
+            # rebalance=monthly inside an approach block
+            elif line_strip.lower().startswith("rebalance="):
+                if current_approach_name is None:
+                    print(f"Warning: found rebalance= line but no approach block open => {line_strip}")
+                    continue
+                val = line_strip[len("rebalance="):].strip().lower()
+                if val != NO_REBALANCE:
+                    parse_schedule(val)
+                current_rebalance = val
+
+            # cross_sectional=momentum, top_n=10, lookback=252
+            elif line_strip.lower().startswith("cross_sectional="):
+                if current_approach_name is None:
+                    print(f"Warning: found cross_sectional= line but no approach block open => {line_strip}")
+                    continue
+                parts = [p.strip() for p in line_strip[len("cross_sectional="):].split(',')]
+                params = {}
+                for sp in parts[1:]:
+                    if '=' not in sp:
+                        print(f"Warning: ignoring cross_sectional parameter => {sp}")
+                        continue
+                    k, v = sp.split('=', 1)
+                    params[k.strip().lower()] = _parse_number(v.strip())
+                current_cross = make_cross_sectional(parts[0].lower(), **params)
+
+            # universe=tickers.txt
+            elif line_strip.lower().startswith("universe="):
+                if current_approach_name is None:
+                    print(f"Warning: found universe= line but no approach block open => {line_strip}")
+                    continue
+                path = line_strip[len("universe="):].strip()
+                path = os.path.join(os.path.dirname(os.path.abspath(config_path)), path)
+                with open(path, 'r') as uf:
+                    for tk_line in uf:
+                        tk = tk_line.strip()
+                        if tk and not tk.startswith('#') and tk not in current_ticker_dict:
+                            current_ticker_dict[tk] = {
+                                "strategy": STRATEGY_MAP["buy_hold"],
+                                "spread": 0.0,
+                                "expense_ratio": 0.0,
+                            }
+
             # ticker=^GSPC, strategy=buy_hold, spread=1
             elif line_strip.lower().startswith("ticker="):
                 if current_approach_name is None:
@@ -67,7 +362,7 @@ def parse_config_file(config_path):
 
                 portion = line_strip[len("ticker="):].strip()
                 parts = [p.strip() for p in portion.split(',')]
-                if len(parts) < 2:
+                if len(parts) < 2 and not weighted():
                     print(f"Warning: invalid ticker line => {line_strip}")
                     continue
 
@@ -79,28 +374,59 @@ def parse_config_file(config_path):
                         break
 
                 if not strategy_str:
-                    print(f"Warning: missing 'strategy=' => {line_strip}")
-                    continue
+                    if not weighted():
+                        print(f"Warning: missing 'strategy=' => {line_strip}")
+                        continue
+                    # Rebalanced approaches trade by weight, not by strategy.
+                    strategy_str = "buy_hold"
 
                 if strategy_str not in STRATEGY_MAP:
-                    print(f"Warning: unknown strategy '{strategy_str}' => {line_strip}")
-                    continue
+                    raise ValueError(f"Unknown strategy '{strategy_str}' => {line_strip}")
 
                 # Optional parameters for this ticker line
                 spread_val = 0.0      # bid/ask spread percent
                 expense_ratio_val = 0.0  # yearly expense ratio percent
+                execution_val = None  # order execution mode
+                cost_models = []      # slippage/commission models
+                strategy_params = {}  # e.g. trailing_stop_pct for advanced_daytrading
+                ranges = {}           # key -> values of start:stop:step settings
+                param_keys = STRATEGY_PARAMS.get(strategy_str, ())
                 for sp in parts[1:]:
                     low = sp.lower()
-                    if low.startswith("spread="):
-                        try:
-                            spread_val = float(sp[len("spread="):].strip())
-                        except ValueError:
-                            print(f"Warning: invalid spread value in line => {line_strip}")
+                    key = low.split('=', 1)[0].strip()
+                    if '=' not in sp:
+                        raise ValueError(f"Expected key=value, got '{sp}' => {line_strip}")
+                    if key == "strategy":
+                        continue
+                    if ':' in sp and (key in RANGE_KEYS or key in param_keys):
+                        ranges[key] = parse_range(sp.split('=', 1)[1].strip())
+                    elif low.startswith("spread="):
+                        spread_val = _parse_float(key, sp, line_strip)
                     elif low.startswith("expense_ratio="):
-                        try:
-                            expense_ratio_val = float(sp[len("expense_ratio="):].strip())
-                        except ValueError:
-                            print(f"Warning: invalid expense_ratio in line => {line_strip}")
+                        expense_ratio_val = _parse_float(key, sp, line_strip)
+                    elif key in param_keys:
+                        value = _parse_number(sp.split('=', 1)[1].strip())
+                        if not isinstance(value, (int, float)):
+                            raise ValueError(f"Invalid {key} value in line => {line_strip}")
+                        strategy_params[key] = value
+                    elif any(key in keys for keys in STRATEGY_PARAMS.values()):
+                        raise ValueError(
+                            f"Strategy '{strategy_str}' takes no parameter '{key}' => {line_strip}"
+                        )
+                    elif low.startswith("execution="):
+                        mode = sp[len("execution="):].strip().lower()
+                        if mode not in EXECUTION_MODES:
+                            raise ValueError(
+                                f"Unknown execution mode '{mode}'; expected one of {', '.join(EXECUTION_MODES)}"
+                            )
+                        execution_val = mode
+                    elif low.startswith("slippage=") or low.startswith("commission="):
+                        kind, spec = sp.split('=', 1)
+                        cost_models.append(parse_cost_spec(kind.strip().lower(), spec.strip()))
+                    elif low.startswith("weight="):
+                        current_weights[ticker_str] = _parse_float(key, sp, line_strip)
+                    else:
+                        raise ValueError(f"Unknown ticker parameter '{key}' => {line_strip}")
 
                 # Map the ticker to a dict with strategy, spread, and expense_ratio
                 current_ticker_dict[ticker_str] = {
@@ -108,6 +434,17 @@ def parse_config_file(config_path):
                     "spread": spread_val,
                     "expense_ratio": expense_ratio_val,
                 }
+                if execution_val is not None:
+                    current_ticker_dict[ticker_str]["execution"] = execution_val
+                current_ticker_dict[ticker_str].update(strategy_params)
+                # Later lines for the same ticker replace earlier ones.
+                current_axes = [a for a in current_axes if a[0] != ticker_str]
+                for key, values in ranges.items():
+                    current_ticker_dict[ticker_str][key] = values[0]
+                    current_axes.append((ticker_str, key, values))
+                costs = combine_costs(cost_models)
+                if costs is not None:
+                    current_ticker_dict[ticker_str]["costs"] = costs
 
             # maybe years=5 or stepsize=1
             elif '=' in line_strip:
@@ -118,6 +455,10 @@ def parse_config_file(config_path):
                     years = int(val)
                 elif key == 'stepsize':
                     stepsize = int(val)
+                elif key == 'schedule':
+                    # Validate early so typos fail before any simulation runs.
+                    parse_schedule(val)
+                    options['schedule'] = val.lower()
                 else:
                     print(f"Warning: unknown config param => {key}")
 
@@ -134,7 +475,33 @@ def parse_config_file(config_path):
     if stepsize is None or stepsize < 1:
         raise ValueError("Config missing 'stepsize' or it's <1.")
 
-    if not approaches:
+    if not blocks:
         raise ValueError("No approaches defined in config.")
 
+    approaches = ApproachList(blocks)
+    if approaches.duplicates:
+        first = next(iter(approaches.duplicates.items()))
+        print(f"Warning: {len(approaches.duplicates)} range variant(s) repeat the settings of another "
+              f"approach and are skipped (e.g. '{first[0]}' = '{first[1]}')")
+
+    if return_options:
+        return years, stepsize, approaches, options
     return years, stepsize, approaches
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Validate a config file and count its approaches")
+    parser.add_argument("config", help="Config file")
+    parser.add_argument("--list", action="store_true", help="Print every approach name")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+
+    years, stepsize, approaches, options = parse_config_file(args.config, return_options=True)
+    print(f"years={years} stepsize={stepsize} schedule={options['schedule']}: "
+          f"{len(approaches)} approaches ({len(approaches.duplicates)} duplicates dropped)")
+    if args.list:
+        for name, _ in approaches:
+            print(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Render the sweep report figures, optionally in parallel and after the fact.
+
+:func:`main.write_reports` used to draw its four boxplots and the rank
+histogram one after another through ``pyplot`` and then embed the PNGs in the
+PDF.  With many approaches this took a noticeable share of a run.  This module
+splits the work up:
+
+* :func:`plot_inputs` reduces ``approach_data`` to plain lists and a rank
+  count matrix (ranks are computed with one ``argsort`` over all common start
+  dates).
+* Each figure is an independent task drawn with the object-oriented
+  matplotlib API (no global ``pyplot`` state), so :func:`render_plots` can hand
+  them to a process pool.  The stacked rank histogram is one ``bar`` call per
+  approach.
+* Figures are written as opaque RGB PNGs.  ``fpdf`` copies those straight into
+  the PDF, whereas RGBA images are split into colour and alpha pixel by pixel
+  in pure Python.
+* Plotting can be skipped during a sweep and run later from the exported
+  results (:mod:`utils.results_io`) with::
+
+      python -m stock_market_simulator.utils.plotting reports/<name>
+"""
+
+import argparse
+import concurrent.futures
+import os
+from typing import Iterable
+
+import numpy as np
+
+# Four key metrics, the last one (avg_annual_return) was added later.  The
+# values are the column of each ``runs_list`` row holding the metric.
+METRICS = {
+    'lowest_valley': ('Lowest Valley', 0),
+    'highest_peak': ('Highest Peak', 1),
+    'final_result': ('Final Result', 2),
+    'avg_annual_return': ('Average Annual Return', 3),
+}
+
+
+def plot_inputs(approach_data):
+    """Return the plain-list data every report figure is drawn from.
+
+    ``approach_data`` maps approach -> ``(summary, runs_list, final_map)``.
+    ``rank_counts[r][i]`` counts how often approach ``i`` finished ``r + 1``-th
+    by final result on the start dates all approaches share.
+    """
+    approaches = list(approach_data.keys())
+    metrics = {
+        key: [[run[col] for run in approach_data[a][1]] for a in approaches]
+        for key, (_, col) in METRICS.items()
+    }
+
+    final_maps = [approach_data[a][2] for a in approaches]
+    common = set.intersection(*(set(fm) for fm in final_maps)) if final_maps else set()
+    rank_counts = None
+    if common:
+        starts = sorted(common)
+        finals = np.array([[fm[sd] for fm in final_maps] for sd in starts], dtype=float)
+        # Descending by value; the stable sort keeps approach order on ties,
+        # like sorting ``(approach, value)`` pairs with ``reverse=True``.
+        order = np.argsort(-finals, axis=1, kind='stable')
+        counts = np.zeros((len(approaches), len(approaches)), dtype=int)
+        np.add.at(counts, (np.broadcast_to(np.arange(len(approaches)), order.shape), order), 1)
+        rank_counts = counts.tolist()
+    return {"approaches": approaches, "metrics": metrics, "rank_counts": rank_counts}
+
+
+def _save_figure(fig, path):
+    """Write ``fig`` as an opaque RGB PNG (see the module docstring)."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    canvas = FigureCanvasAgg(fig)
+    try:
+        from PIL import Image
+    except ImportError:
+        fig.savefig(path)
+        return
+    canvas.draw()
+    rgba = np.asarray(canvas.buffer_rgba())
+    dpi = fig.get_dpi()
+    Image.fromarray(np.ascontiguousarray(rgba[..., :3])).save(path, dpi=(dpi, dpi))
+
+
+def draw_boxplot(metric_key, approaches, data, output_dir, out_name):
+    """Draw one metric's box-and-whisker plot; returns the PNG path or None."""
+    import matplotlib.colors as mcolors
+    from matplotlib.figure import Figure
+
+    metric_label = METRICS[metric_key][0]
+    colors = list(mcolors.TABLEAU_COLORS.values())
+    # Matplotlib's tableau colour set gives each approach a distinct colour;
+    # it is assigned by position before empty approaches are dropped.
+    kept = [(a, values, colors[i % len(colors)])
+            for i, (a, values) in enumerate(zip(approaches, data)) if values]
+    if not kept:
+        return None
+
+    # Determine y-limits to give a little breathing room around min/max.
+    all_values = [val for _, values, _ in kept for val in values]
+    y_min = min(all_values) * 0.95
+    y_max = max(all_values) * 1.05
+
+    fig = Figure(figsize=(10, 6))
+    ax = fig.add_subplot()
+    # Matplotlib 3.9 renamed "labels" -> "tick_labels".
+    box = ax.boxplot([values for _, values, _ in kept], tick_labels=[a for a, _, _ in kept],
+                     patch_artist=True, showfliers=True)
+    for patch, (_, _, color) in zip(box['boxes'], kept):
+        patch.set_facecolor(color)
+
+    ax.set_title(f'{metric_label} Across Approaches', fontsize=14)
+    ax.set_xlabel('Approaches', fontsize=12)
+    ax.set_ylabel(metric_label, fontsize=12)
+    ax.set_ylim(y_min, y_max)
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+    fig.tight_layout()
+
+    plot_path = os.path.join(output_dir, f"{metric_key}_boxplot_{out_name}.png")
+    _save_figure(fig, plot_path)
+    return plot_path
+
+
+def draw_rank_histogram(approaches, rank_counts, output_dir):
+    """Draw the stacked rank histogram; returns the PNG path."""
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Patch
+
+    n_approaches = len(approaches)
+    counts = np.asarray(rank_counts)
+    ranks = np.arange(1, n_approaches + 1)
+    bottoms = np.cumsum(counts, axis=1) - counts
+
+    color_map = matplotlib.colormaps['tab10'].resampled(n_approaches)
+    approach_colors = [color_map(i) for i in range(n_approaches)]
+
+    fig = Figure(figsize=(8, 5))
+    ax = fig.add_subplot()
+    # One call per approach draws its segment of every rank's stack.
+    for i in range(n_approaches):
+        ax.bar(ranks, counts[:, i], bottom=bottoms[:, i], color=approach_colors[i],
+               edgecolor='black')
+
+    legend_patches = [Patch(color=c, label=ap) for ap, c in zip(approaches, approach_colors)]
+    ax.legend(handles=legend_patches, bbox_to_anchor=(1.05, 1), loc='upper left')
+    ax.set_xticks(list(ranks))
+    ax.set_xlabel("Rank (1=best, N=worst)")
+    ax.set_ylabel("Count (# of times approach had this rank)")
+    ax.set_title("Rank Histogram Across Common Monthly Starts")
+    fig.tight_layout()
+
+    hist_path = os.path.join(output_dir, "histogram.png")
+    _save_figure(fig, hist_path)
+    return hist_path
+
+
+def render_plots(inputs, output_dir, out_name, workers=None, myprint=print):
+    """Draw every report figure from :func:`plot_inputs` output.
+
+    Figures are rendered in up to ``workers`` processes (default: one per
+    figure, capped at the CPU count); ``workers=1`` draws them in this
+    process.
+    """
+    approaches = inputs["approaches"]
+    tasks = []
+    if inputs["rank_counts"] is None:
+        myprint("No common starts => skipping rank histogram.")
+    else:
+        tasks.append((draw_rank_histogram, (approaches, inputs["rank_counts"], output_dir)))
+    for metric_key in METRICS:
+        tasks.append((draw_boxplot, (metric_key, approaches, inputs["metrics"][metric_key],
+                                     output_dir, out_name)))
+
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers <= 1:
+        paths = [func(*args) for func, args in tasks]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(func, *args) for func, args in tasks]
+            paths = [fut.result() for fut in futures]
+
+    for (func, args), path in zip(tasks, paths):
+        if func is draw_rank_histogram:
+            myprint(f"Histogram saved to {path}")
+        elif path is None:
+            myprint(f"No data for metric '{args[0]}'. Skipping plot.")
+        else:
+            myprint(f"Saved boxplot for '{args[0]}' to '{path}'.")
+    return [p for p in paths if p]
+
+
+def render_saved(output_dir, out_name=None, workers=None, pdf=True):
+    """Draw the figures of a sweep from its exported results.
+
+    Used after a run with plotting skipped, or to redraw existing reports.
+    Rebuilds ``report.pdf`` afterwards unless ``pdf`` is False.
+    """
+    from stock_market_simulator.utils.results_io import load_results
+
+    inputs = plot_inputs(load_results(output_dir))
+    out_name = out_name or os.path.basename(os.path.normpath(output_dir))
+    paths = render_plots(inputs, output_dir, out_name, workers)
+    if pdf:
+        from stock_market_simulator.utils.pdf_report import create_pdf_report
+        create_pdf_report(output_dir)
+    return paths
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Render plots of a finished sweep")
+    parser.add_argument("output_dir", help="Report directory containing results.parquet/.json")
+    parser.add_argument("--workers", type=int, default=None, help="Rendering processes")
+    parser.add_argument("--no-pdf", action="store_true", help="Do not rebuild report.pdf")
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    render_saved(args.output_dir, workers=args.workers, pdf=not args.no_pdf)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Machine-readable export of sweep results.
+
+``report.txt`` and the plots are meant for people.  Any further analysis
+(re-ranking, new plots, comparing runs) needs the per-window numbers, so
+every report directory also gets:
+
+* ``results.parquet`` – one row per simulated window with the columns
+  ``approach, start_date, lowest_valley, highest_peak, final_result, cagr``
+  in the order the sweep produced them.
+* ``histories.parquet`` (optional) – the daily percent history of every
+  window in long form: ``approach, start_date, day, pct``.
+
+Without ``pyarrow`` both are written as JSON (``results.json`` and
+``histories.json``).  Floats are stored exactly in either format, so
+:func:`load_results` rebuilds the same ``approach_data`` mapping
+(approach -> ``(summary, runs_list, final_map)``) the sweep returned,
+without simulating anything.
+"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from stock_market_simulator.simulation.simulator import summarize_sweep
+
+RESULT_COLUMNS = ["lowest_valley", "highest_peak", "final_result", "cagr"]
+
+
+def _parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _find(output_dir, name):
+    for ext in (".parquet", ".json"):
+        path = os.path.join(output_dir, name + ext)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No {name}.parquet or {name}.json in {output_dir}")
+
+
+def results_frame(approach_data):
+    """Return the per-window results of ``approach_data`` as one DataFrame."""
+    names, rows = [], []
+    for aname, (_, runs_list, _) in approach_data.items():
+        names.extend([aname] * len(runs_list))
+        rows.extend(runs_list)
+    columns = RESULT_COLUMNS + ["start_date"]
+    df = pd.DataFrame.from_records(rows, columns=columns) if rows else pd.DataFrame(columns=columns)
+    df.insert(0, "approach", names)
+    df["start_date"] = pd.to_datetime(df["start_date"])
+    return df[["approach", "start_date"] + RESULT_COLUMNS]
+
+
+def histories_frame(histories, approach_data):
+    """Long-form DataFrame of ``{approach: [history per runs_list row]}``."""
+    parts = []
+    for aname, hists in histories.items():
+        starts = [run[4] for run in approach_data[aname][1]]
+        for start, hist in zip(starts, hists):
+            parts.append(pd.DataFrame({
+                "approach": aname,
+                "start_date": pd.Timestamp(start),
+                "day": np.arange(len(hist), dtype=np.int32),
+                "pct": np.asarray(hist, dtype=float),
+            }))
+    if not parts:
+        return pd.DataFrame(columns=["approach", "start_date", "day", "pct"])
+    return pd.concat(parts, ignore_index=True)
+
+
+def _write(df, output_dir, name, fmt):
+    path = os.path.join(output_dir, f"{name}.{fmt}")
+    if fmt == "parquet":
+        out = df.copy()
+        out["approach"] = out["approach"].astype("category")
+        out.to_parquet(path, index=False)
+    else:
+        out = df.copy()
+        out["start_date"] = out["start_date"].dt.strftime("%Y-%m-%d")
+        with open(path, "w") as f:
+            # ``split`` keeps column order and stores each value once.
+            json.dump(out.to_dict(orient="split", index=False), f)
+    return path
+
+
+def write_results(approach_data, output_dir, histories=None, fmt=None):
+    """Write ``results.<fmt>`` (and ``histories.<fmt>``) into ``output_dir``.
+
+    ``fmt`` is ``"parquet"`` or ``"json"``; by default Parquet when pyarrow is
+    installed.  ``histories`` maps approach -> list of percent histories
+    aligned with that approach's ``runs_list``.  Returns the written paths.
+    """
+    fmt = fmt or ("parquet" if _parquet_available() else "json")
+    if fmt not in ("parquet", "json"):
+        raise ValueError(f"Unknown results format '{fmt}'")
+    paths = [_write(results_frame(approach_data), output_dir, "results", fmt)]
+    if histories:
+        paths.append(_write(histories_frame(histories, approach_data), output_dir, "histories", fmt))
+    return paths
+
+
+def _read(path):
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+        df["approach"] = df["approach"].astype(str)
+        return df
+    with open(path) as f:
+        payload = json.load(f)
+    df = pd.DataFrame(payload["data"], columns=payload["columns"])
+    df["start_date"] = pd.to_datetime(df["start_date"])
+    return df
+
+
+def load_results(output_dir):
+    """Rebuild ``approach_data`` from a report directory's results file."""
+    df = _read(_find(output_dir, "results"))
+    approach_data = {}
+    # ``sort=False`` keeps approaches (and their rows) in the written order.
+    for aname, group in df.groupby("approach", sort=False):
+        values = [group[c].tolist() for c in RESULT_COLUMNS]
+        starts = list(group["start_date"])
+        runs_list = [tuple(row) + (start,) for row, start in zip(zip(*values), starts)]
+        approach_data[aname] = summarize_sweep(aname, runs_list, None)
+    return approach_data
+
+
+def load_histories(output_dir):
+    """Return ``{approach: {start_date: ndarray}}`` from ``histories.*``."""
+    df = _read(_find(output_dir, "histories"))
+    out = {}
+    for (aname, start), group in df.groupby(["approach", "start_date"], sort=False):
+        out.setdefault(aname, {})[start] = group.sort_values("day")["pct"].to_numpy()
+    return out